@@ -1,12 +1,13 @@
 """IMDB adapter using imdbinfo (async replacement for cinemagoer)."""
 
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, List, Optional, Any
 import html
 import re
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
 from infra.logging import get_logger, log_performance
-from infra.cache import cache_client
+from infra.cache import cache_client, search_cache_key, search_query
+from domain.services.template_service import DETAILS_SCHEMA_VERSION, template_service
 import time
 
 try:
@@ -34,74 +35,68 @@ class IMDBAdapter:
         start_time = time.time()
         
         try:
-            # Check cache first
-            cache_key = f"search:{query}"
-            cached = await cache_client.get("imdb_search", cache_key)
-            if cached:
-                log_performance("imdb_search", time.time() - start_time)
-                return cached
-            
-            # Make API call in thread pool (imdbinfo is sync)
-            logger.info(f"Searching IMDB for: {query}")
-            loop = asyncio.get_event_loop()
-            results = await loop.run_in_executor(
-                self.executor,
-                self._sync_search_movies,
-                query
+            # Served from cache (fresh or stale) when possible; equivalent
+            # spellings of a query share one key, one upstream call and, like
+            # the warm-up and refreshes, the key's own query upstream
+            query = " ".join(query.split())
+            cache_key = await search_cache_key("imdb_search", query)
+            upstream_query = search_query(cache_key)
+            movies = await cache_client.cached_fetch(
+                "imdb_search", cache_key, lambda: self._fetch_search(upstream_query)
             )
             
-            if not results:
-                return []
-            
-            # Transform results to consistent format
-            movies = []
-            for movie in results:
-                movies.append({
-                    'id': str(movie.get('id', '')),
-                    'title': movie.get('title', 'Unknown Title'),
-                    'year': movie.get('year'),
-                    'kind': movie.get('kind', 'movie')
-                })
-            
-            # Cache results for 1 hour
-            await cache_client.set("imdb_search", cache_key, movies, ttl=3600)
-            
             log_performance("imdb_search", time.time() - start_time)
-            return movies
+            return movies or []
             
         except Exception as e:
             logger.error(f"IMDB search failed for '{query}': {e}")
             return []
     
-    async def get_movie_details(self, imdb_id: str) -> Optional[Dict[str, Any]]:
-        """Get detailed movie information by IMDB ID."""
+    async def _fetch_search(self, query: str) -> Optional[List[Dict[str, Any]]]:
+        """Search IMDB upstream; None if the lookup failed."""
+        # Make API call in thread pool (imdbinfo is sync)
+        logger.info(f"Searching IMDB for: {query}")
+        loop = asyncio.get_event_loop()
+        results = await loop.run_in_executor(
+            self.executor,
+            self._sync_search_movies,
+            query
+        )
+        
+        if results is None:
+            return None
+        
+        # Transform results to consistent format
+        movies = []
+        for movie in results:
+            movies.append({
+                'id': str(movie.get('id', '')),
+                'title': movie.get('title', 'Unknown Title'),
+                'year': movie.get('year'),
+                'kind': movie.get('kind', 'movie')
+            })
+        return movies
+    
+    async def get_movie_details(
+        self,
+        imdb_id: str,
+        fields: Optional[Iterable[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Get detailed movie information by IMDB ID.
+        
+        ``fields`` names the top-level fields the caller needs; with hash
+        storage enabled only those are read from the cache.
+        """
         start_time = time.time()
         
         try:
-            # Check cache first
-            cache_key = f"details:{imdb_id}"
-            cached = await cache_client.get("imdb_details", cache_key)
-            if cached:
-                log_performance("imdb_details", time.time() - start_time)
-                return cached
-            
-            logger.info(f"Fetching IMDB details for: {imdb_id}")
-            loop = asyncio.get_event_loop()
-            movie = await loop.run_in_executor(
-                self.executor,
-                self._sync_get_movie,
-                imdb_id
+            # Served from cache (fresh or stale) when possible; the key carries
+            # the projection version so older documents are never read
+            cache_key = f"details:v{DETAILS_SCHEMA_VERSION}:{imdb_id}"
+            details = await cache_client.cached_fetch(
+                "imdb_details", cache_key, lambda: self._fetch_details(imdb_id), fields=fields
             )
             
-            if not movie:
-                return None
-            
-            # Transform to consistent format
-            details = self._transform_movie_data(movie, imdb_id)
-            
-            # Cache for 24 hours (movie details don't change often)
-            await cache_client.set("imdb_details", cache_key, details, ttl=86400)
-            
             log_performance("imdb_details", time.time() - start_time)
             return details
             
@@ -109,12 +104,28 @@ class IMDBAdapter:
             logger.error(f"IMDB details failed for '{imdb_id}': {e}")
             return None
     
-    def _sync_search_movies(self, query: str) -> List[Dict[str, Any]]:
-        """Synchronous IMDB search (runs in thread pool)."""
+    async def _fetch_details(self, imdb_id: str) -> Optional[Dict[str, Any]]:
+        """Fetch movie details upstream; None if the lookup failed."""
+        logger.info(f"Fetching IMDB details for: {imdb_id}")
+        loop = asyncio.get_event_loop()
+        movie = await loop.run_in_executor(
+            self.executor,
+            self._sync_get_movie,
+            imdb_id
+        )
+        
+        if not movie:
+            return None
+        
+        # Transform to consistent format, keeping only renderable fields
+        return template_service.project_imdb_details(self._transform_movie_data(movie, imdb_id))
+    
+    def _sync_search_movies(self, query: str) -> Optional[List[Dict[str, Any]]]:
+        """Synchronous IMDB search (runs in thread pool); None on lookup errors."""
         try:
             if not search_title:
                 logger.error("imdbinfo library not available")
-                return []
+                return None
             
             # Search for titles using imdbinfo
             results = search_title(query)
@@ -147,7 +158,7 @@ class IMDBAdapter:
             
         except Exception as e:
             logger.error(f"IMDB search error for '{query}': {e}")
-            return []
+            return None
     
     def _sync_get_movie(self, imdb_id: str) -> Optional[Dict[str, Any]]:
         """Synchronous IMDB movie details (runs in thread pool)."""
@@ -215,7 +226,6 @@ class IMDBAdapter:
                 'genres': getattr(movie, 'genres', []) or [],
                 'runtimes': getattr(movie, 'runtimes', []) or [],
                 'countries': getattr(movie, 'countries', []) or [],
-                'country_codes': getattr(movie, 'country_codes', []) or [],
                 'languages': getattr(movie, 'languages', []) or [],
                 'languages_text': getattr(movie, 'languages_text', []) or [],
                 'mpaa': getattr(movie, 'mpaa', None),
@@ -239,17 +249,14 @@ class IMDBAdapter:
                 'aspect_ratios': getattr(movie, 'aspect_ratios', []) or [],
                 'sound_mix': getattr(movie, 'sound_mix', []) or [],
                 'color_info': getattr(movie, 'color_info', []) or [],
-                'cameras': getattr(movie, 'cameras', []) or [],
                 
                 # Box office and awards
                 'budget': getattr(movie, 'budget', None),
                 'gross': getattr(movie, 'gross', None),
-                'weekend': getattr(movie, 'weekend', None),
                 'opening_weekend_usa': getattr(movie, 'opening_weekend_usa', None),
                 
                 # Content ratings
                 'certificates': getattr(movie, 'certificates', []) or [],
-                'parents_guide': getattr(movie, 'parents_guide', {}) or {},
                 
                 # People categories
                 'cast': extract_cast_with_characters(categories.get('cast', []), 15),
@@ -437,14 +444,18 @@ class IMDBAdapter:
             logger.error(f"Failed to extract IMDB ID from URL '{url}': {e}")
             return None
     
-    async def get_movie_by_url(self, url: str) -> Optional[Dict[str, Any]]:
+    async def get_movie_by_url(
+        self,
+        url: str,
+        fields: Optional[Iterable[str]] = None
+    ) -> Optional[Dict[str, Any]]:
         """Get movie details by IMDB URL."""
         imdb_id = self.extract_imdb_id_from_url(url)
         if not imdb_id:
             logger.warning(f"Could not extract IMDB ID from URL: {url}")
             return None
         
-        return await self.get_movie_details(imdb_id)
+        return await self.get_movie_details(imdb_id, fields)
 
 
 # Global IMDB adapter instance
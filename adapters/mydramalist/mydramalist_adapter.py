@@ -2,9 +2,10 @@
 
 import re
 import time
-from typing import Dict, List, Optional, Any
+from typing import Any, Dict, Iterable, List, Optional
 
-from infra.cache import cache_client
+from domain.services.template_service import DETAILS_SCHEMA_VERSION, template_service
+from infra.cache import cache_client, search_cache_key, search_query
 from infra.config import settings
 from infra.http import http_client
 from infra.logging import get_logger, log_performance
@@ -24,68 +25,78 @@ class MyDramaListAdapter:
         start_time = time.time()
         
         try:
-            # Check cache first
-            cache_key = f"search:{query}"
-            cached = await cache_client.get("mdl_search", cache_key)
-            if cached:
-                log_performance("mdl_search", time.time() - start_time)
-                return cached
-            
-            # Apply rate limiting for API protection
-            if not await api_limiter.is_allowed("mydramalist", limit=30, window=60):
-                logger.warning("MyDramaList API rate limit exceeded")
-                return []
-            
-            # Make async HTTP request
-            url = settings.mydramalist_api_url.format(query)
-            logger.info(f"Searching MyDramaList for: {query}")
-            
-            data = await http_client.get(url)
-            if not data:
-                return []
-            
-            dramas = data.get("results", {}).get("dramas", [])
-            logger.info(f"Found {len(dramas)} dramas for query: {query}")
-            
-            # Cache results for 1 hour
-            await cache_client.set("mdl_search", cache_key, dramas, ttl=3600)
+            # Served from cache (fresh or stale) when possible; equivalent
+            # spellings of a query share one key, one upstream call and, like
+            # the warm-up and refreshes, the key's own query upstream
+            query = " ".join(query.split())
+            cache_key = await search_cache_key("mdl_search", query)
+            upstream_query = search_query(cache_key)
+            dramas = await cache_client.cached_fetch(
+                "mdl_search", cache_key, lambda: self._fetch_search(upstream_query),
+                refresh=lambda: self._fetch_search(upstream_query, settings.http_background_deadline)
+            )
             
             log_performance("mdl_search", time.time() - start_time)
-            return dramas
+            return dramas or []
             
         except Exception as e:
             logger.error(f"MyDramaList search failed for '{query}': {e}")
             return []
     
-    async def get_drama_details(self, slug: str) -> Optional[Dict[str, Any]]:
-        """Get detailed drama information by slug with rate limiting."""
+    async def _fetch_search(
+        self,
+        query: str,
+        deadline: Optional[float] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Fetch search results upstream; None if rate limited or the request failed.
+        
+        ``deadline`` bounds the call including retries; it defaults to the
+        user-facing one. Background work passes a longer one and is not
+        hedged, since no user waits on its tail latency.
+        """
+        url = settings.mydramalist_api_url.format(query)
+        # While kuryana is known to be down, answer from cache (or nothing) at once
+        if not http_client.available(url):
+            return None
+        
+        # Apply rate limiting for API protection
+        if not await api_limiter.is_allowed("mydramalist", limit=30, window=60):
+            logger.warning("MyDramaList API rate limit exceeded")
+            return None
+        
+        # Make async HTTP request
+        logger.info(f"Searching MyDramaList for: {query}")
+        
+        data = await http_client.get(
+            url, hedge=deadline is None, deadline=deadline or settings.http_interactive_deadline
+        )
+        if not data:
+            return None
+        
+        dramas = data.get("results", {}).get("dramas", [])
+        logger.info(f"Found {len(dramas)} dramas for query: {query}")
+        return dramas
+    
+    async def get_drama_details(
+        self,
+        slug: str,
+        fields: Optional[Iterable[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Get detailed drama information by slug with rate limiting.
+        
+        ``fields`` names the top-level fields the caller needs; with hash
+        storage enabled only those are read from the cache.
+        """
         start_time = time.time()
         
         try:
-            # Check cache first  
-            cache_key = f"details:{slug}"
-            cached = await cache_client.get("mdl_details", cache_key)
-            if cached:
-                log_performance("mdl_details", time.time() - start_time)
-                return cached
-            
-            # Apply rate limiting for API protection
-            if not await api_limiter.is_allowed("mydramalist_details", limit=20, window=60):
-                logger.warning("MyDramaList details API rate limit exceeded")
-                return None
-            
-            # Make async HTTP request
-            url = settings.mydramalist_details_url.format(slug)
-            logger.info(f"Fetching MyDramaList details for: {slug}")
-            
-            data = await http_client.get(url)
-            if not data:
-                return None
-            
-            details = data.get("data", {})
-            
-            # Cache for 24 hours (drama details don't change often)
-            await cache_client.set("mdl_details", cache_key, details, ttl=86400)
+            # Served from cache (fresh or stale) when possible; the key carries
+            # the projection version so older documents are never read
+            cache_key = f"details:v{DETAILS_SCHEMA_VERSION}:{slug}"
+            details = await cache_client.cached_fetch(
+                "mdl_details", cache_key, lambda: self._fetch_details(slug), fields=fields,
+                refresh=lambda: self._fetch_details(slug, settings.http_background_deadline)
+            )
             
             log_performance("mdl_details", time.time() - start_time)
             return details
@@ -94,6 +105,36 @@ class MyDramaListAdapter:
             logger.error(f"MyDramaList details failed for '{slug}': {e}")
             return None
     
+    async def _fetch_details(
+        self,
+        slug: str,
+        deadline: Optional[float] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Fetch drama details upstream; None if rate limited or the request failed.
+        
+        ``deadline`` works as for _fetch_search.
+        """
+        url = settings.mydramalist_details_url.format(slug)
+        if not http_client.available(url):
+            return None
+        
+        # Apply rate limiting for API protection
+        if not await api_limiter.is_allowed("mydramalist_details", limit=20, window=60):
+            logger.warning("MyDramaList details API rate limit exceeded")
+            return None
+        
+        # Make async HTTP request
+        logger.info(f"Fetching MyDramaList details for: {slug}")
+        
+        data = await http_client.get(
+            url, hedge=deadline is None, deadline=deadline or settings.http_interactive_deadline
+        )
+        if not data or not data.get("data"):
+            return None
+        
+        # Cache only what a caption can render (casts alone are most of the payload)
+        return template_service.project_mdl_details(data["data"]) or None
+    
     def extract_slug_from_url(self, url: str) -> Optional[str]:
         """Extract drama slug from MyDramaList URL."""
         try:
@@ -124,14 +165,18 @@ class MyDramaListAdapter:
             logger.error(f"Failed to extract slug from URL '{url}': {e}")
             return None
     
-    async def get_drama_by_url(self, url: str) -> Optional[Dict[str, Any]]:
+    async def get_drama_by_url(
+        self,
+        url: str,
+        fields: Optional[Iterable[str]] = None
+    ) -> Optional[Dict[str, Any]]:
         """Get drama details by MyDramaList URL."""
         slug = self.extract_slug_from_url(url)
         if not slug:
             logger.warning(f"Could not extract slug from URL: {url}")
             return None
         
-        return await self.get_drama_details(slug)
+        return await self.get_drama_details(slug, fields)
 
 
 # Global MyDramaList adapter instance
@@ -6,6 +6,7 @@ import asyncio
 import subprocess
 import json
 import re
+import time
 from datetime import datetime
 from pyrogram import Client
 from pyrogram.types import Message, InlineKeyboardMarkup, InlineKeyboardButton, CallbackQuery
@@ -126,7 +127,7 @@ async def help_command(client: Client, message: Message):
 /broadcast &lt;message&gt; - Send message to all users
 /log - Get bot logs
 /health - Check service health
-/cachereload - Clear all caches and restart cache client
+/cachereload [namespace] - Invalidate one or all cache namespaces
 
 <b>💡 Template Guide:</b>
 
@@ -308,72 +309,82 @@ async def set_public_mode_command(client: Client, message: Message):
         await message.reply_text("❌ Failed to update public mode.")
 
 
+# Namespaces /cachereload can invalidate one at a time
+RELOADABLE_NAMESPACES = [
+    'imdb_search', 'imdb_details', 'mdl_search', 'mdl_details', 'user_templates',
+    'imdb_search_alias', 'mdl_search_alias',
+]
+
+
 async def cache_reload_command(client: Client, message: Message):
-    """Hot reload cache - clear all caches and restart cache client."""
+    """Hot reload cache - invalidate one or all namespaces and restart cache client."""
     if message.from_user.id != settings.owner_id:
         await message.reply_text("❌ Only bot owner can reload caches.")
         return
     
+    parts = message.text.split()
+    namespace = parts[1].lower() if len(parts) > 1 else None
+    if namespace == 'all':
+        namespace = None
+    if len(parts) > 2 or (namespace is not None and namespace not in RELOADABLE_NAMESPACES):
+        await message.reply_text(
+            "Usage: /cachereload [namespace|all]\n"
+            f"Namespaces: {', '.join(RELOADABLE_NAMESPACES)}"
+        )
+        return
+    
     try:
         from infra.cache import cache_client
         from infra.ratelimit.limiter import api_limiter, user_limiter, global_limiter
+        from app.cache_warmer import cache_warmer
         
-        # Clear all cache namespaces
-        cache_stats = {}
-        if cache_client._redis:
-            # Get cache info before clearing
-            info = await cache_client._redis.info('memory')
-            cache_stats['before_memory'] = info.get('used_memory_human', 'Unknown')
-            
-            # Clear all keys with our namespace prefixes
-            namespaces = ['v1:imdb_search:*', 'v1:imdb_details:*', 'v1:mdl_search:*', 
-                         'v1:mdl_details:*', 'v1:user_templates:*', 'ratelimit:*']
-            
-            cleared_count = 0
-            for pattern in namespaces:
-                keys = await cache_client._redis.keys(pattern)
-                if keys:
-                    cleared_count += await cache_client._redis.delete(*keys)
-            
-            cache_stats['cleared_keys'] = cleared_count
-            
-            # Get memory info after clearing
-            info = await cache_client._redis.info('memory')
-            cache_stats['after_memory'] = info.get('used_memory_human', 'Unknown')
-        else:
-            # Clear local rate limiter buckets
-            api_limiter._local_buckets.clear()
-            user_limiter._local_buckets.clear()
-            global_limiter._local_buckets.clear()
-            cache_stats['local_buckets_cleared'] = True
-        
-        # Restart Redis connection
-        await cache_client.close()
-        await cache_client.start()
-        
-        connection_status = "✅ Connected" if cache_client._redis else "⚠️ Unavailable (local fallback)"
+        # Bumping a namespace generation is O(1): old keys are simply never
+        # read again and age out by TTL, so Redis is never blocked
+        generation = await cache_client.invalidate_namespace(namespace)
+        target = namespace or "all namespaces"
         
         stats_text = f"""
 🔄 <b>Cache Reload Complete</b>
 
+📦 <b>Invalidated:</b> {target}
+"""
+        if generation is not None:
+            stats_text += f"• New generation: {generation} (old entries expire on their own)\n"
+        else:
+            stats_text += "• Redis unavailable, local caches cleared only\n"
+        
+        if namespace is None:
+            # Rate limit buckets aren't generation-keyed; remove them in small batches
+            cleared_buckets = 0
+            for shard in cache_client.shard_clients():
+                batch = []
+                async for key in shard.scan_iter(match='ratelimit:*', count=500):
+                    batch.append(key)
+                    if len(batch) >= 500:
+                        cleared_buckets += await shard.unlink(*batch)
+                        batch = []
+                if batch:
+                    cleared_buckets += await shard.unlink(*batch)
+            for limiter in (api_limiter, user_limiter, global_limiter):
+                limiter._local_buckets.clear()
+            
+            # Restart Redis connection
+            await cache_warmer.stop()
+            await cache_client.close()
+            await cache_client.start()
+            
+            connection_status = "✅ Connected" if cache_client._redis else "⚠️ Unavailable (local fallback)"
+            stats_text += f"""• Rate limit buckets cleared: {cleared_buckets}
+
 🗄️ <b>Redis Status:</b> {connection_status}
 """
         
-        if 'cleared_keys' in cache_stats:
-            stats_text += f"""
-📊 <b>Cleared Data:</b>
-• Keys cleared: {cache_stats['cleared_keys']}
-• Memory before: {cache_stats['before_memory']}
-• Memory after: {cache_stats['after_memory']}
-"""
-        elif 'local_buckets_cleared' in cache_stats:
-            stats_text += """
-📊 <b>Cleared Data:</b>
-• Local rate limit buckets cleared
-• Redis unavailable, using local fallback
-"""
+        # Refill the most requested entries in the background
+        cache_warmer.start()
+        cache_warmer.start_recording()
+        stats_text += f"🔥 <b>Warm-up:</b> {'started in background' if cache_warmer.running else 'disabled'}\n"
         
-        logger.info(f"Cache reload completed by owner {settings.owner_id}")
+        logger.info(f"Cache reload ({target}) completed by owner {settings.owner_id}")
         await message.reply_text(stats_text, parse_mode=ParseMode.HTML)
         
     except Exception as e:
@@ -1009,6 +1020,10 @@ async def restart_bot_command(client: Client, message: Message):
         # Give a moment for the message to be sent
         await asyncio.sleep(1)
         
+        # execv skips shutdown, so save the hot cache set for the new process here
+        from infra.cache.snapshot import cache_snapshot
+        await cache_snapshot.save()
+        
         # Restart the bot process
         os.execv(sys.executable, ['python'] + sys.argv)
         
@@ -1123,12 +1138,17 @@ async def cache_stats_command(client: Client, message: Message):
     
     try:
         from infra.cache import cache_client
+        from infra.cache.analyzer import cache_analyzer
+        from app.expiry_refresher import expiry_refresher
+        from infra.http import http_client
         
         if not cache_client._redis:
+            health = cache_client.health()
             await message.reply_text(
                 "📊 <b>Cache Statistics</b>\n\n"
                 "❌ Redis is not connected\n"
-                "💾 Using local fallback caching",
+                f"💾 Using local fallback caching ({health['fallback_entries']} entries, "
+                f"down {health['degraded_for']:.0f}s, {health['reconnect_attempts']} reconnect attempts)",
                 parse_mode=ParseMode.HTML
             )
             return
@@ -1138,6 +1158,22 @@ async def cache_stats_command(client: Client, message: Message):
         stats_info = await cache_client._redis.info('stats')
         keyspace_info = await cache_client._redis.info('keyspace')
         
+        # Cached values are spread over every shard; the figures above are the first one's
+        shard_display = ""
+        shards = cache_client.shard_clients()
+        if len(shards) > 1:
+            shard_display = "\n\n<b>Shards:</b>\n"
+            for index, shard in enumerate(shards):
+                shard_info = await shard.info('memory')
+                shard_keys = await shard.dbsize()
+                address = shard.connection_pool.connection_kwargs
+                branch = '└' if index == len(shards) - 1 else '├'
+                shard_display += (
+                    f"{branch} {address.get('host')}:{address.get('port')}: "
+                    f"{shard_info.get('used_memory_human', 'Unknown')}, {shard_keys:,} keys\n"
+                )
+            shard_display = shard_display.rstrip('\n')
+        
         # Memory stats
         used_memory = memory_info.get('used_memory_human', 'Unknown')
         used_memory_rss = memory_info.get('used_memory_rss_human', 'Unknown')
@@ -1153,52 +1189,123 @@ async def cache_stats_command(client: Client, message: Message):
         total_requests = keyspace_hits + keyspace_misses
         hit_rate = (keyspace_hits / total_requests * 100) if total_requests > 0 else 0
         
-        # Get key counts by namespace
-        v1_keys = await cache_client._redis.keys('v1:*')
-        ratelimit_keys = await cache_client._redis.keys('ratelimit:*')
-        all_keys = v1_keys + ratelimit_keys
-        namespace_counts = {}
-        total_keys = len(all_keys)
-        
-        for key in all_keys:
-            if key.startswith('v1:'):
-                parts = key.split(':')
-                if len(parts) >= 2:
-                    namespace = parts[1]
-                    namespace_counts[namespace] = namespace_counts.get(namespace, 0) + 1
-            elif key.startswith('ratelimit:'):
-                namespace_counts['ratelimit'] = namespace_counts.get('ratelimit', 0) + 1
-        
-        # Count keys with TTL
-        keys_with_ttl = 0
-        for key in all_keys[:50]:  # Sample first 50 keys for performance
-            ttl = await cache_client._redis.ttl(key)
-            if ttl > 0:
-                keys_with_ttl += 1
-        
-        # Estimate total keys with TTL
-        if all_keys:
-            keys_with_ttl = int((keys_with_ttl / min(50, total_keys)) * total_keys) if total_keys > 0 else 0
-        
-        # Build namespace display
-        namespace_display = ""
-        namespace_order = ['imdb_search', 'imdb_details', 'mdl_search', 'mdl_details', 'user_templates', 'ratelimit']
-        
-        for ns in namespace_order:
-            count = namespace_counts.get(ns, 0)
-            namespace_display += f"├ {ns}: {count}\n"
-        
-        # Add any additional namespaces not in the predefined list
-        for ns, count in namespace_counts.items():
-            if ns not in namespace_order:
-                namespace_display += f"├ {ns}: {count}\n"
+        # Per-tier hit ratios tracked by this process
+        tier_display = ""
+        for ns, tiers in cache_client.tier_stats().items():
+            l1 = tiers['l1']
+            l2 = tiers['l2']
+            if l1:
+                tier_display += (
+                    f"├ {ns}: L1 {l1['hit_rate']:.1f}% ({l1['size']}/{l1['max_entries']}, "
+                    f"{l1['evictions']} evicted) | L2 {l2['hit_rate']:.1f}%\n"
+                )
+            else:
+                tier_display += f"├ {ns}: L2 {l2['hit_rate']:.1f}%\n"
+        if tier_display:
+            tier_display = tier_display.rstrip('\n')
+            last_line_idx = tier_display.rfind('├')
+            tier_display = tier_display[:last_line_idx] + '└' + tier_display[last_line_idx + 1:]
+        else:
+            tier_display = "└ No lookups yet"
+        
+        # Per-namespace traffic summed over every replica
+        def _ms(value):
+            if value is None:
+                return "n/a"
+            return ">1s" if value == float('inf') else f"≤{value:g}ms"
+        
+        def _kb(value):
+            return f"{value / 1024 / 1024:.1f}MB" if value >= 1024 * 1024 else f"{value / 1024:.1f}KB"
+        
+        traffic_display = ""
+        traffic = await cache_client.namespace_stats()
+        for ns, ns_stats in traffic.items():
+            traffic_display += (
+                f"├ {ns}: {ns_stats['hit_rate']:.1f}% of {ns_stats['gets']:,} gets, "
+                f"p50 {_ms(ns_stats['p50_ms'])} p99 {_ms(ns_stats['p99_ms'])}\n"
+                f"│   {ns_stats['sets']:,} sets, {ns_stats['errors']:,} errors, "
+                f"{_kb(ns_stats['bytes_read'])} read, {_kb(ns_stats['bytes_written'])} written\n"
+            )
+        if traffic_display:
+            traffic_display = traffic_display.rstrip('\n')
+            last_line_idx = traffic_display.rfind('├')
+            traffic_display = traffic_display[:last_line_idx] + '└' + traffic_display[last_line_idx + 1:]
+            traffic_display = traffic_display[:last_line_idx] + traffic_display[last_line_idx:].replace('│', ' ')
+        else:
+            traffic_display = "└ No traffic recorded yet"
         
-        # Remove the last ├ and replace with └
-        if namespace_display:
-            namespace_display = namespace_display.rstrip('\n')
-            last_line_idx = namespace_display.rfind('├')
-            if last_line_idx != -1:
-                namespace_display = namespace_display[:last_line_idx] + '└' + namespace_display[last_line_idx + 1:]
+        # Request coalescing on cache misses
+        loader = cache_client.loader_stats()
+        
+        # Writes kept out of Redis by the admission policy
+        admission = cache_client.admission_stats()
+        if not admission['enabled']:
+            admission_display = "├ Frequency filter: disabled\n"
+        else:
+            memory = f"{admission['memory_ratio']:.0%} of maxmemory" if admission['memory_ratio'] is not None else "no maxmemory"
+            admission_display = f"├ Frequency filter: {'active' if admission['filtering'] else 'idle'} ({memory})\n"
+        for ns, ns_stats in traffic.items():
+            if ns_stats['rejected_cold'] or ns_stats['rejected_size']:
+                admission_display += (
+                    f"├ {ns}: {ns_stats['sets']:,} admitted, {ns_stats['rejected_cold']:,} cold, "
+                    f"{ns_stats['rejected_size']:,} oversized\n"
+                )
+        admission_display = admission_display.rstrip('\n')
+        last_line_idx = admission_display.rfind('├')
+        admission_display = admission_display[:last_line_idx] + '└' + admission_display[last_line_idx + 1:]
+        
+        # Hot keys re-fetched before they go stale
+        refresh = expiry_refresher.stats()
+        
+        # Adaptive concurrency limit, queue and circuit per upstream host
+        breakers = http_client.breaker_stats()
+        connections = http_client.connection_stats()
+        hosts = http_client.concurrency_stats()
+        upstream_display = ""
+        for index, (host, limiter) in enumerate(hosts.items()):
+            branch = '└' if index == len(hosts) - 1 else '├'
+            circuit = breakers.get(host, {}).get('state', 'closed')
+            warm = connections.get(host, {})
+            upstream_display += (
+                f"{branch} {host}: limit {limiter['limit']}, {limiter['inflight']} in flight, "
+                f"{limiter['queued']} queued ({limiter['queue_timeouts']:,} timed out), circuit {circuit}, "
+                f"{warm.get('warm_hits', 0):,} warm hits ({warm.get('saved_ms', 0):,.0f}ms handshakes saved)\n"
+            )
+        upstream_display = upstream_display.rstrip('\n') or "└ No requests yet"
+        
+        # Key counts come from the background SCAN snapshot, never KEYS
+        snapshot = await cache_analyzer.latest()
+        if snapshot is None:
+            cache_analyzer.request()
+            namespace_display = "└ Keyspace analysis still running, try again shortly"
+            total_keys = keys_with_ttl = "n/a"
+            snapshot_age = "pending"
+        else:
+            namespace_counts = {ns: summary['keys'] for ns, summary in snapshot['namespaces'].items()}
+            totals = cache_analyzer.totals(snapshot)
+            total_keys = totals['keys']
+            keys_with_ttl = totals['keys'] - totals['no_ttl']
+            snapshot_age = f"{time.time() - snapshot['taken_at']:.0f}s ago"
+            
+            # Build namespace display
+            namespace_display = ""
+            namespace_order = ['imdb_search', 'imdb_details', 'mdl_search', 'mdl_details', 'user_templates', 'ratelimit']
+            
+            for ns in namespace_order:
+                count = namespace_counts.get(ns, 0)
+                namespace_display += f"├ {ns}: {count}\n"
+            
+            # Add any additional namespaces not in the predefined list
+            for ns, count in sorted(namespace_counts.items()):
+                if ns not in namespace_order:
+                    namespace_display += f"├ {ns}: {count}\n"
+            
+            # Remove the last ├ and replace with └
+            if namespace_display:
+                namespace_display = namespace_display.rstrip('\n')
+                last_line_idx = namespace_display.rfind('├')
+                if last_line_idx != -1:
+                    namespace_display = namespace_display[:last_line_idx] + '└' + namespace_display[last_line_idx + 1:]
         
         cache_stats_text = f"""📊 <b>/cache_stats</b>
 
@@ -1206,7 +1313,7 @@ async def cache_stats_command(client: Client, message: Message):
 ├ Used: {used_memory}
 ├ RSS: {used_memory_rss}
 ├ Peak: {used_memory_peak}
-└ Fragmentation: {mem_fragmentation_ratio:.2f}
+└ Fragmentation: {mem_fragmentation_ratio:.2f}{shard_display}
 
 <b>Performance:</b>
 ├ Hit Rate: {hit_rate:.2f}%
@@ -1214,11 +1321,35 @@ async def cache_stats_command(client: Client, message: Message):
 ├ Misses: {keyspace_misses:,}
 └ Ops/sec: {instantaneous_ops_per_sec}
 
+<b>Cache Tiers (this instance):</b>
+{tier_display}
+
+<b>Namespace Traffic (all replicas):</b>
+{traffic_display}
+
+<b>Request Coalescing:</b>
+├ Upstream loads: {loader['loads']:,}
+├ Coalesced in-process: {loader['coalesced']:,}
+├ Waited on other replicas: {loader['remote_waits']:,} ({loader['remote_notified']:,} notified, {loader['remote_timeouts']:,} timed out)
+└ In flight: {loader['in_flight']}
+
+<b>Admission (all replicas):</b>
+{admission_display}
+
+<b>Expiry Refresh (this instance):</b>
+├ Sweeps: {refresh['sweeps']:,} ({refresh['due']:,} hot keys due)
+├ Refreshed: {refresh['refreshed']:,} ({refresh['failed']:,} failed)
+└ Skipped: {refresh['skipped_budget']:,} over budget, {refresh['skipped_other_replica']:,} other replica
+
+<b>Upstream Hosts (this instance):</b>
+{upstream_display}
+
 <b>Keys by Type:</b>
 {namespace_display}
 
 <b>Total Keys:</b> {total_keys}
-<b>Keys with TTL:</b> {keys_with_ttl}"""
+<b>Keys with TTL:</b> {keys_with_ttl}
+<b>Keyspace snapshot:</b> {snapshot_age}"""
         
         await message.reply_text(cache_stats_text, parse_mode=ParseMode.HTML)
         
@@ -1235,6 +1366,7 @@ async def cache_analyze_command(client: Client, message: Message):
     
     try:
         from infra.cache import cache_client
+        from infra.cache.analyzer import cache_analyzer
         
         if not cache_client._redis:
             await message.reply_text(
@@ -1245,11 +1377,19 @@ async def cache_analyze_command(client: Client, message: Message):
             )
             return
         
-        # Get all keys for analysis
-        all_keys = await cache_client._redis.keys('v1:*')
-        total_keys = len(all_keys)
+        # Answer from the latest background SCAN snapshot
+        snapshot = await cache_analyzer.latest()
+        if snapshot is None:
+            cache_analyzer.request()
+            await message.reply_text(
+                "🔍 <b>Cache Analysis</b>\n\n"
+                "⏳ Keyspace analysis still running, try again shortly",
+                parse_mode=ParseMode.HTML
+            )
+            return
         
-        if total_keys == 0:
+        totals = cache_analyzer.totals(snapshot)
+        if totals['keys'] == 0:
             await message.reply_text(
                 "🔍 <b>Cache Analysis</b>\n\n"
                 "📭 No keys found in cache",
@@ -1257,77 +1397,48 @@ async def cache_analyze_command(client: Client, message: Message):
             )
             return
         
-        # Analyze keys without TTL
-        keys_without_ttl = 0
-        keys_with_ttl = 0
+        def _tree(lines):
+            if not lines:
+                return "└ none"
+            return "\n".join(f"├ {line}" for line in lines[:-1]) + ("\n" if len(lines) > 1 else "") + f"└ {lines[-1]}"
         
-        # Size distribution counters
-        size_very_small = 0  # < 1KB
-        size_small = 0      # 1KB - 10KB
-        size_medium = 0     # 10KB - 100KB
-        size_large = 0      # > 100KB
+        def _size(value):
+            if value >= 1024 * 1024:
+                return f"{value / 1024 / 1024:.1f}MB"
+            return f"{value / 1024:.1f}KB"
         
-        # Sample keys for performance (analyze up to 100 keys)
-        sample_keys = all_keys[:100] if len(all_keys) > 100 else all_keys
+        # Size distribution, largest first (exact counts from the full scan)
+        size_labels = ["< 1KB", "1KB - 10KB", "10KB - 100KB", "> 100KB"]
+        size_display = _tree([
+            f"{label}: {count}" for label, count in reversed(list(zip(size_labels, totals['size_hist']))) if count
+        ])
         
-        for key in sample_keys:
-            # Check TTL
-            ttl = await cache_client._redis.ttl(key)
-            if ttl == -1:  # No TTL
-                keys_without_ttl += 1
-            else:
-                keys_with_ttl += 1
-            
-            # Check size (get memory usage for this key)
-            try:
-                key_memory = await cache_client._redis.memory_usage(key)
-                if key_memory:
-                    if key_memory < 1024:  # < 1KB
-                        size_very_small += 1
-                    elif key_memory < 10240:  # < 10KB
-                        size_small += 1
-                    elif key_memory < 102400:  # < 100KB
-                        size_medium += 1
-                    else:  # > 100KB
-                        size_large += 1
-            except Exception:
-                # If memory_usage fails, count as very small
-                size_very_small += 1
-        
-        # Extrapolate to total keys if we sampled
-        if len(all_keys) > 100:
-            ratio = total_keys / len(sample_keys)
-            keys_without_ttl = int(keys_without_ttl * ratio)
-            keys_with_ttl = int(keys_with_ttl * ratio)
-            size_very_small = int(size_very_small * ratio)
-            size_small = int(size_small * ratio)
-            size_medium = int(size_medium * ratio)
-            size_large = int(size_large * ratio)
-        
-        # Build size distribution display
-        size_display = ""
-        if size_large > 0:
-            size_display += f"├ > 100KB: {size_large}\n"
-        if size_medium > 0:
-            size_display += f"├ 10KB - 100KB: {size_medium}\n"
-        if size_small > 0:
-            size_display += f"├ 1KB - 10KB: {size_small}\n"
-        if size_very_small > 0:
-            size_display += f"└ < 1KB: {size_very_small}"
-        
-        # Remove trailing newline and fix last connector
-        size_display = size_display.rstrip('\n')
-        if size_display and '└' not in size_display:
-            last_line_idx = size_display.rfind('├')
-            if last_line_idx != -1:
-                size_display = size_display[:last_line_idx] + '└' + size_display[last_line_idx + 1:]
+        ttl_labels = ["< 1m", "1m - 10m", "10m - 1h", "1h - 6h", "6h - 1d", "1d - 7d", "> 7d"]
+        ttl_display = _tree([f"{label}: {count}" for label, count in zip(ttl_labels, totals['ttl_hist']) if count])
+        
+        namespace_display = _tree([
+            f"{ns}: {summary['keys']} keys, {_size(summary['bytes'])}, "
+            f"avg {_size(summary['bytes'] / summary['keys'])}"
+            + (f", {summary['orphaned']} orphaned" if summary['orphaned'] else "")
+            for ns, summary in sorted(snapshot['namespaces'].items(), key=lambda item: -item[1]['bytes'])
+        ])
         
         analysis_text = f"""🔍 <b>Cache Analysis</b>
 
-⏰ <b>Keys without TTL:</b> {keys_without_ttl}
+🔑 <b>Total keys:</b> {totals['keys']} ({_size(totals['bytes'])})
+⏰ <b>Keys without TTL:</b> {totals['no_ttl']}
+🧹 <b>Orphaned by invalidation:</b> {totals['orphaned']}
 
 📊 <b>Key Size Distribution:</b>
-{size_display}"""
+{size_display}
+
+⏳ <b>TTL Distribution:</b>
+{ttl_display}
+
+🗂 <b>By Namespace:</b>
+{namespace_display}
+
+🕒 Snapshot {time.time() - snapshot['taken_at']:.0f}s old, full SCAN took {snapshot['duration']:.1f}s"""
         
         await message.reply_text(analysis_text, parse_mode=ParseMode.HTML)
         
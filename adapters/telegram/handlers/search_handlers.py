@@ -148,10 +148,15 @@ async def _process_mdl_url_direct(client: Client, message: Message, url: str, us
     processing_msg = await message.reply_text("🔍 Processing MyDramaList URL...")
     
     try:
+        # Get user template first so only the fields it uses are read
+        user_template_doc = await mongo_client.db.mdl_templates.find_one({"user_id": user_id})
+        user_template = user_template_doc.get("template") if user_template_doc else None
+        fields = template_service.mdl_fields(user_template)
+        
         # Get drama details from URL
-        drama_data = await mydramalist_adapter.get_drama_by_url(url)
+        drama_data = await mydramalist_adapter.get_drama_by_url(url, fields)
         
-        if not drama_data:
+        if drama_data is None:
             await processing_msg.edit_text("❌ Could not retrieve drama details from this URL. Please check the URL and try again.")
             return
         
@@ -160,10 +165,6 @@ async def _process_mdl_url_direct(client: Client, message: Message, url: str, us
         if not slug:
             slug = "unknown"
         
-        # Get user template
-        user_template_doc = await mongo_client.db.mdl_templates.find_one({"user_id": user_id})
-        user_template = user_template_doc.get("template") if user_template_doc else None
-        
         # Build caption
         caption = template_service.build_mdl_caption(drama_data, slug, user_template)
         
@@ -329,17 +330,18 @@ async def _process_imdb_url_direct(client: Client, message: Message, url: str, u
     processing_msg = await message.reply_text("🔍 Processing IMDB URL...")
     
     try:
+        # Get user template first so only the fields it uses are read
+        user_template_doc = await mongo_client.db.imdb_templates.find_one({"user_id": user_id})
+        user_template = user_template_doc.get("template") if user_template_doc else None
+        fields = template_service.imdb_fields(user_template)
+        
         # Get movie details from URL
-        movie_data = await imdb_adapter.get_movie_by_url(url)
+        movie_data = await imdb_adapter.get_movie_by_url(url, fields)
         
-        if not movie_data:
+        if movie_data is None:
             await processing_msg.edit_text("❌ Could not retrieve movie details from this URL. Please check the URL and try again.")
             return
         
-        # Get user template
-        user_template_doc = await mongo_client.db.imdb_templates.find_one({"user_id": user_id})
-        user_template = user_template_doc.get("template") if user_template_doc else None
-        
         # Build caption
         caption = template_service.build_imdb_caption(movie_data, user_template)
         
@@ -379,17 +381,19 @@ async def drama_details_callback(client: Client, callback_query: CallbackQuery)
         slug = callback_query.data.split("_", 1)[1]
         logger.info(f"User {user_id} requested drama details for: {slug}")
         
+        # Get user template first so only the fields it uses are read
+        user_template_doc = await mongo_client.db.mdl_templates.find_one({"user_id": user_id})
+        user_template = user_template_doc.get("template") if user_template_doc else None
+        fields = template_service.mdl_fields(user_template)
+        
         # Get drama details
-        drama_data = await mydramalist_adapter.get_drama_details(slug)
+        drama_data = await mydramalist_adapter.get_drama_details(slug, fields)
         
-        if not drama_data:
+        # An empty dict is a cached document without any of the template's fields
+        if drama_data is None:
             await callback_query.answer("❌ Failed to get drama details.", show_alert=True)
             return
         
-        # Get user template
-        user_template_doc = await mongo_client.db.mdl_templates.find_one({"user_id": user_id})
-        user_template = user_template_doc.get("template") if user_template_doc else None
-        
         # Build caption
         caption = template_service.build_mdl_caption(drama_data, slug, user_template)
         
@@ -467,17 +471,18 @@ async def imdb_details_callback(client: Client, callback_query: CallbackQuery) -
         movie_id = callback_query.data.split("_", 1)[1]
         logger.info(f"User {user_id} requested IMDB details for: {movie_id}")
         
+        # Get user template first so only the fields it uses are read
+        user_template_doc = await mongo_client.db.imdb_templates.find_one({"user_id": user_id})
+        user_template = user_template_doc.get("template") if user_template_doc else None
+        fields = template_service.imdb_fields(user_template)
+        
         # Get movie details
-        movie_data = await imdb_adapter.get_movie_details(movie_id)
+        movie_data = await imdb_adapter.get_movie_details(movie_id, fields)
         
-        if not movie_data:
+        if movie_data is None:
             await callback_query.answer("❌ Failed to get movie details.", show_alert=True)
             return
         
-        # Get user template
-        user_template_doc = await mongo_client.db.imdb_templates.find_one({"user_id": user_id})
-        user_template = user_template_doc.get("template") if user_template_doc else None
-        
         # Build caption
         caption = template_service.build_imdb_caption(movie_data, user_template)
         
@@ -587,10 +592,15 @@ async def handle_drama_url(client: Client, message: Message) -> None:
     processing_msg = await message.reply_text("🔍 Processing MyDramaList URL...")
     
     try:
+        # Get user template first so only the fields it uses are read
+        user_template_doc = await mongo_client.db.mdl_templates.find_one({"user_id": user_id})
+        user_template = user_template_doc.get("template") if user_template_doc else None
+        fields = template_service.mdl_fields(user_template)
+        
         # Get drama details from URL
-        drama_data = await mydramalist_adapter.get_drama_by_url(url)
+        drama_data = await mydramalist_adapter.get_drama_by_url(url, fields)
         
-        if not drama_data:
+        if drama_data is None:
             await processing_msg.edit_text("❌ Could not retrieve drama details from this URL. Please check the URL and try again.")
             return
         
@@ -599,10 +609,6 @@ async def handle_drama_url(client: Client, message: Message) -> None:
         if not slug:
             slug = "unknown"
         
-        # Get user template
-        user_template_doc = await mongo_client.db.mdl_templates.find_one({"user_id": user_id})
-        user_template = user_template_doc.get("template") if user_template_doc else None
-        
         # Build caption
         caption = template_service.build_mdl_caption(drama_data, slug, user_template)
         
@@ -722,17 +728,18 @@ async def handle_imdb_url(client: Client, message: Message) -> None:
     processing_msg = await message.reply_text("🔍 Processing IMDB URL...")
     
     try:
+        # Get user template first so only the fields it uses are read
+        user_template_doc = await mongo_client.db.imdb_templates.find_one({"user_id": user_id})
+        user_template = user_template_doc.get("template") if user_template_doc else None
+        fields = template_service.imdb_fields(user_template)
+        
         # Get movie details from URL
-        movie_data = await imdb_adapter.get_movie_by_url(url)
+        movie_data = await imdb_adapter.get_movie_by_url(url, fields)
         
-        if not movie_data:
+        if movie_data is None:
             await processing_msg.edit_text("❌ Could not retrieve movie details from this URL. Please check the URL and try again.")
             return
         
-        # Get user template
-        user_template_doc = await mongo_client.db.imdb_templates.find_one({"user_id": user_id})
-        user_template = user_template_doc.get("template") if user_template_doc else None
-        
         # Build caption
         caption = template_service.build_imdb_caption(movie_data, user_template)
         
@@ -114,8 +114,9 @@ async def get_template_command(client: Client, message: Message):
             template_doc = await mongo_client.db.mdl_templates.find_one({"user_id": user_id})
             if template_doc:
                 template = template_doc.get("template", "")
-                # Cache the template for 2 hours
-                await cache_client.set("user_templates", f"mdl_{user_id}", template, ttl=7200)
+                # Cache the template (TTL from the shared policy)
+                ttl = await cache_client.ttl_for("user_templates", f"mdl_{user_id}")
+                await cache_client.set("user_templates", f"mdl_{user_id}", template, ttl=ttl)
         
         if template:
             await message.reply_text(f"📝 Your current MyDramaList template:\n\n<code>{template}</code>", parse_mode=ParseMode.HTML)
@@ -197,8 +198,9 @@ async def preview_template_command(client: Client, message: Message):
             template_doc = await mongo_client.db.mdl_templates.find_one({"user_id": user_id})
             if template_doc:
                 template = template_doc.get("template", "")
-                # Cache the template for 2 hours
-                await cache_client.set("user_templates", f"mdl_{user_id}", template, ttl=7200)
+                # Cache the template (TTL from the shared policy)
+                ttl = await cache_client.ttl_for("user_templates", f"mdl_{user_id}")
+                await cache_client.set("user_templates", f"mdl_{user_id}", template, ttl=ttl)
         
         if not template:
             await message.reply_text("ℹ️ You don't have a custom MyDramaList template set.")
@@ -350,8 +352,9 @@ async def get_imdb_template_command(client: Client, message: Message):
             template_doc = await mongo_client.db.imdb_templates.find_one({"user_id": user_id})
             if template_doc:
                 template = template_doc.get("template", "")
-                # Cache the template for 2 hours
-                await cache_client.set("user_templates", f"imdb_{user_id}", template, ttl=7200)
+                # Cache the template (TTL from the shared policy)
+                ttl = await cache_client.ttl_for("user_templates", f"imdb_{user_id}")
+                await cache_client.set("user_templates", f"imdb_{user_id}", template, ttl=ttl)
         
         if template:
             await message.reply_text(f"📝 Your current IMDB template:\n\n<code>{template}</code>", parse_mode=ParseMode.HTML)
@@ -433,8 +436,9 @@ async def preview_imdb_template_command(client: Client, message: Message):
             template_doc = await mongo_client.db.imdb_templates.find_one({"user_id": user_id})
             if template_doc:
                 template = template_doc.get("template", "")
-                # Cache the template for 2 hours
-                await cache_client.set("user_templates", f"imdb_{user_id}", template, ttl=7200)
+                # Cache the template (TTL from the shared policy)
+                ttl = await cache_client.ttl_for("user_templates", f"imdb_{user_id}")
+                await cache_client.set("user_templates", f"imdb_{user_id}", template, ttl=ttl)
         
         if not template:
             await message.reply_text("ℹ️ You don't have a custom IMDB template set.")
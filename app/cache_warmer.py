@@ -0,0 +1,217 @@
+"""Background cache warm-up from recorded popular keys.
+
+Access frequencies live in Redis (see infra/cache/ttl_policy.py). The
+hottest keys are also copied to MongoDB every CACHE_WARM_RECORD_INTERVAL
+so a restarted, empty Redis can still be warmed.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from domain.services.template_service import DETAILS_SCHEMA_VERSION
+from infra.cache import cache_client
+from infra.cache.redis_client import RELEASE_LOCK_SCRIPT
+from infra.config import settings
+from infra.db import mongo_client
+from infra.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Namespaces in the order ties are broken (cheap, high fan-out searches first)
+WARM_NAMESPACES = ('mdl_search', 'mdl_details', 'imdb_search', 'imdb_details')
+
+# Only one replica warms at a time; the lock outlives a normal run
+WARM_LOCK_KEY = "lock:cache_warm"
+WARM_LOCK_TTL = 900
+
+# Upstream failures in a row (usually rate limiting) that end a run early
+MAX_CONSECUTIVE_FAILURES = 3
+
+POPULAR_KEYS_COLLECTION = "cache_popular_keys"
+
+
+def upstream_fetcher(namespace: str, key: str) -> Optional[Callable[[], Awaitable[Optional[Any]]]]:
+    """Upstream call that produces the value cached under ``namespace:key``.
+
+    Only used off the request path, so MyDramaList calls get the longer
+    background deadline.
+    """
+    from adapters.imdb.imdb_adapter import imdb_adapter
+    from adapters.mydramalist.mydramalist_adapter import mydramalist_adapter
+
+    kind, _, arg = key.partition(':')
+    if kind == 'details':
+        # Documents of an older projection are never read, so never refetched
+        version, _, arg = arg.partition(':')
+        if version != f"v{DETAILS_SCHEMA_VERSION}":
+            return None
+    if not arg:
+        return None
+    background = settings.http_background_deadline
+    fetchers = {
+        ('mdl_search', 'search'): lambda: mydramalist_adapter._fetch_search(arg, background),
+        ('mdl_details', 'details'): lambda: mydramalist_adapter._fetch_details(arg, background),
+        ('imdb_search', 'search'): lambda: imdb_adapter._fetch_search(arg),
+        ('imdb_details', 'details'): lambda: imdb_adapter._fetch_details(arg),
+    }
+    return fetchers.get((namespace, kind))
+
+
+class CacheWarmer:
+    """Re-populates the hottest search and details entries after a cold start."""
+
+    def __init__(self) -> None:
+        self._task: Optional[asyncio.Task] = None
+        self._record_task: Optional[asyncio.Task] = None
+        self.last_run: Dict[str, Any] = {}
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Warm the cache in the background; a run already in progress continues."""
+        if not settings.cache_warm_enabled or settings.cache_warm_budget <= 0:
+            return
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    def start_recording(self) -> None:
+        """Periodically copy the hottest keys to MongoDB."""
+        if not settings.cache_warm_enabled or settings.cache_warm_record_interval <= 0:
+            return
+        if self._record_task is None or self._record_task.done():
+            self._record_task = asyncio.create_task(self._record_loop())
+
+    async def stop(self) -> None:
+        for task in (self._task, self._record_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except (asyncio.CancelledError, Exception):
+                    pass
+        self._task = None
+        self._record_task = None
+
+    async def _record_loop(self) -> None:
+        while True:
+            await asyncio.sleep(settings.cache_warm_record_interval)
+            await self.record()
+
+    async def record(self) -> None:
+        """Save the current hottest keys of each namespace to MongoDB."""
+        for namespace in WARM_NAMESPACES:
+            entries = await cache_client.hottest(namespace, settings.cache_warm_budget)
+            if not entries:
+                continue
+            try:
+                await mongo_client.db[POPULAR_KEYS_COLLECTION].update_one(
+                    {"_id": namespace},
+                    {"$set": {"keys": [list(entry) for entry in entries], "updated_at": time.time()}},
+                    upsert=True
+                )
+            except Exception as e:
+                logger.warning(f"Failed to record popular {namespace} keys: {e}")
+
+    async def _recorded(self, namespace: str) -> List[Tuple[str, float]]:
+        """Popular keys saved by record(), used when Redis has no counters."""
+        try:
+            doc = await mongo_client.db[POPULAR_KEYS_COLLECTION].find_one({"_id": namespace})
+        except Exception as e:
+            logger.warning(f"Failed to load recorded popular {namespace} keys: {e}")
+            return []
+        return [(key, frequency) for key, frequency in (doc or {}).get("keys", [])]
+
+    async def _candidates(self) -> List[Tuple[float, int, str, str]]:
+        """Recorded keys of every warmed namespace, most popular first."""
+        candidates = []
+        for priority, namespace in enumerate(WARM_NAMESPACES):
+            entries = await cache_client.hottest(namespace, settings.cache_warm_budget)
+            if not entries:
+                entries = await self._recorded(namespace)
+            for key, frequency in entries:
+                candidates.append((frequency, priority, namespace, key))
+        candidates.sort(key=lambda item: (-item[0], item[1]))
+        return candidates
+
+    async def _cached(self, candidates: List[Tuple[float, int, str, str]]) -> Set[Tuple[str, str]]:
+        """Candidates already in the cache, read with one get_many per namespace.
+
+        Stale copies count as cached; SWR refreshes them on their next read.
+        The reads aren't user traffic, so they stay out of the hit ratio.
+        """
+        by_namespace: Dict[str, List[str]] = {}
+        for _, _, namespace, key in candidates:
+            by_namespace.setdefault(namespace, []).append(key)
+        cached = set()
+        for namespace, keys in by_namespace.items():
+            values = await cache_client.get_many(namespace, keys, record_stats=False)
+            cached.update((namespace, key) for key, value in values.items() if value is not None)
+        return cached
+
+    async def _run(self) -> None:
+        redis = cache_client._redis
+        if not redis:
+            return
+
+        token = cache_client._instance_id
+        try:
+            if not await redis.set(WARM_LOCK_KEY, token, nx=True, ex=WARM_LOCK_TTL):
+                logger.info("Cache warm-up already running on another replica, skipping")
+                return
+        except Exception as e:
+            logger.warning(f"Cache warm-up lock failed: {e}")
+            return
+
+        started = time.time()
+        stats = {'warmed': 0, 'fresh': 0, 'failed': 0, 'upstream_calls': 0}
+        consecutive_failures = 0
+        try:
+            candidates = await self._candidates()
+            cached = await self._cached(candidates)
+            for _, _, namespace, key in candidates:
+                if stats['upstream_calls'] >= settings.cache_warm_budget:
+                    break
+                if (namespace, key) in cached:
+                    stats['fresh'] += 1
+                    continue
+                fetch = upstream_fetcher(namespace, key)
+                if fetch is None:
+                    continue
+
+                try:
+                    # Warm-up keys are picked by shared access counts, so they
+                    # skip the per-replica frequency filter
+                    value = await cache_client._fetch_and_store(namespace, key, fetch, None, force_admit=True)
+                    result = value is not None
+                except Exception as e:
+                    logger.warning(f"Cache warm-up failed for {namespace}:{key}: {e}")
+                    result = False
+
+                stats['upstream_calls'] += 1
+                stats['warmed' if result else 'failed'] += 1
+                consecutive_failures = 0 if result else consecutive_failures + 1
+                if consecutive_failures >= MAX_CONSECUTIVE_FAILURES:
+                    logger.warning("Cache warm-up stopped early, upstream keeps failing")
+                    break
+                # Leave most of the upstream rate limit to real users
+                await asyncio.sleep(settings.cache_warm_delay)
+        finally:
+            stats['duration'] = time.time() - started
+            stats['finished_at'] = time.time()
+            self.last_run = stats
+            try:
+                await redis.eval(RELEASE_LOCK_SCRIPT, 1, WARM_LOCK_KEY, token)
+            except Exception:
+                pass
+
+        logger.info(
+            f"Cache warm-up finished in {stats['duration']:.1f}s: {stats['warmed']} warmed, "
+            f"{stats['fresh']} already cached, {stats['failed']} failed"
+        )
+
+
+# Global cache warmer instance
+cache_warmer = CacheWarmer()
@@ -60,7 +60,7 @@ class BotCommandManager:
             BotCommand("stop_broadcast", "Stop any active broadcast"),
             BotCommand("log", "Get bot log files"),
             BotCommand("health", "Check service health status"),
-            BotCommand("cachereload", "Clear all caches and restart cache client"),
+            BotCommand("cachereload", "Invalidate one or all cache namespaces"),
             BotCommand("cache_stats", "View detailed Redis cache statistics"),
             BotCommand("cache_analyze", "Analyze cache keys and performance metrics"),
             BotCommand("restart", "Force update from GitHub and restart bot"),
@@ -0,0 +1,86 @@
+"""Warm connections to upstream hosts at startup and through quiet periods.
+
+At startup HTTP_PREWARM_CONNECTIONS connections are opened to kuryana and
+every origin in HTTP_PREWARM_URLS, so the first /mdl doesn't pay for DNS,
+TCP and TLS. Every HTTP_KEEPALIVE_PROBE_INTERVAL seconds (shorter than
+HTTP_KEEPALIVE_TIMEOUT), hosts with too little real traffic to keep
+their pooled connections open get the same cheap HEAD requests again.
+Savings are in ``http_client.connection_stats()`` (see
+infra/http/connections.py).
+"""
+
+import asyncio
+import time
+from typing import List, Optional
+from urllib.parse import urlsplit
+
+from infra.config import settings
+from infra.http import http_client
+from infra.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+def warm_origins() -> List[str]:
+    """Origins to keep connections to: kuryana plus HTTP_PREWARM_URLS."""
+    urls = [settings.mydramalist_api_url]
+    urls += [url.strip() for url in settings.http_prewarm_urls.split(',') if url.strip()]
+    origins = []
+    for url in urls:
+        parts = urlsplit(url)
+        origin = f"{parts.scheme}://{parts.netloc}/"
+        if parts.scheme in ('http', 'https') and origin not in origins:
+            origins.append(origin)
+    return origins
+
+
+class ConnectionWarmer:
+    """Pre-opens pooled connections and keeps them alive while idle."""
+
+    def __init__(self) -> None:
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if settings.http_prewarm_connections <= 0:
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+        self._task = None
+
+    async def _run(self) -> None:
+        origins = warm_origins()
+        await asyncio.gather(*(self._warm(origin, probe=False) for origin in origins))
+        while True:
+            await asyncio.sleep(settings.http_keepalive_probe_interval)
+            # Real traffic keeps busy hosts' connections alive on its own; probe
+            # those whose connections would time out before the next round
+            threshold = max(0.0, settings.http_keepalive_timeout - settings.http_keepalive_probe_interval)
+            idle = [origin for origin in origins if http_client.idle(origin, threshold)]
+            await asyncio.gather(*(self._warm(origin, probe=True) for origin in idle))
+
+    async def _warm(self, origin: str, probe: bool) -> None:
+        started = time.perf_counter()
+        try:
+            opened = await http_client.warm(origin, settings.http_prewarm_connections)
+        except Exception as e:
+            logger.warning(f"Warming connections to {origin} failed: {e}")
+            return
+        if probe:
+            logger.debug(f"Keep-alive probe to {origin}: {opened} connections")
+        else:
+            logger.info(
+                f"Pre-warmed {opened}/{settings.http_prewarm_connections} connections "
+                f"to {origin} in {(time.perf_counter() - started) * 1000:.0f}ms"
+            )
+
+
+# Global connection warmer instance
+connection_warmer = ConnectionWarmer()
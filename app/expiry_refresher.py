@@ -0,0 +1,127 @@
+"""Re-fetch hot cache entries before their fresh lifetime runs out.
+
+Search and details entries are kept for a stale window past their TTL,
+so Redis only expires them once nobody has read them for days; by then
+they are cold. Instead, every CACHE_EXPIRY_REFRESH_INTERVAL seconds the
+CACHE_EXPIRY_REFRESH_KEYS most accessed keys of each namespace (see
+infra/cache/ttl_policy.py) have their remaining lifetimes read in one
+PTTL batch. Keys with a decayed access count of at least
+CACHE_EXPIRY_REFRESH_MIN_HITS that go stale before the next sweep are
+fetched again from upstream, at most CACHE_EXPIRY_REFRESH_BUDGET calls
+per minute, so popular titles never present a stale copy or a cold miss
+to the next user.
+"""
+
+import asyncio
+import time
+from typing import Dict, Optional
+
+from app.cache_warmer import WARM_NAMESPACES, upstream_fetcher
+from infra.cache import cache_client
+from infra.cache.redis_client import REFRESH_LOCK_TTL
+from infra.config import settings
+from infra.logging import get_logger
+
+logger = get_logger(__name__)
+
+BUDGET_WINDOW = 60
+
+
+class ExpiryRefresher:
+    """Sweeps the hottest keys on a timer and refreshes those about to go stale."""
+
+    def __init__(self) -> None:
+        self._task: Optional[asyncio.Task] = None
+        self._window_start = 0.0
+        self._window_calls = 0
+        self.counts: Dict[str, int] = dict.fromkeys((
+            'sweeps', 'due', 'refreshed', 'failed',
+            'skipped_budget', 'skipped_other_replica',
+        ), 0)
+
+    def start(self) -> None:
+        if not settings.cache_expiry_refresh_enabled or settings.cache_expiry_refresh_budget <= 0:
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._sweep()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Expiry refresh sweep error: {e}")
+            await asyncio.sleep(settings.cache_expiry_refresh_interval)
+
+    async def _sweep(self) -> None:
+        self.counts['sweeps'] += 1
+        for namespace in WARM_NAMESPACES:
+            hot = [
+                (key, frequency)
+                for key, frequency in await cache_client.hottest(namespace, settings.cache_expiry_refresh_keys)
+                if frequency >= settings.cache_expiry_refresh_min_hits
+            ]
+            if not hot:
+                continue
+            # Keys that aren't cached at all are left to the warmer and to demand
+            remaining = await cache_client.fresh_for(namespace, [key for key, _ in hot])
+            for key, frequency in hot:
+                if key not in remaining or remaining[key] > settings.cache_expiry_refresh_interval:
+                    continue
+                self.counts['due'] += 1
+                if not self._budget_left():
+                    self.counts['skipped_budget'] += 1
+                    continue
+                try:
+                    await self._refresh(namespace, key, frequency)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    self.counts['failed'] += 1
+                    logger.warning(f"Expiry refresh error for {namespace}:{key}: {e}")
+
+    def _budget_left(self) -> bool:
+        now = time.monotonic()
+        if now - self._window_start >= BUDGET_WINDOW:
+            self._window_start = now
+            self._window_calls = 0
+        return self._window_calls < settings.cache_expiry_refresh_budget
+
+    async def _refresh(self, namespace: str, key: str, frequency: float) -> None:
+        fetch = upstream_fetcher(namespace, key)
+        if fetch is None:
+            return
+
+        # Every replica sweeps the same keys; only one of them refreshes each
+        client = cache_client._redis
+        if client and not await client.set(
+            f"expiry_refresh:{cache_client._make_key(namespace, key)}",
+            cache_client._instance_id, nx=True, ex=REFRESH_LOCK_TTL
+        ):
+            self.counts['skipped_other_replica'] += 1
+            return
+
+        # Usually still fresh for a few seconds, which prefetch() would skip
+        self._window_calls += 1
+        value = await cache_client._fetch_and_store(namespace, key, fetch, None, force_admit=True)
+        self.counts['refreshed' if value is not None else 'failed'] += 1
+        logger.debug(f"Expiry refresh for {namespace}:{key} ({frequency:.1f} recent accesses): {value is not None}")
+
+    def stats(self) -> Dict[str, int]:
+        """Refresh counters since start."""
+        return dict(self.counts)
+
+
+# Global expiry refresher instance
+expiry_refresher = ExpiryRefresher()
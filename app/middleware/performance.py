@@ -62,26 +62,33 @@ class HealthChecker:
         except Exception as e:
             results['mongodb'] = f'error: {e}'
         
-        # Check Redis
+        # Check Redis (the cache client reconnects on its own while degraded)
         try:
+            health = cache_client.health()
             if cache_client._redis:
                 await cache_client._redis.ping()
                 results['redis'] = 'healthy'
+                if health['transitions'] and health['transitions'][-1]['state'] == 'connected':
+                    results['redis'] += f" ({health['transitions'][-1]['reason']})"
+            elif health['mode'] == 'degraded':
+                results['redis'] = (
+                    f"degraded: local fallback for {health['degraded_for']:.0f}s, "
+                    f"{health['fallback_entries']} entries, "
+                    f"{health['reconnect_attempts']} reconnect attempts"
+                )
             else:
-                # Try to reconnect if Redis was disabled
-                logger.info("Attempting to reconnect to Redis...")
-                await cache_client.start()
-                if cache_client._redis:
-                    await cache_client._redis.ping()
-                    results['redis'] = 'healthy (reconnected)'
-                else:
-                    results['redis'] = 'disabled'
+                results['redis'] = 'disabled'
         except Exception as e:
             results['redis'] = f'error: {e}'
         
         # Check HTTP client
         try:
-            if http_client._session:
+            open_circuits = http_client.open_circuits()
+            if open_circuits:
+                results['http'] = "degraded: circuit open for " + ", ".join(
+                    f"{host} (probe in {retry_in:.0f}s)" for host, retry_in in open_circuits.items()
+                )
+            elif http_client._session:
                 results['http'] = 'healthy'
             else:
                 results['http'] = 'not_initialized'
@@ -0,0 +1,10 @@
+"""Offline micro-benchmarks. Run as modules, e.g. ``python -m benchmarks.bench_codec``."""
+
+import os
+
+# Benchmarks never talk to Telegram or MongoDB, but importing infra.* validates
+# the required settings, so provide placeholders when they aren't configured.
+for _var in ("BOT_TOKEN", "API_HASH", "MONGO_URI"):
+    os.environ.setdefault(_var, "benchmark")
+for _var in ("API_ID", "OWNER_ID"):
+    os.environ.setdefault(_var, "1")
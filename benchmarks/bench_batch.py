@@ -0,0 +1,85 @@
+"""Latency of batched cache calls versus a per-key loop against a live Redis.
+
+Usage: REDIS_URL=redis://localhost:6379/15 python -m benchmarks.bench_batch [--rounds 50]
+
+Writes and deletes keys under the ``bench_batch`` namespace only. Set
+REDIS_SHARD_URLS as well to time batches spread over several servers.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Awaitable, Callable, List
+
+from benchmarks import payloads
+from infra.cache import cache_client
+from infra.config import settings
+
+NAMESPACE = "bench_batch"
+
+
+async def _time(func: Callable[[], Awaitable[object]], rounds: int) -> float:
+    """Median wall time of ``func`` in milliseconds."""
+    samples: List[float] = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        await func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+async def run(rounds: int) -> None:
+    # Measure Redis round-trips, not the in-process tier
+    settings.local_cache_enabled = False
+    await cache_client.start()
+    if not cache_client._redis:
+        print("Redis is not reachable, set REDIS_URL")
+        return
+
+    value = payloads.mdl_search(0)
+    print(f"{'keys':>6}{'op':>8}{'loop ms':>12}{'batch ms':>12}{'speedup':>10}")
+    try:
+        for count in (1, 10, 100):
+            keys = [f"k{i}" for i in range(count)]
+            items = {key: value for key in keys}
+
+            async def set_loop() -> None:
+                for key in keys:
+                    await cache_client.set(NAMESPACE, key, value, ttl=60)
+
+            async def get_loop() -> None:
+                for key in keys:
+                    await cache_client.get(NAMESPACE, key)
+
+            async def delete_loop() -> None:
+                for key in keys:
+                    await cache_client.delete(NAMESPACE, key)
+
+            rows = [
+                ("set", set_loop, lambda: cache_client.set_many(NAMESPACE, items, ttl=60)),
+                ("get", get_loop, lambda: cache_client.get_many(NAMESPACE, keys)),
+                ("delete", delete_loop, lambda: cache_client.delete_many(NAMESPACE, keys)),
+            ]
+            for op, loop, batch in rows:
+                if op == "delete":
+                    await cache_client.set_many(NAMESPACE, items, ttl=60)
+                loop_ms = await _time(loop, rounds)
+                if op == "delete":
+                    await cache_client.set_many(NAMESPACE, items, ttl=60)
+                batch_ms = await _time(batch, rounds)
+                print(f"{count:>6}{op:>8}{loop_ms:>12.3f}{batch_ms:>12.3f}{loop_ms / batch_ms:>9.1f}x")
+    finally:
+        await cache_client.delete_many(NAMESPACE, [f"k{i}" for i in range(100)])
+        await cache_client.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(run(args.rounds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Compare bytes-per-entry and encode/decode time of cache codecs.
+
+Usage: python -m benchmarks.bench_codec [--entries 200] [--rounds 20]
+"""
+
+import argparse
+import json
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from benchmarks import payloads
+from infra.cache.codec import CacheCodec, msgpack, zstandard
+
+
+def _legacy_encode(value: Any) -> bytes:
+    """What CacheClient.set stored before the codec layer."""
+    return json.dumps(value).encode('utf-8')
+
+
+def _legacy_decode(raw: bytes) -> Any:
+    return json.loads(raw)
+
+
+def _candidates() -> List[Tuple[str, Callable[[Any], bytes], Callable[[bytes], Any]]]:
+    candidates = [("legacy json.dumps", _legacy_encode, _legacy_decode)]
+    configs = [("json", "none"), ("json", "zlib")]
+    if zstandard is not None:
+        configs.append(("json", "zstd"))
+    if msgpack is not None:
+        configs.append(("msgpack", "none"))
+        if zstandard is not None:
+            configs.append(("msgpack", "zstd"))
+
+    for serializer, compression in configs:
+        codec = CacheCodec(serializer=serializer, compression=compression)
+        candidates.append((f"{serializer}+{compression}", codec.encode, codec.decode))
+    return candidates
+
+
+def _measure(values: List[Any], encode, decode, rounds: int) -> Dict[str, float]:
+    encoded = [encode(value) for value in values]
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for value in values:
+            encode(value)
+    encode_us = (time.perf_counter() - start) / (rounds * len(values)) * 1e6
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for raw in encoded:
+            decode(raw)
+    decode_us = (time.perf_counter() - start) / (rounds * len(values)) * 1e6
+
+    return {
+        'bytes': sum(len(raw) for raw in encoded) / len(encoded),
+        'encode_us': encode_us,
+        'decode_us': decode_us,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    datasets = {
+        'mdl_details': [payloads.mdl_details(seed) for seed in range(args.entries)],
+        'imdb_details': [payloads.imdb_details(seed) for seed in range(args.entries)],
+        'mdl_search': [payloads.mdl_search(seed) for seed in range(args.entries)],
+    }
+
+    for name, values in datasets.items():
+        print(f"\n{name} ({len(values)} entries)")
+        print(f"{'codec':<20}{'bytes/entry':>12}{'encode µs':>12}{'decode µs':>12}")
+        for label, encode, decode in _candidates():
+            result = _measure(values, encode, decode, args.rounds)
+            print(f"{label:<20}{result['bytes']:>12.0f}{result['encode_us']:>12.1f}{result['decode_us']:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
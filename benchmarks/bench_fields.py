@@ -0,0 +1,86 @@
+"""Bytes read and decode time per caption: whole-blob versus hash-field storage.
+
+Usage: python -m benchmarks.bench_fields [--entries 200] [--rounds 20]
+
+Byte counts are cached payload bytes only (no RESP framing), as recorded by
+CacheClient's per-namespace stats.
+"""
+
+import argparse
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from benchmarks import payloads
+from domain.services.template_service import template_service
+from infra.cache.codec import CacheCodec
+from infra.config import settings
+
+# Caption templates from short to long, plus the built-in default caption
+MDL_TEMPLATES: List[Tuple[str, Optional[str]]] = [
+    ("title+rating", "<b>{title}</b> ⭐️ {rating}\n{link}"),
+    ("typical", "<b>{title}</b> ({year})\n{country} | {episodes} eps\n{genres}\n⭐️ {rating}\n{link}"),
+    ("synopsis", "<b>{title}</b>\n{native_title}\n{genres}\n{tags}\n{synopsis}\n{link}"),
+    ("default", None),
+]
+IMDB_TEMPLATES: List[Tuple[str, Optional[str]]] = [
+    ("title+rating", "<b>{title}</b> ⭐️ {rating}\n{imdb_url}"),
+    ("typical", "<b>{title}</b> ({year})\n{kind} | {runtime}\n{genres}\n⭐️ {rating} ({votes})\n{imdb_url}"),
+    ("cast+plot", "<b>{title}</b>\n{directors}\n{cast}\n{plot}\n{imdb_url}"),
+    ("default", None),
+]
+
+
+def _measure(codec: CacheCodec, docs: List[Dict[str, Any]], fields: Optional[set], rounds: int) -> Dict[str, float]:
+    """Average bytes and decode µs per read; ``fields`` None means the blob path."""
+    if fields is None:
+        reads = [[codec.encode(doc)] for doc in docs]
+    else:
+        reads = [[codec.encode(doc[field]) for field in fields if field in doc] for doc in docs]
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for frames in reads:
+            for frame in frames:
+                codec.decode(frame)
+    decode_us = (time.perf_counter() - start) / (rounds * len(reads)) * 1e6
+
+    return {
+        'bytes': sum(len(frame) for frames in reads for frame in frames) / len(reads),
+        'decode_us': decode_us,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    codec = CacheCodec(
+        serializer=settings.cache_serializer,
+        compression=settings.cache_compression,
+        compress_threshold=settings.cache_compress_threshold,
+    )
+    datasets = [
+        ('mdl_details', [payloads.mdl_details(seed) for seed in range(args.entries)],
+         MDL_TEMPLATES, template_service.mdl_fields),
+        ('imdb_details', [payloads.imdb_details(seed) for seed in range(args.entries)],
+         IMDB_TEMPLATES, template_service.imdb_fields),
+    ]
+
+    for name, docs, templates, fields_for in datasets:
+        blob = _measure(codec, docs, None, args.rounds)
+        print(f"\n{name} ({len(docs)} entries, blob {blob['bytes']:.0f} B, {blob['decode_us']:.1f} µs)")
+        print(f"{'template':<14}{'fields':>8}{'bytes':>10}{'of blob':>10}{'decode µs':>12}{'speedup':>10}")
+        for label, template in templates:
+            fields = fields_for(template)
+            result = _measure(codec, docs, fields, args.rounds)
+            print(
+                f"{label:<14}{len(fields):>8}{result['bytes']:>10.0f}"
+                f"{result['bytes'] / blob['bytes'] * 100:>9.0f}%{result['decode_us']:>12.1f}"
+                f"{blob['decode_us'] / result['decode_us']:>9.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
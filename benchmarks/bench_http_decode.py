@@ -0,0 +1,74 @@
+"""Decode time of kuryana search and details responses per JSON parser.
+
+Usage: python -m benchmarks.bench_http_decode [--responses 100] [--rounds 50]
+
+"str + json" is what ``response.json()`` did before: decode the body to
+text, then parse it. The other rows parse the raw bytes directly, as
+HTTPClient does now with HTTP_JSON_PARSER.
+"""
+
+import argparse
+import json
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from benchmarks import payloads
+from infra.http.client import orjson
+
+
+def _search_response(seed: int) -> bytes:
+    """A full kuryana ``/search/q/{query}`` body."""
+    return json.dumps({
+        'query': f"query {seed}",
+        'results': {'dramas': payloads.mdl_search(seed), 'people': []},
+    }).encode('utf-8')
+
+
+def _details_response(seed: int) -> bytes:
+    """A full kuryana ``/id/{slug}`` body."""
+    data = payloads.mdl_details(seed)
+    return json.dumps({'slug_query': data['link'].rsplit('/', 1)[-1], 'data': data}).encode('utf-8')
+
+
+def _parsers() -> List[Tuple[str, Callable[[bytes], Any]]]:
+    parsers = [
+        ("str + json", lambda body: json.loads(body.decode('utf-8'))),
+        ("bytes json", json.loads),
+    ]
+    if orjson is not None:
+        parsers.append(("bytes orjson", orjson.loads))
+    return parsers
+
+
+def _measure(bodies: List[bytes], parse: Callable[[bytes], Any], rounds: int) -> float:
+    """Average µs per body."""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for body in bodies:
+            parse(body)
+    return (time.perf_counter() - start) / (rounds * len(bodies)) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--responses", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    datasets: Dict[str, List[bytes]] = {
+        'search': [_search_response(seed) for seed in range(args.responses)],
+        'details': [_details_response(seed) for seed in range(args.responses)],
+    }
+
+    print(f"{'response':<10}{'avg B':>9}{'parser':>16}{'µs':>10}{'speedup':>10}")
+    for name, bodies in datasets.items():
+        size = sum(map(len, bodies)) / len(bodies)
+        baseline = None
+        for label, parse in _parsers():
+            micros = _measure(bodies, parse, args.rounds)
+            baseline = baseline or micros
+            print(f"{name:<10}{size:>9.0f}{label:>16}{micros:>10.1f}{baseline / micros:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Entry size and decode time of details documents before and after projection.
+
+Usage: python -m benchmarks.bench_projection [--entries 200] [--rounds 20]
+
+Sizes are encoded cache values with the configured serializer and
+compression, as written to Redis.
+"""
+
+import argparse
+import time
+from typing import Any, Dict, List
+
+from benchmarks import payloads
+from domain.services.template_service import template_service
+from infra.cache.codec import CacheCodec
+from infra.config import settings
+
+
+def _measure(codec: CacheCodec, docs: List[Dict[str, Any]], rounds: int) -> Dict[str, float]:
+    """Average encoded bytes and decode µs per entry."""
+    frames = [codec.encode(doc) for doc in docs]
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for frame in frames:
+            codec.decode(frame)
+    return {
+        'bytes': sum(map(len, frames)) / len(frames),
+        'decode_us': (time.perf_counter() - start) / (rounds * len(frames)) * 1e6,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    codec = CacheCodec(
+        serializer=settings.cache_serializer,
+        compression=settings.cache_compression,
+        compress_threshold=settings.cache_compress_threshold,
+    )
+    mdl = [payloads.mdl_details(seed) for seed in range(args.entries)]
+    imdb = [payloads.imdb_details(seed) for seed in range(args.entries)]
+    datasets = [
+        ('mdl_details', mdl, [template_service.project_mdl_details(doc) for doc in mdl]),
+        ('imdb_details', imdb, [template_service.project_imdb_details(doc) for doc in imdb]),
+    ]
+
+    print(f"{'namespace':<14}{'full B':>10}{'projected B':>13}{'saved':>8}{'full µs':>10}{'proj. µs':>10}{'speedup':>10}")
+    for name, full_docs, projected_docs in datasets:
+        full = _measure(codec, full_docs, args.rounds)
+        projected = _measure(codec, projected_docs, args.rounds)
+        print(
+            f"{name:<14}{full['bytes']:>10.0f}{projected['bytes']:>13.0f}"
+            f"{(1 - projected['bytes'] / full['bytes']) * 100:>7.0f}%"
+            f"{full['decode_us']:>10.1f}{projected['decode_us']:>10.1f}"
+            f"{full['decode_us'] / projected['decode_us']:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
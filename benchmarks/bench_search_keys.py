@@ -0,0 +1,105 @@
+"""Search-cache hit ratio of raw, canonical and aliased keys on a replayed query log.
+
+Usage: python -m benchmarks.bench_search_keys [--log queries.txt] [--queries 5000] [--titles 2000]
+
+``--log`` replays one query per line (e.g. grepped from the bot's
+"searching MDL for" log lines); without it a synthetic log with realistic
+spelling variants is generated. Keys never expire, so the numbers are an
+upper bound for the hit ratio within one TTL window.
+"""
+
+import argparse
+import random
+from typing import Callable, Dict, List
+
+from benchmarks import payloads
+from infra.cache.keys import canonical_query, compact_query
+
+_TITLES = [
+    "Squid Game", "Crash Landing on You", "It's Okay to Not Be Okay", "Goblin",
+    "Mr. Queen", "Reply 1988", "Extraordinary Attorney Woo", "Hospital Playlist",
+    "Vincenzo", "My Mister", "Spider-Man: No Way Home", "Itaewon Class",
+    "Business Proposal", "The Glory", "Moving", "Twenty-Five Twenty-One",
+    "사랑의 불시착", "오징어 게임", "陈情令", "半沢直樹", "Start-Up", "Kingdom",
+]
+
+_FULLWIDTH = {chr(c): chr(c + 0xFEE0) for c in range(0x21, 0x7F)}
+
+
+def _variant(rng: random.Random, title: str) -> str:
+    """How users actually type a title they are looking for."""
+    choice = rng.random()
+    if choice < 0.40:
+        return title
+    if choice < 0.60:
+        return title.lower()
+    if choice < 0.68:
+        return title.upper()
+    if choice < 0.76:
+        return f"  {title.lower()}  ".replace(" ", "  ")
+    if choice < 0.84:
+        return title.replace("'", "").replace(":", "").replace(".", "").replace("-", " ")
+    if choice < 0.90:
+        return title.lower().replace(" ", "").replace("-", "")
+    if choice < 0.95:
+        return "".join(_FULLWIDTH.get(char, char) for char in title)
+    return title + rng.choice(["?", "!", " ", "..."])
+
+
+def _synthetic_log(queries: int, titles: int) -> List[str]:
+    rng = random.Random(7)
+    pool = _TITLES + [payloads._title(rng) for _ in range(titles - len(_TITLES))]
+    # Zipf-ish popularity: a few titles account for most searches, with a long tail
+    weights = [1 / (rank + 1) for rank in range(len(pool))]
+    return [_variant(rng, rng.choices(pool, weights)[0]) for _ in range(queries)]
+
+
+def _replay(log: List[str], key: Callable[[str], str]) -> float:
+    seen = set()
+    hits = 0
+    for query in log:
+        cache_key = key(query)
+        if cache_key in seen:
+            hits += 1
+        seen.add(cache_key)
+    return hits / len(log) * 100
+
+
+def _aliased() -> Callable[[str], str]:
+    """In-memory equivalent of search_cache_key with the alias index enabled."""
+    aliases: Dict[str, str] = {}
+
+    def key(query: str) -> str:
+        canonical = canonical_query(query)
+        return aliases.setdefault(compact_query(canonical), canonical)
+
+    return key
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--log", help="file with one query per line")
+    parser.add_argument("--queries", type=int, default=5000)
+    parser.add_argument("--titles", type=int, default=2000, help="distinct titles in the synthetic log")
+    args = parser.parse_args()
+
+    if args.log:
+        with open(args.log, encoding="utf-8") as f:
+            log = [line.rstrip("\n") for line in f if line.strip()]
+    else:
+        log = _synthetic_log(args.queries, args.titles)
+
+    rows = [
+        ("raw query", lambda query: query),
+        ("canonical", canonical_query),
+        ("canonical + alias", _aliased()),
+    ]
+    print(f"{len(log)} queries")
+    print(f"{'key':<20}{'distinct':>10}{'hit ratio':>12}")
+    for label, key in rows:
+        distinct = len({key(query) for query in log})
+        print(f"{label:<20}{distinct:>10}{_replay(log, key):>11.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""Check and time sharded caching against several live Redis servers.
+
+Usage: python -m benchmarks.bench_shards \
+           --urls redis://localhost:6379/15,redis://localhost:6380/15,redis://localhost:6381/15 \
+           [--keys 3000] [--rounds 20]
+
+Without --urls, REDIS_URL and REDIS_SHARD_URLS are used. The first URL
+is the coordination server. Checks that keys spread evenly and sit on
+the shard the ring picks, that get_many/set_many/delete_many work across
+shards, that invalidate_namespace hides every shard's keys, and that
+coordination keys (generations, locks, counters) stay on the first
+server. Writes and deletes keys under the ``bench_shards`` namespace
+only; exits non-zero if a check fails.
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from typing import Awaitable, Callable, List
+
+from infra.cache.redis_client import GENERATIONS_KEY, CacheClient
+from infra.config import settings
+
+NAMESPACE = "bench_shards"
+
+# Key patterns that must only ever exist on the coordination server
+COORDINATION_PATTERNS = ("cache:*", "lock:*", "refresh:*", "freq:*", "stats:*")
+
+# Smallest share of an even split any shard may hold
+MIN_SHARE = 0.7
+
+
+class Checks:
+    """Collects pass/fail lines and prints them as they come."""
+
+    def __init__(self) -> None:
+        self.failed = 0
+
+    def report(self, name: str, ok: bool, detail: str = "") -> None:
+        if not ok:
+            self.failed += 1
+        print(f"{'ok' if ok else 'FAILED':>7}  {name}{f': {detail}' if detail else ''}")
+
+
+async def _time(func: Callable[[], Awaitable[object]], rounds: int) -> float:
+    """Median wall time of ``func`` in milliseconds."""
+    samples: List[float] = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        await func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+async def _namespace_keys(client) -> List[str]:
+    # Every generation, so invalidated leftovers are found too
+    return [key async for key in client.scan_iter(match=f"v1:{NAMESPACE}:*", count=1000)]
+
+
+async def run(key_count: int, rounds: int) -> int:
+    # Measure Redis round-trips, not the in-process tier
+    settings.local_cache_enabled = False
+    # A client of its own, built after --urls has been applied
+    cache_client = CacheClient()
+    await cache_client.start()
+    shards = cache_client.shard_clients()
+    if not shards:
+        print("Redis is not reachable, check the URLs")
+        return 1
+    if len(shards) < 2:
+        print("Only one Redis server configured, pass at least two URLs")
+        await cache_client.close()
+        return 1
+
+    checks = Checks()
+    keys = [f"k{i}" for i in range(key_count)]
+    items = {key: {'n': index} for index, key in enumerate(keys)}
+    try:
+        # Spread and placement
+        written = await cache_client.set_many(NAMESPACE, items, ttl=300)
+        checks.report("set_many across shards", all(written.values()), f"{sum(written.values())}/{key_count}")
+        counts = []
+        misplaced = 0
+        for index, shard in enumerate(shards):
+            held = await _namespace_keys(shard)
+            counts.append(len(held))
+            misplaced += sum(1 for key in held if cache_client.shard_for(key) is not shard)
+        even = key_count / len(shards)
+        checks.report(
+            "keys spread over every shard", min(counts) >= even * MIN_SHARE,
+            ", ".join(f"{count} ({count / even:.0%})" for count in counts)
+        )
+        checks.report("keys on the shard the ring picks", misplaced == 0, f"{misplaced} misplaced")
+
+        # Batch reads and deletes
+        values = await cache_client.get_many(NAMESPACE, keys)
+        checks.report("get_many returns every shard's values", values == items)
+        deleted = await cache_client.delete_many(NAMESPACE, keys)
+        remaining = sum([len(await _namespace_keys(shard)) for shard in shards])
+        checks.report("delete_many clears every shard", deleted == key_count and remaining == 0,
+                      f"{deleted} deleted, {remaining} left")
+
+        # Invalidation: one generation bump on the coordination server hides all shards
+        await cache_client.set_many(NAMESPACE, items, ttl=300)
+        await cache_client.invalidate_namespace(NAMESPACE)
+        values = await cache_client.get_many(NAMESPACE, keys)
+        hidden = sum(1 for value in values.values() if value is None)
+        checks.report("invalidate_namespace hides every shard", hidden == key_count, f"{hidden}/{key_count} hidden")
+
+        # Coordination keys: loads take a lock and count accesses
+        async def fetch() -> dict:
+            return {'fetched': True}
+        for key in keys[:20]:
+            await cache_client.cached_fetch(NAMESPACE, key, fetch, ttl=300)
+        await cache_client._stats.flush(cache_client._redis)
+        await cache_client._ttl_policy.flush(cache_client._redis)
+        stray = []
+        for shard in shards[1:]:
+            for pattern in COORDINATION_PATTERNS:
+                stray += [key async for key in shard.scan_iter(match=pattern, count=1000)]
+        checks.report("generations on the first server", bool(await shards[0].hexists(GENERATIONS_KEY, NAMESPACE)))
+        checks.report("no coordination keys on other shards", not stray, ", ".join(stray[:5]))
+
+        # Timing of cross-shard batches
+        print(f"\n{'op':>10}{'keys':>8}{'shards':>8}{'batch ms':>12}")
+        for op, batch in (
+            ("set_many", lambda: cache_client.set_many(NAMESPACE, items, ttl=300)),
+            ("get_many", lambda: cache_client.get_many(NAMESPACE, keys)),
+        ):
+            print(f"{op:>10}{key_count:>8}{len(shards):>8}{await _time(batch, rounds):>12.3f}")
+    finally:
+        for shard in shards:
+            leftovers = await _namespace_keys(shard)
+            if leftovers:
+                await shard.delete(*leftovers)
+        await shards[0].hdel(GENERATIONS_KEY, NAMESPACE)
+        await cache_client.close()
+
+    print(f"\n{checks.failed} check(s) failed" if checks.failed else "\nAll checks passed")
+    return 1 if checks.failed else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--urls", default="", help="comma-separated Redis URLs, coordination server first")
+    parser.add_argument("--keys", type=int, default=3000)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+    if args.urls:
+        urls = [url.strip() for url in args.urls.split(',') if url.strip()]
+        settings.redis_url = urls[0]
+        settings.redis_shard_urls = ",".join(urls[1:])
+    sys.exit(asyncio.run(run(args.keys, args.rounds)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Write and restore time of the warm-restart cache snapshot.
+
+Usage: python -m benchmarks.bench_snapshot [--entries 100000] [--path /tmp/bench_snapshot.bin]
+
+Always times the file write and the memory-mapped read. If REDIS_URL points
+at a reachable Redis, also times restoring the entries into it (keys under
+the ``bench_snapshot`` namespace only, deleted afterwards).
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from typing import List
+
+from benchmarks import payloads
+from infra.cache import cache_client
+from infra.cache.codec import CacheCodec
+from infra.cache.snapshot import SnapshotEntry, read_snapshot, write_snapshot
+from infra.config import settings
+
+NAMESPACE = "bench_snapshot"
+
+# Distinct payloads to cycle through; encoding 100k unique documents would
+# dominate the run without changing what is measured
+DISTINCT_VALUES = 500
+
+
+def _entries(count: int) -> List[SnapshotEntry]:
+    codec = CacheCodec(
+        serializer=settings.cache_serializer,
+        compression=settings.cache_compression,
+        compress_threshold=settings.cache_compress_threshold,
+    )
+    values = []
+    for seed in range(DISTINCT_VALUES):
+        value = payloads.mdl_details(seed) if seed % 2 else payloads.mdl_search(seed)
+        values.append(codec.encode(value))
+    expires_at_ms = int((time.time() + 3600) * 1000)
+    return [
+        (NAMESPACE, f"details:{i}", values[i % DISTINCT_VALUES], expires_at_ms)
+        for i in range(count)
+    ]
+
+
+async def _restore(by_namespace) -> None:
+    # Measure Redis writes, not the in-process tier
+    settings.local_cache_enabled = False
+    await cache_client.start()
+    if not cache_client._redis:
+        print("Redis is not reachable, skipping restore (set REDIS_URL)")
+        return
+    entries = by_namespace[NAMESPACE]
+    keys = [key for key, _, _ in entries]
+    try:
+        await cache_client.delete_many(NAMESPACE, keys)
+        start = time.perf_counter()
+        written = await cache_client.restore_entries(NAMESPACE, entries)
+        print(f"restore to Redis  {time.perf_counter() - start:>8.2f}s  ({written:,} written)")
+
+        start = time.perf_counter()
+        dumped = await cache_client.dump_entries(NAMESPACE, keys)
+        print(f"dump from Redis   {time.perf_counter() - start:>8.2f}s  ({len(dumped):,} entries)")
+    finally:
+        for start in range(0, len(keys), 10000):
+            await cache_client.delete_many(NAMESPACE, keys[start:start + 10000])
+        await cache_client.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=100000)
+    parser.add_argument("--path", default="/tmp/bench_snapshot.bin")
+    args = parser.parse_args()
+
+    entries = _entries(args.entries)
+    print(f"{args.entries:,} entries, {sum(len(value) for _, _, value, _ in entries) / len(entries):.0f} B average value")
+
+    start = time.perf_counter()
+    size = write_snapshot(args.path, entries)
+    print(f"write snapshot    {time.perf_counter() - start:>8.2f}s  ({size / 1024 / 1024:.1f}MB)")
+
+    start = time.perf_counter()
+    _, by_namespace = read_snapshot(args.path)
+    print(f"mmap + parse      {time.perf_counter() - start:>8.2f}s  ({sum(map(len, by_namespace.values())):,} entries)")
+
+    try:
+        asyncio.run(_restore(by_namespace))
+    finally:
+        os.remove(args.path)
+
+
+if __name__ == "__main__":
+    main()
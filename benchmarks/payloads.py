@@ -0,0 +1,158 @@
+"""Deterministic payloads shaped like real kuryana and imdbinfo responses."""
+
+import random
+from typing import Any, Dict, List
+
+_WORDS = (
+    "love secret family revenge doctor office city palace night queen king "
+    "romance mystery justice spring winter memory promise destiny hospital "
+    "lawyer chef idol village moon star river school friend brother sister"
+).split()
+
+_GENRES = ["Romance", "Comedy", "Drama", "Thriller", "Mystery", "Historical", "Fantasy", "Action"]
+_COUNTRIES = ["South Korea", "Japan", "China", "Taiwan", "Thailand"]
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(words)).capitalize() + "."
+
+
+def _title(rng: random.Random) -> str:
+    return " ".join(rng.choice(_WORDS).capitalize() for _ in range(rng.randint(1, 4)))
+
+
+def mdl_details(seed: int = 0) -> Dict[str, Any]:
+    """A kuryana ``/id/{slug}`` ``data`` object."""
+    rng = random.Random(seed)
+    title = _title(rng)
+    slug = f"{rng.randint(10000, 799999)}-{title.lower().replace(' ', '-')}"
+    year = rng.randint(2005, 2025)
+    return {
+        "link": f"https://mydramalist.com/{slug}",
+        "title": title,
+        "complete_title": f"{title} ({year})",
+        "sub_title": f"Korean Drama - {year}",
+        "year": year,
+        "rating": round(rng.uniform(6.0, 9.5), 1),
+        "poster": f"https://i.mydramalist.com/{rng.randint(100000, 999999)}c.jpg",
+        "synopsis": " ".join(_sentence(rng, rng.randint(8, 20)) for _ in range(rng.randint(4, 9))),
+        "casts": [
+            {
+                "name": _title(rng),
+                "profile_image": f"https://i.mydramalist.com/{rng.randint(100000, 999999)}s.jpg",
+                "slug": f"people/{rng.randint(1000, 99999)}",
+                "link": f"https://mydramalist.com/people/{rng.randint(1000, 99999)}",
+                "role": {"name": _title(rng), "type": rng.choice(["Main Role", "Support Role", "Guest Role"])},
+            }
+            for _ in range(rng.randint(15, 40))
+        ],
+        "details": {
+            "country": rng.choice(_COUNTRIES),
+            "type": rng.choice(["Drama", "Movie"]),
+            "episodes": str(rng.choice([12, 16, 20, 24, 32, 50])),
+            "aired": f"Jan {rng.randint(1, 28)}, {year} - Mar {rng.randint(1, 28)}, {year}",
+            "aired_on": "Saturday, Sunday",
+            "original_network": rng.choice(["tvN", "JTBC", "Netflix", "SBS", "MBC", "KBS2"]),
+            "duration": f"{rng.randint(40, 80)} min.",
+            "content_rating": "15+ - Teens 15 or older",
+            "score": f"{round(rng.uniform(6.0, 9.5), 1)} (scored by {rng.randint(1000, 99999):,} users)",
+            "ranked": f"#{rng.randint(1, 5000)}",
+            "popularity": f"#{rng.randint(1, 5000)}",
+            "watchers": f"{rng.randint(1000, 200000):,}",
+            "favorites": f"{rng.randint(100, 20000):,}",
+        },
+        "others": {
+            "native_title": [_title(rng)],
+            "also_known_as": [_title(rng) for _ in range(rng.randint(1, 6))],
+            "screenwriter": [_title(rng)],
+            "director": [_title(rng)],
+            "genres": rng.sample(_GENRES, 3),
+            "tags": [f"{_title(rng)}" for _ in range(rng.randint(8, 20))] + ["(Vote tags)"],
+        },
+    }
+
+
+def mdl_search(seed: int = 0, results: int = 20) -> List[Dict[str, Any]]:
+    """The ``results.dramas`` list of a kuryana ``/search/q/{query}`` response."""
+    rng = random.Random(seed)
+    dramas = []
+    for _ in range(results):
+        title = _title(rng)
+        slug = f"{rng.randint(10000, 799999)}-{title.lower().replace(' ', '-')}"
+        dramas.append({
+            "slug": slug,
+            "thumb": f"https://i.mydramalist.com/{rng.randint(100000, 999999)}t.jpg",
+            "mdl_id": f"mdl-{rng.randint(10000, 799999)}",
+            "title": title,
+            "ranking": f"#{rng.randint(1, 9000)}",
+            "type": f"Korean {rng.choice(['Drama', 'Movie'])}",
+            "year": rng.randint(2005, 2025),
+            "series": rng.choice([True, False]),
+        })
+    return dramas
+
+
+def imdb_movie_raw(seed: int = 0) -> Dict[str, Any]:
+    """The dict ``IMDBAdapter._sync_get_movie`` builds before transformation."""
+    rng = random.Random(seed)
+    title = _title(rng)
+
+    def names(count: int) -> List[str]:
+        return [_title(rng) for _ in range(count)]
+
+    return {
+        'title': title,
+        'year': str(rng.randint(1980, 2025)),
+        'rating': str(round(rng.uniform(5.0, 9.5), 1)),
+        'votes': str(rng.randint(1000, 2000000)),
+        'plot': [" ".join(_sentence(rng, rng.randint(10, 20)) for _ in range(3))],
+        'genres': rng.sample(_GENRES, 3),
+        'runtimes': [str(rng.randint(80, 180))],
+        'countries': rng.sample(_COUNTRIES, 2),
+        'country_codes': ['KR', 'US'],
+        'languages': ['ko', 'en'],
+        'languages_text': ['Korean', 'English'],
+        'mpaa': 'Rated R for violence',
+        'kind': rng.choice(['movie', 'tvSeries']),
+        'url': f"https://www.imdb.com/title/tt{rng.randint(1000000, 9999999)}/",
+        'cover_url': f"https://m.media-amazon.com/images/M/{rng.randint(10**9, 10**10)}.jpg",
+        'imdb_id': f"tt{rng.randint(1000000, 9999999)}",
+        'is_series': False,
+        'is_episode': False,
+        'info_series': None,
+        'info_episode': None,
+        'release_dates': [f"{_title(rng)} {rng.randint(1, 28)} March {rng.randint(1980, 2025)}" for _ in range(40)],
+        'premiere_date': f"{rng.randint(1980, 2025)}-05-21",
+        'original_air_date': None,
+        'aspect_ratios': ['2.39 : 1'],
+        'sound_mix': ['Dolby Atmos', 'DTS'],
+        'color_info': ['Color'],
+        'cameras': [f"{_title(rng)} Camera, {_title(rng)} Lenses" for _ in range(6)],
+        'budget': f"${rng.randint(1, 200)},000,000",
+        'gross': f"${rng.randint(1, 900)},000,000",
+        'weekend': None,
+        'opening_weekend_usa': f"${rng.randint(1, 100)},000,000",
+        'certificates': [f"{country}:{rating}" for country in _COUNTRIES for rating in ('12', '15', '18')],
+        'parents_guide': {
+            category: [_sentence(rng, rng.randint(10, 25)) for _ in range(rng.randint(3, 8))]
+            for category in ('nudity', 'violence', 'profanity', 'alcohol', 'frightening')
+        },
+        'cast': [f"{name} ({_title(rng)})" for name in names(15)],
+        'cast_simple': names(10),
+        'writers': names(5),
+        'producers': names(5),
+        'composers': names(3),
+        'cinematographers': names(3),
+        'editors': names(3),
+        'production_designers': names(2),
+        'costume_designers': names(2),
+        'directors': names(2),
+    }
+
+
+def imdb_details(seed: int = 0) -> Dict[str, Any]:
+    """The transformed ``imdb_details`` document as it is cached today."""
+    from adapters.imdb.imdb_adapter import imdb_adapter
+
+    raw = imdb_movie_raw(seed)
+    return imdb_adapter._transform_movie_data(raw, raw['imdb_id'])
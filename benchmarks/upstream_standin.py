@@ -0,0 +1,145 @@
+"""Local stand-in for kuryana that serves recorded or synthetic responses.
+
+Usage: python -m benchmarks.upstream_standin [--fixtures data/kuryana.jsonl]
+           [--port 8081] [--latency lognormal:0.3:0.5] [--error-rate 0.05]
+           [--error-status 503] [--retry-after 2] [--stall-rate 0.01]
+           [--stall 60] [--reset-rate 0.01] [--seed 0]
+
+Point MYDRAMALIST_API_URL at http://127.0.0.1:8081/search/q/{} and
+MYDRAMALIST_DETAILS_URL at http://127.0.0.1:8081/id/{} to run the bot,
+or any benchmark, against it. Responses recorded with HTTP_RECORD_PATH
+are matched by path and query; other /search/q/ and /id/ paths get
+synthetic payloads from benchmarks/payloads.
+
+Latency distributions: ``none``, ``fixed:S``, ``uniform:LOW:HIGH``,
+``lognormal:MEDIAN:SIGMA`` and ``recorded`` (each fixture's own latency).
+Counters are served at /_standin/stats.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import unquote
+
+from aiohttp import web
+
+from benchmarks import payloads
+from infra.http.recording import fixture_key, load_fixtures
+
+
+def latency_sampler(spec: str, rng: random.Random) -> Callable[[Optional[float]], float]:
+    """Seconds to delay a response, given the fixture's recorded latency (if any)."""
+    kind, *args = spec.split(':')
+    values = [float(arg) for arg in args]
+    if kind == 'none':
+        return lambda recorded: 0.0
+    if kind == 'fixed' and len(values) == 1:
+        return lambda recorded: values[0]
+    if kind == 'uniform' and len(values) == 2:
+        return lambda recorded: rng.uniform(values[0], values[1])
+    if kind == 'lognormal' and len(values) == 2:
+        return lambda recorded: rng.lognormvariate(math.log(values[0]), values[1])
+    if kind == 'recorded':
+        return lambda recorded: recorded or 0.0
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+def _synthetic(path: str) -> Optional[Dict[str, Any]]:
+    """A generated kuryana body for search and details paths."""
+    for prefix in ('/search/q/', '/id/'):
+        if path.startswith(prefix):
+            arg = unquote(path[len(prefix):])
+            seed = sum(arg.encode('utf-8'))
+            if prefix == '/id/':
+                return {'slug_query': arg, 'data': payloads.mdl_details(seed)}
+            return {'query': arg, 'results': {'dramas': payloads.mdl_search(seed), 'people': []}}
+    return None
+
+
+class StandIn:
+    """Request handler with latency and error injection."""
+
+    def __init__(self, args: argparse.Namespace) -> None:
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.delay = latency_sampler(args.latency, self.rng)
+        self.fixtures = load_fixtures(args.fixtures) if args.fixtures else {}
+        self.counts = {
+            'requests': 0, 'replayed': 0, 'synthetic': 0, 'not_found': 0,
+            'errors': 0, 'stalls': 0, 'resets': 0,
+        }
+
+    async def handle(self, request: web.Request) -> web.StreamResponse:
+        # Warm-up and keep-alive probes
+        if request.method == 'HEAD':
+            return web.Response()
+        self.counts['requests'] += 1
+
+        roll = self.rng.random()
+        if roll < self.args.reset_rate:
+            self.counts['resets'] += 1
+            request.transport.close()
+            return web.Response()
+        roll -= self.args.reset_rate
+        if roll < self.args.stall_rate:
+            self.counts['stalls'] += 1
+            await asyncio.sleep(self.args.stall)
+            return web.Response(status=504)
+        roll -= self.args.stall_rate
+
+        fixture = self.fixtures.get(fixture_key(request.raw_path))
+        await asyncio.sleep(max(0.0, self.delay(fixture['latency'] if fixture else None)))
+
+        if roll < self.args.error_rate:
+            self.counts['errors'] += 1
+            headers = {'Retry-After': str(self.args.retry_after)} if self.args.retry_after is not None else None
+            return web.Response(status=self.args.error_status, headers=headers)
+
+        if fixture:
+            self.counts['replayed'] += 1
+            return web.Response(
+                status=fixture['status'], body=fixture['body'].encode('utf-8'),
+                headers={'Content-Type': fixture['content_type'] or 'application/json'}
+            )
+        body = _synthetic(request.path)
+        if body is None:
+            self.counts['not_found'] += 1
+            return web.json_response({'error': 'not recorded'}, status=404)
+        self.counts['synthetic'] += 1
+        return web.Response(body=json.dumps(body).encode('utf-8'), content_type='application/json')
+
+    async def stats(self, request: web.Request) -> web.Response:
+        return web.json_response({**self.counts, 'fixtures': len(self.fixtures)})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fixtures", default="", help="archive written with HTTP_RECORD_PATH")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency", default="none")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--retry-after", type=int, default=None)
+    parser.add_argument("--stall-rate", type=float, default=0.0)
+    parser.add_argument("--stall", type=float, default=60.0, help="seconds a stalled request hangs")
+    parser.add_argument("--reset-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    if args.fixtures and not os.path.exists(args.fixtures):
+        parser.error(f"fixture archive {args.fixtures} does not exist")
+
+    standin = StandIn(args)
+    app = web.Application()
+    app.router.add_get('/_standin/stats', standin.stats)
+    app.router.add_route('*', '/{tail:.*}', standin.handle)
+    print(f"Serving {len(standin.fixtures)} fixtures on http://{args.host}:{args.port}")
+    web.run_app(app, host=args.host, port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
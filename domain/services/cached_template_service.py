@@ -2,6 +2,7 @@
 
 from typing import Optional
 from infra.cache import cache_client
+from infra.cache.ttl_policy import NEGATIVE_TTL
 from infra.db import mongo_client
 from infra.logging import get_logger
 
@@ -17,6 +18,7 @@ class CachedTemplateService:
         cache_key = f"mdl_{user_id}"
         
         # Try cache first
+        cache_client.record_access("user_templates", cache_key)
         template = await cache_client.get("user_templates", cache_key)
         
         if template is None:
@@ -25,12 +27,13 @@ class CachedTemplateService:
                 template_doc = await mongo_client.db.mdl_templates.find_one({"user_id": user_id})
                 if template_doc:
                     template = template_doc.get("template", "")
-                    # Cache the template for 2 hours
-                    await cache_client.set("user_templates", cache_key, template, ttl=7200)
+                    ttl = await cache_client.ttl_for("user_templates", cache_key)
+                    await cache_client.set("user_templates", cache_key, template, ttl=ttl)
                     logger.debug(f"Cached MDL template for user {user_id}")
                 else:
-                    # Cache negative result for 30 minutes to avoid repeated DB queries
-                    await cache_client.set("user_templates", cache_key, "", ttl=1800)
+                    # Cache negative result to avoid repeated DB queries
+                    ttl = await cache_client.ttl_for("user_templates", cache_key, base=NEGATIVE_TTL)
+                    await cache_client.set("user_templates", cache_key, "", ttl=ttl)
                     logger.debug(f"No MDL template found for user {user_id}, cached empty result")
             except Exception as e:
                 logger.error(f"Error retrieving MDL template for user {user_id}: {e}")
@@ -44,6 +47,7 @@ class CachedTemplateService:
         cache_key = f"imdb_{user_id}"
         
         # Try cache first
+        cache_client.record_access("user_templates", cache_key)
         template = await cache_client.get("user_templates", cache_key)
         
         if template is None:
@@ -52,12 +56,13 @@ class CachedTemplateService:
                 template_doc = await mongo_client.db.imdb_templates.find_one({"user_id": user_id})
                 if template_doc:
                     template = template_doc.get("template", "")
-                    # Cache the template for 2 hours
-                    await cache_client.set("user_templates", cache_key, template, ttl=7200)
+                    ttl = await cache_client.ttl_for("user_templates", cache_key)
+                    await cache_client.set("user_templates", cache_key, template, ttl=ttl)
                     logger.debug(f"Cached IMDB template for user {user_id}")
                 else:
-                    # Cache negative result for 30 minutes to avoid repeated DB queries
-                    await cache_client.set("user_templates", cache_key, "", ttl=1800)
+                    # Cache negative result to avoid repeated DB queries
+                    ttl = await cache_client.ttl_for("user_templates", cache_key, base=NEGATIVE_TTL)
+                    await cache_client.set("user_templates", cache_key, "", ttl=ttl)
                     logger.debug(f"No IMDB template found for user {user_id}, cached empty result")
             except Exception as e:
                 logger.error(f"Error retrieving IMDB template for user {user_id}: {e}")
@@ -69,8 +74,7 @@ class CachedTemplateService:
     async def invalidate_user_templates(user_id: int) -> None:
         """Invalidate all templates for a user."""
         try:
-            await cache_client.delete("user_templates", f"mdl_{user_id}")
-            await cache_client.delete("user_templates", f"imdb_{user_id}")
+            await cache_client.delete_many("user_templates", [f"mdl_{user_id}", f"imdb_{user_id}"])
             logger.info(f"Invalidated all templates for user {user_id}")
         except Exception as e:
             logger.warning(f"Error invalidating templates for user {user_id}: {e}")
@@ -1,9 +1,14 @@
 """Template processing service (pure domain logic)."""
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Set
 import html
 
 
+# Version of the projections below; cached details documents are keyed by
+# it, so bump it whenever a projection keeps different fields
+DETAILS_SCHEMA_VERSION = 1
+
+
 class TemplateService:
     """Handles template processing and caption generation."""
     
@@ -16,6 +21,72 @@ class TemplateService:
         "Music": "🎶", "News": "📰", "Reality-TV": "📺", "Talk-Show": "🎤"
     }
     
+    # Top-level field of a MyDramaList details document each placeholder reads
+    MDL_PLACEHOLDER_SOURCES = {
+        "title": "title", "complete_title": "complete_title", "link": "link",
+        "rating": "rating", "synopsis": "synopsis", "year": "year", "poster": "poster",
+        "country": "details", "type": "details", "episodes": "details", "aired": "details",
+        "aired_on": "details", "original_network": "details", "duration": "details",
+        "content_rating": "details", "score": "details", "ranked": "details",
+        "popularity": "details", "watchers": "details", "favorites": "details",
+        "release_date": "details", "genres": "others", "tags": "others",
+        "native_title": "others", "also_known_as": "others",
+    }
+    MDL_DEFAULT_FIELDS = frozenset({"title", "link", "rating", "synopsis", "details", "others"})
+    
+    # IMDB placeholders are top-level fields of the details document
+    IMDB_PLACEHOLDERS = frozenset({
+        "title", "kind", "year", "rating", "votes", "runtime", "countries", "languages",
+        "mpaa", "plot", "imdb_url", "imdb_id", "poster", "genres", "cast", "cast_simple",
+        "directors", "writers", "producers", "composers", "cinematographers", "editors",
+        "production_designers", "costume_designers", "is_series", "is_episode",
+        "series_info", "episode_info", "release_dates", "premiere_date",
+        "original_air_date", "aspect_ratios", "sound_mix", "color_info", "budget",
+        "gross", "box_office", "opening_weekend_usa", "certificates",
+    })
+    IMDB_DEFAULT_FIELDS = frozenset({
+        "title", "year", "kind", "episode_info", "rating", "votes", "countries",
+        "runtime", "series_info", "original_air_date", "premiere_date", "release_dates",
+        "languages", "mpaa", "genres", "directors", "writers", "cast", "box_office",
+        "plot", "imdb_url",
+    })
+    
+    def project_mdl_details(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Reduce a kuryana ``data`` object to what an MDL caption can render.
+        
+        Nested placeholders are named after their key in ``details`` or
+        ``others``, so only those keys of the two objects are kept.
+        """
+        projected: Dict[str, Any] = {}
+        for name, source in self.MDL_PLACEHOLDER_SOURCES.items():
+            if source == name:
+                if name in data:
+                    projected[name] = data[name]
+                continue
+            nested = data.get(source)
+            if isinstance(nested, dict) and name in nested:
+                projected.setdefault(source, {})[name] = nested[name]
+        return projected
+    
+    def project_imdb_details(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Reduce an IMDB details document to its placeholder fields."""
+        return {name: value for name, value in data.items() if name in self.IMDB_PLACEHOLDERS}
+    
+    def mdl_fields(self, user_template: Optional[str] = None) -> Set[str]:
+        """Details fields needed to render a MyDramaList caption and its poster."""
+        if not user_template:
+            return set(self.MDL_DEFAULT_FIELDS) | {"poster"}
+        return {
+            source for name, source in self.MDL_PLACEHOLDER_SOURCES.items()
+            if f"{{{name}}}" in user_template
+        } | {"poster"}
+    
+    def imdb_fields(self, user_template: Optional[str] = None) -> Set[str]:
+        """Details fields needed to render an IMDB caption and its poster."""
+        if not user_template:
+            return set(self.IMDB_DEFAULT_FIELDS) | {"poster"}
+        return {name for name in self.IMDB_PLACEHOLDERS if f"{{{name}}}" in user_template} | {"poster"}
+    
     def build_mdl_caption(
         self,
         drama_data: Dict[str, Any], 
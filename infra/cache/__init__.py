@@ -1,3 +1,4 @@
 from .redis_client import cache_client
+from .keys import canonical_query, search_cache_key, search_query
 
-__all__ = ['cache_client']
\ No newline at end of file
+__all__ = ['cache_client', 'canonical_query', 'search_cache_key', 'search_query']
\ No newline at end of file
@@ -0,0 +1,144 @@
+"""Admission control for new cache entries.
+
+A TinyLFU-style count-min sketch estimates how often each key was asked
+for recently. Redis picks LRU victims itself, so instead of comparing a
+candidate with the victim the filter only runs while Redis is close to
+maxmemory: keys seen fewer than CACHE_ADMISSION_MIN_HITS times are then
+not written, and a burst of one-off searches can't evict the hot working
+set. Encoded values above the namespace's size cap are never written.
+"""
+
+import hashlib
+from typing import Any, Dict, Optional
+
+from infra.config import settings
+from infra.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Namespaces where one-hit wonders are common enough to filter
+ADMISSION_NAMESPACES = frozenset({'mdl_search', 'imdb_search', 'mdl_details', 'imdb_details'})
+
+SKETCH_DEPTH = 4
+SKETCH_WIDTH = 1 << 16  # Counters per row; must be a power of two
+COUNTER_MAX = 15  # Counters saturate like TinyLFU's 4-bit ones
+
+# Halving every counter after this many increments ages out old popularity
+SAMPLE_FACTOR = 10
+
+_HALVE = bytes(i >> 1 for i in range(256))
+
+
+class FrequencySketch:
+    """Count-min sketch with conservative increments and periodic halving."""
+
+    def __init__(self, width: int = SKETCH_WIDTH, depth: int = SKETCH_DEPTH) -> None:
+        self._mask = width - 1
+        self._rows = [bytearray(width) for _ in range(depth)]
+        self._sample_size = SAMPLE_FACTOR * width
+        self._additions = 0
+
+    def _indexes(self, item: str):
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) & self._mask for i in range(len(self._rows))]
+
+    def increment(self, item: str) -> None:
+        indexes = self._indexes(item)
+        current = min(row[i] for row, i in zip(self._rows, indexes))
+        if current >= COUNTER_MAX:
+            return
+        # Only the smallest counters grow, which keeps overestimates low
+        for row, i in zip(self._rows, indexes):
+            if row[i] == current:
+                row[i] = current + 1
+
+        self._additions += 1
+        if self._additions >= self._sample_size:
+            for row in self._rows:
+                row[:] = row.translate(_HALVE)
+            self._additions //= 2
+
+    def estimate(self, item: str) -> int:
+        return min(row[i] for row, i in zip(self._rows, self._indexes(item)))
+
+
+def _parse_sizes(spec: str) -> Dict[str, int]:
+    """Parse 'namespace=bytes,namespace=bytes'."""
+    sizes = {}
+    for part in spec.split(','):
+        if not part.strip():
+            continue
+        try:
+            namespace, size = part.split('=', 1)
+            sizes[namespace.strip()] = int(size)
+        except ValueError:
+            logger.warning(f"Ignoring malformed CACHE_MAX_ENTRY_SIZES entry: {part!r}")
+    return sizes
+
+
+class AdmissionPolicy:
+    """Decides whether a value is worth writing to Redis."""
+
+    def __init__(self) -> None:
+        self._sketch = FrequencySketch()
+        self._max_sizes = _parse_sizes(settings.cache_max_entry_sizes)
+        self.under_pressure = settings.cache_admission_memory_ratio <= 0
+        self.memory_ratio: Optional[float] = None
+
+    def record(self, namespace: str, key: str) -> None:
+        """Count one request for a key."""
+        if settings.cache_admission_enabled and namespace in ADMISSION_NAMESPACES:
+            self._sketch.increment(f"{namespace}:{key}")
+
+    def max_size(self, namespace: str) -> int:
+        return self._max_sizes.get(namespace, settings.cache_max_entry_size)
+
+    def check(self, namespace: str, key: str, size: int, force: bool = False) -> Optional[str]:
+        """Stats counter naming why a value is rejected, or None to admit it.
+
+        ``force`` skips the frequency filter (for keys already known to be
+        hot or already resident); the size cap always applies.
+        """
+        limit = self.max_size(namespace)
+        if limit and size > limit:
+            return 'rejected_size'
+        if (
+            not force
+            and self.under_pressure
+            and settings.cache_admission_enabled
+            and namespace in ADMISSION_NAMESPACES
+            and self._sketch.estimate(f"{namespace}:{key}") < settings.cache_admission_min_hits
+        ):
+            return 'rejected_cold'
+        return None
+
+    async def update_pressure(self, clients) -> None:
+        """Turn frequency filtering on while any Redis shard's memory is nearly full."""
+        threshold = settings.cache_admission_memory_ratio
+        ratios = []
+        for client in clients:
+            try:
+                info = await client.info('memory')
+            except Exception as e:
+                logger.warning(f"Redis memory check for cache admission failed: {e}")
+                return
+            maxmemory = int(info.get('maxmemory', 0))
+            if maxmemory:
+                ratios.append(int(info.get('used_memory', 0)) / maxmemory)
+        self.memory_ratio = max(ratios) if ratios else None
+        under_pressure = threshold <= 0 or (self.memory_ratio is not None and self.memory_ratio >= threshold)
+        if under_pressure != self.under_pressure:
+            logger.info(
+                f"Cache admission filter {'enabled' if under_pressure else 'disabled'} "
+                f"(Redis memory at {self.memory_ratio or 0:.0%} of maxmemory)"
+            )
+        self.under_pressure = under_pressure
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'enabled': settings.cache_admission_enabled,
+            'filtering': settings.cache_admission_enabled and self.under_pressure,
+            'memory_ratio': self.memory_ratio,
+        }
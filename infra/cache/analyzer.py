@@ -0,0 +1,210 @@
+"""Background keyspace analysis with SCAN for the owner cache commands."""
+
+import asyncio
+import json
+import time
+from typing import Any, Dict, List, Optional
+
+from infra.config import settings
+from infra.logging import get_logger
+
+from .redis_client import RELEASE_LOCK_SCRIPT, cache_client
+
+logger = get_logger(__name__)
+
+# Histogram upper bounds; each histogram has one extra open-ended bucket
+TTL_BUCKETS = (60, 600, 3600, 21600, 86400, 604800)
+SIZE_BUCKETS = (1024, 10240, 102400)
+
+SNAPSHOT_KEY = "stats:keyspace_snapshot"
+ANALYZE_LOCK_KEY = "lock:cache_analyze"
+
+# Pause between SCAN batches so other clients' commands interleave
+BATCH_PAUSE = 0.01
+
+
+def _bucket(bounds: tuple, value: float) -> int:
+    for i, bound in enumerate(bounds):
+        if value < bound:
+            return i
+    return len(bounds)
+
+
+def _group(key: str) -> str:
+    """Namespace of a cache key, or the prefix of a bookkeeping key."""
+    parts = key.split(':')
+    if parts[0] == 'v1' and len(parts) > 2:
+        return parts[1]
+    return parts[0]
+
+
+class CacheAnalyzer:
+    """Walks the keyspace with SCAN on a schedule and keeps a summary snapshot.
+
+    One replica scans at a time and publishes its snapshot to Redis, so the
+    owner commands answer instantly on any replica.
+    """
+
+    def __init__(self) -> None:
+        self._task: Optional[asyncio.Task] = None
+        self._snapshot: Optional[Dict[str, Any]] = None
+
+    def start(self) -> None:
+        if settings.cache_analyze_interval <= 0:
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop())
+
+    def request(self) -> None:
+        """Scan once in the background unless a scan is already scheduled."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run_once())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._task = None
+
+    async def _run_once(self) -> None:
+        try:
+            await self.run()
+        except Exception as e:
+            logger.warning(f"Cache keyspace analysis failed: {e}")
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.run()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Cache keyspace analysis failed: {e}")
+            await asyncio.sleep(settings.cache_analyze_interval)
+
+    async def run(self) -> Optional[Dict[str, Any]]:
+        """Scan the keyspace unless another replica is already doing it."""
+        client = cache_client._redis
+        if not client:
+            return None
+
+        token = cache_client._instance_id
+        if not await client.set(ANALYZE_LOCK_KEY, token, nx=True, ex=max(60, settings.cache_analyze_interval)):
+            return None
+        try:
+            snapshot = await self._scan(cache_client.shard_clients())
+            await client.set(SNAPSHOT_KEY, json.dumps(snapshot), ex=max(3600, settings.cache_analyze_interval * 3))
+        finally:
+            try:
+                await client.eval(RELEASE_LOCK_SCRIPT, 1, ANALYZE_LOCK_KEY, token)
+            except Exception:
+                pass
+
+        self._snapshot = snapshot
+        logger.info(
+            f"Cache keyspace analyzed: {snapshot['total_keys']} keys in "
+            f"{snapshot['duration']:.1f}s ({snapshot['batches']} SCAN batches)"
+        )
+        return snapshot
+
+    async def _scan(self, clients) -> Dict[str, Any]:
+        started = time.time()
+        namespaces: Dict[str, Dict[str, Any]] = {}
+        generations = cache_client.generations()
+        global_generation = generations.get('*', 0)
+        batches = 0
+
+        # Every shard holds its own share of the keys
+        for client in clients:
+            cursor = 0
+            while True:
+                cursor, keys = await client.scan(cursor, count=settings.cache_analyze_batch)
+                batches += 1
+                if keys:
+                    async with client.pipeline(transaction=False) as pipe:
+                        for key in keys:
+                            pipe.ttl(key)
+                            pipe.memory_usage(key)
+                        replies = await pipe.execute(raise_on_error=False)
+
+                    for key, ttl, size in zip(keys, replies[0::2], replies[1::2]):
+                        group = _group(key)
+                        summary = namespaces.get(group)
+                        if summary is None:
+                            summary = namespaces[group] = {
+                                'keys': 0,
+                                'no_ttl': 0,
+                                'bytes': 0,
+                                'orphaned': 0,
+                                'ttl_hist': [0] * (len(TTL_BUCKETS) + 1),
+                                'size_hist': [0] * (len(SIZE_BUCKETS) + 1),
+                            }
+                        summary['keys'] += 1
+
+                        if isinstance(ttl, int) and ttl >= 0:
+                            summary['ttl_hist'][_bucket(TTL_BUCKETS, ttl)] += 1
+                        elif ttl == -1:
+                            summary['no_ttl'] += 1
+
+                        if isinstance(size, int):
+                            summary['bytes'] += size
+                            summary['size_hist'][_bucket(SIZE_BUCKETS, size)] += 1
+
+                        # Keys from an older namespace generation are never read again
+                        if key.startswith('v1:'):
+                            current = global_generation + generations.get(group, 0)
+                            parts = key.split(':')
+                            tag = parts[2] if len(parts) > 3 and parts[2][:1] == 'g' and parts[2][1:].isdigit() else 'g0'
+                            if int(tag[1:]) != current:
+                                summary['orphaned'] += 1
+
+                if cursor == 0:
+                    break
+                await asyncio.sleep(BATCH_PAUSE)
+
+        return {
+            'taken_at': time.time(),
+            'duration': time.time() - started,
+            'batches': batches,
+            'total_keys': sum(summary['keys'] for summary in namespaces.values()),
+            'namespaces': namespaces,
+        }
+
+    async def latest(self) -> Optional[Dict[str, Any]]:
+        """Newest snapshot from any replica, or None before the first scan."""
+        snapshot = self._snapshot
+        client = cache_client._redis
+        if client:
+            try:
+                raw = await client.get(SNAPSHOT_KEY)
+                if raw:
+                    shared = json.loads(raw)
+                    if snapshot is None or shared['taken_at'] > snapshot['taken_at']:
+                        snapshot = shared
+            except Exception as e:
+                logger.warning(f"Failed to read shared keyspace snapshot: {e}")
+        return snapshot
+
+    @staticmethod
+    def totals(snapshot: Dict[str, Any]) -> Dict[str, Any]:
+        """Histograms and counters summed over every group."""
+        ttl_hist: List[int] = [0] * (len(TTL_BUCKETS) + 1)
+        size_hist: List[int] = [0] * (len(SIZE_BUCKETS) + 1)
+        totals = {'keys': 0, 'no_ttl': 0, 'bytes': 0, 'orphaned': 0}
+        for summary in snapshot['namespaces'].values():
+            for name in totals:
+                totals[name] += summary[name]
+            for i, count in enumerate(summary['ttl_hist']):
+                ttl_hist[i] += count
+            for i, count in enumerate(summary['size_hist']):
+                size_hist[i] += count
+        totals['ttl_hist'] = ttl_hist
+        totals['size_hist'] = size_hist
+        return totals
+
+
+# Global cache analyzer instance
+cache_analyzer = CacheAnalyzer()
@@ -0,0 +1,136 @@
+"""Pluggable serialization and compression for cached payloads."""
+
+import json
+import zlib
+from typing import Any, Optional
+
+from infra.logging import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Framed values start with this byte followed by a serializer tag and a
+# compression tag. Legacy entries are plain JSON text, which can never
+# start with 0x01, so both formats are readable side by side.
+FRAME_MAGIC = b"\x01"
+
+SERIALIZER_TAGS = {'json': b"j", 'msgpack': b"m"}
+COMPRESSION_TAGS = {'none': b"n", 'zlib': b"z", 'zstd': b"s"}
+
+
+class CodecError(Exception):
+    """Raised when a cached value can't be encoded or decoded."""
+
+
+class CacheCodec:
+    """Encodes cache values to compact framed bytes and back."""
+
+    def __init__(
+        self,
+        serializer: str = "json",
+        compression: str = "zstd",
+        compress_threshold: int = 1024,
+        compression_level: int = 3
+    ) -> None:
+        if serializer not in SERIALIZER_TAGS:
+            raise ValueError(f"Unknown cache serializer: {serializer}")
+        if compression not in COMPRESSION_TAGS:
+            raise ValueError(f"Unknown cache compression: {compression}")
+
+        if serializer == 'msgpack' and msgpack is None:
+            logger.warning("msgpack not installed, falling back to JSON cache serializer")
+            serializer = 'json'
+        if compression == 'zstd' and zstandard is None:
+            logger.warning("zstandard not installed, falling back to zlib cache compression")
+            compression = 'zlib'
+
+        self.serializer = serializer
+        self.compression = compression
+        self.compress_threshold = compress_threshold
+        self.compression_level = compression_level
+
+        self._zstd_compressor = zstandard.ZstdCompressor(level=compression_level) if zstandard else None
+        self._zstd_decompressor = zstandard.ZstdDecompressor() if zstandard else None
+
+    def encode(self, value: Any) -> bytes:
+        """Serialize and (above the size threshold) compress a value."""
+        try:
+            payload = self._serialize(value)
+        except (TypeError, ValueError) as e:
+            raise CodecError(f"Failed to serialize cache value: {e}") from e
+
+        compression = self.compression
+        if compression == 'none' or len(payload) < self.compress_threshold:
+            compression = 'none'
+        else:
+            payload = self._compress(payload, compression)
+
+        return FRAME_MAGIC + SERIALIZER_TAGS[self.serializer] + COMPRESSION_TAGS[compression] + payload
+
+    def decode(self, raw: Optional[bytes]) -> Any:
+        """Decode a framed value, or a legacy plain JSON entry."""
+        if raw is None:
+            return None
+        if isinstance(raw, str):
+            raw = raw.encode('utf-8')
+
+        try:
+            if not raw.startswith(FRAME_MAGIC):
+                return self._loads_json(raw)
+
+            serializer_tag = raw[1:2]
+            compression_tag = raw[2:3]
+            payload = raw[3:]
+
+            if compression_tag == COMPRESSION_TAGS['zstd']:
+                if self._zstd_decompressor is None:
+                    raise CodecError("zstd-compressed entry but zstandard is not installed")
+                payload = self._zstd_decompressor.decompress(payload)
+            elif compression_tag == COMPRESSION_TAGS['zlib']:
+                payload = zlib.decompress(payload)
+            elif compression_tag != COMPRESSION_TAGS['none']:
+                raise CodecError(f"Unknown compression tag: {compression_tag!r}")
+
+            if serializer_tag == SERIALIZER_TAGS['json']:
+                return self._loads_json(payload)
+            if serializer_tag == SERIALIZER_TAGS['msgpack']:
+                if msgpack is None:
+                    raise CodecError("msgpack entry but msgpack is not installed")
+                return msgpack.unpackb(payload, raw=False)
+            raise CodecError(f"Unknown serializer tag: {serializer_tag!r}")
+        except CodecError:
+            raise
+        except Exception as e:
+            raise CodecError(f"Failed to decode cache value: {e}") from e
+
+    def _serialize(self, value: Any) -> bytes:
+        if self.serializer == 'msgpack':
+            return msgpack.packb(value, use_bin_type=True)
+        if orjson is not None:
+            return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    def _compress(self, payload: bytes, compression: str) -> bytes:
+        if compression == 'zstd':
+            return self._zstd_compressor.compress(payload)
+        return zlib.compress(payload, self.compression_level)
+
+    @staticmethod
+    def _loads_json(payload: bytes) -> Any:
+        if orjson is not None:
+            return orjson.loads(payload)
+        return json.loads(payload)
@@ -0,0 +1,65 @@
+"""Canonical cache keys for free-text search queries."""
+
+import unicodedata
+
+from infra.config import settings
+
+from .redis_client import cache_client
+
+# Apostrophes join the word around them ("it's" == "its") instead of splitting it
+_APOSTROPHES = dict.fromkeys(map(ord, "'`´ʼ’‘"), None)
+
+# Symbols that tell titles apart ("C++" vs "C#", "Love & War"), kept as typed
+_MEANINGFUL = frozenset("+#&")
+
+# How long a compact spelling keeps pointing at the first canonical form seen
+ALIAS_TTL = 30 * 86400
+
+
+def canonical_query(query: str) -> str:
+    """Normalize a search query so trivially different spellings share a key.
+
+    NFKC folds full-width and compatibility characters (and composes Hangul
+    jamo), casefold handles case, and punctuation, symbols and runs of
+    whitespace collapse to single spaces. Letters, digits and combining marks
+    of every script are kept, so CJK, Hangul and Thai queries are unchanged
+    apart from width and spacing; so are ``+``, ``#`` and ``&``.
+    """
+    text = unicodedata.normalize('NFKC', query).casefold().translate(_APOSTROPHES)
+    chars = []
+    for char in text:
+        category = unicodedata.category(char)
+        chars.append(char if category[0] in 'LMN' or char in _MEANINGFUL else ' ')
+    canonical = ' '.join(''.join(chars).split())
+    # A query made only of punctuation still needs a distinct key
+    return canonical or ' '.join(text.split())
+
+
+def compact_query(canonical: str) -> str:
+    """Alias form of a canonical query: spacing removed ("squidgame")."""
+    return canonical.replace(' ', '')
+
+
+async def search_cache_key(namespace: str, query: str) -> str:
+    """Cache (and in-flight) key for a search query in ``namespace``.
+
+    With the alias index enabled, spellings that only differ in spacing
+    resolve to the canonical form that was searched first. The entry is
+    fetched with search_query(key), never the caller's own spelling, so it
+    holds the same results whoever filled or refreshed it.
+    """
+    canonical = canonical_query(query)
+    if settings.search_alias_enabled:
+        alias_namespace = f"{namespace}_alias"
+        compact = compact_query(canonical)
+        seen = await cache_client.get(alias_namespace, compact)
+        if isinstance(seen, str):
+            canonical = seen
+        else:
+            await cache_client.set(alias_namespace, compact, canonical, ttl=ALIAS_TTL)
+    return f"search:{canonical}"
+
+
+def search_query(cache_key: str) -> str:
+    """The query a search key stands for, as sent upstream on every path."""
+    return cache_key.partition(':')[2]
@@ -0,0 +1,79 @@
+"""Bounded in-process LRU cache used as the L1 tier in front of Redis."""
+
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+# Sentinel returned on a miss so falsy cached values ("" / [] / 0) stay hits
+MISSING = object()
+
+
+class LocalCache:
+    """Size- and TTL-bounded LRU cache for a single namespace."""
+
+    def __init__(self, max_entries: int, ttl: float) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+        # Tier counters reported by /cache_stats
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        """Return cached value, refreshing its LRU position."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return default
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store value, evicting least recently used entries when full."""
+        if self.max_entries <= 0:
+            return
+
+        # Never keep a local copy longer than the shared tier would
+        effective_ttl = self.ttl if ttl is None else min(self.ttl, ttl)
+        self._entries[key] = (time.monotonic() + effective_ttl, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: Hashable) -> bool:
+        """Drop a single entry."""
+        return self._entries.pop(key, None) is not None
+
+    def clear(self) -> None:
+        """Drop all entries, keeping counters."""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of tier counters."""
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits / lookups * 100) if lookups else 0.0,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+        }
@@ -3,75 +3,713 @@
 import asyncio
 import hashlib
 import json
-from typing import Any, Optional
+import math
+import random
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Mapping, NamedTuple, Optional, Set, Tuple, Union
 
 import redis.asyncio as redis
+from redis.exceptions import ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError
 
 from infra.config import settings
 from infra.logging import get_logger
 
+from .admission import AdmissionPolicy
+from .codec import CacheCodec, CodecError
+from .local_cache import MISSING, LocalCache
+from .sharding import HashRing, shard_urls
+from .singleflight import SingleFlight
+from .stats import CacheStats
+from .ttl_policy import TTLPolicy
+
 logger = get_logger(__name__)
 
+# Pub/sub channel used to drop L1 entries on every replica
+INVALIDATION_CHANNEL = "cache:invalidate"
+
+# Pub/sub channel announcing that a locked load finished (successfully or not)
+LOADED_CHANNEL = "cache:loaded"
+
+# Namespace generations: bumping one orphans every key of the namespace at
+# once (they age out by TTL/LRU) instead of deleting them key by key
+GENERATIONS_KEY = "cache:generations"
+GENERATION_CHANNEL = "cache:generation"
+ALL_NAMESPACES = "*"
+
+# How long a background refresh of one key blocks further refreshes (all replicas)
+REFRESH_LOCK_TTL = 30
+
+# Cross-replica load lock lifetime and how long other replicas wait on it
+LOAD_LOCK_TTL = 30
+LOAD_WAIT_TIMEOUT = 10
+
+# Errors that suggest the connection itself is gone, not just one command
+CONNECTION_ERRORS = (RedisConnectionError, RedisTimeoutError, asyncio.TimeoutError, OSError)
+PROBE_TIMEOUT = 2
+
+# Upper bound on how long a degraded-mode entry lives in memory
+FALLBACK_MAX_TTL = 86400
+
+# Detail documents that can be stored as hashes, one field per top-level key
+# (CACHE_DETAILS_AS_HASH), so a caption reads only the fields it uses
+HASH_NAMESPACES = frozenset({'mdl_details', 'imdb_details'})
+
+# An encoded value: one frame, or one frame per field for hash storage
+Payload = Union[bytes, Dict[str, bytes]]
+
+# Delete a lock only if we still own it
+RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class CacheEntry(NamedTuple):
+    """Cached value plus whether it is past its soft expiry."""
+    value: Any
+    stale: bool
+
 
 class CacheClient:
     """Redis client with intelligent caching and TTL management."""
     
     def __init__(self) -> None:
         self._redis: Optional[redis.Redis] = None
+        # Cached values are framed bytes, so they go through a non-decoding client
+        self._binary: Optional[redis.Redis] = None
+        # (decoded, binary) client pair per server; the first is _redis/_binary
+        # and also holds every coordination key
+        self._shard_urls = shard_urls()
+        self._ring = HashRing(self._shard_urls)
+        self._shards: List[Tuple[redis.Redis, redis.Redis]] = []
+        self._codec = CacheCodec(
+            serializer=settings.cache_serializer,
+            compression=settings.cache_compression,
+            compress_threshold=settings.cache_compress_threshold,
+        )
+        self._local: Dict[str, LocalCache] = {}
+        self._stats = CacheStats()
+        self._stats_task: Optional[asyncio.Task] = None
+        self._ttl_policy = TTLPolicy()
+        self._admission = AdmissionPolicy()
+        
+        # Degraded mode: in-memory fallback while Redis is unreachable
+        self._fallback: Dict[str, LocalCache] = {}
+        self._closing = False
+        self._degraded_since: Optional[float] = None
+        self._reconnect_task: Optional[asyncio.Task] = None
+        self._reconnect_attempts = 0
+        self._probe_task: Optional[asyncio.Task] = None
+        self._transitions: List[Dict[str, Any]] = []
+        self._instance_id = uuid.uuid4().hex
+        self._generations: Dict[str, int] = {}
+        self._listener_task: Optional[asyncio.Task] = None
+        self._refresh_tasks: Dict[str, asyncio.Task] = {}
+        
+        # Request coalescing: in-process single-flight plus waiters for
+        # loads running on other replicas
+        self._singleflight = SingleFlight()
+        self._load_waiters: Dict[str, Set[asyncio.Future]] = {}
+        self._remote_waits = 0
+        self._remote_notified = 0
+        self._remote_timeouts = 0
     
     async def start(self) -> None:
-        """Initialize Redis connection with connection pooling."""
-        try:
-            # Create Redis connection using redis-py async
-            self._redis = redis.from_url(
-                settings.redis_url,
-                encoding='utf-8',
-                decode_responses=True,
-                max_connections=20,  # Connection pool size
-                socket_connect_timeout=5,
-                socket_keepalive=True
-            )
-            # Test connection with retries and longer timeout
-            max_retries = 3
-            for attempt in range(max_retries):
+        """Initialize Redis connection with connection pooling.
+        
+        If Redis can't be reached the client runs in degraded mode (bounded
+        in-memory cache) and keeps reconnecting in the background.
+        """
+        self._closing = False
+        max_retries = 3
+        error = None
+        for attempt in range(max_retries):
+            error = await self._connect()
+            if error is None:
+                logger.info("Redis cache client connected with connection pooling")
+                await self._on_connected()
+                return
+            if attempt < max_retries - 1:
+                logger.warning(f"Redis connection failed (attempt {attempt + 1}/{max_retries}): {error}, retrying...")
+                await asyncio.sleep(2)
+        
+        self._enter_degraded(f"unavailable at startup: {error}")
+    
+    async def _connect(self) -> Optional[str]:
+        """Open both Redis clients for every shard; returns why it failed, or None.
+        
+        All shards must answer: a key's shard is fixed by the ring, so a
+        missing one can't be skipped without serving misses for its keys.
+        """
+        shards: List[Tuple[redis.Redis, redis.Redis]] = []
+        try:
+            for url in self._shard_urls:
+                # Create Redis connection using redis-py async
+                client = redis.from_url(
+                    url,
+                    encoding='utf-8',
+                    decode_responses=True,
+                    max_connections=20,  # Connection pool size
+                    socket_connect_timeout=5,
+                    socket_keepalive=True
+                )
+                binary = redis.from_url(
+                    url,
+                    decode_responses=False,
+                    max_connections=20,
+                    socket_connect_timeout=5,
+                    socket_keepalive=True
+                )
+                shards.append((client, binary))
+            await asyncio.wait_for(asyncio.gather(*(client.ping() for client, _ in shards)), timeout=10.0)
+        except asyncio.TimeoutError:
+            error = "connection timeout"
+        except Exception as e:
+            error = str(e) or type(e).__name__
+        else:
+            self._shards = shards
+            self._redis, self._binary = shards[0]
+            return None
+        
+        for pair in shards:
+            for pending in pair:
                 try:
-                    await asyncio.wait_for(self._redis.ping(), timeout=10.0)
-                    logger.info("Redis cache client connected with connection pooling")
-                    return
-                except asyncio.TimeoutError:
-                    if attempt < max_retries - 1:
-                        logger.warning(f"Redis connection timeout (attempt {attempt + 1}/{max_retries}), retrying...")
-                        await asyncio.sleep(2)
-                    else:
-                        logger.warning("Redis connection timeout after all retries, caching disabled")
-                        self._redis = None
-                except Exception as e:
-                    if attempt < max_retries - 1:
-                        logger.warning(f"Redis connection failed (attempt {attempt + 1}/{max_retries}): {e}, retrying...")
-                        await asyncio.sleep(2)
-                    else:
-                        logger.warning(f"Redis unavailable after all retries, caching disabled: {e}")
-                        self._redis = None
+                    await pending.aclose()
+                except Exception:
+                    pass
+        return error
+    
+    async def _on_connected(self) -> None:
+        """Start the background work that needs a live connection."""
+        # Keys must be built with current generations before the first lookup
+        await self._load_generations()
+        self._start_listener()
+        self._start_stats_flusher()
+    
+    def _enter_degraded(self, reason: str) -> None:
+        """Drop the Redis clients, serve from memory and start reconnecting."""
+        if self._closing:
+            return
+        
+        stale_clients = [client for pair in self._shards for client in pair]
+        self._shards = []
+        self._redis = None
+        self._binary = None
+        if self._listener_task:
+            self._listener_task.cancel()
+            self._listener_task = None
+        for client in stale_clients:
+            asyncio.create_task(self._close_quietly(client))
+        
+        if self._degraded_since is None:
+            self._degraded_since = time.time()
+            self._reconnect_attempts = 0
+            self._record_transition('degraded', reason)
+            logger.warning(f"Redis {reason}; caching in local memory until it is reachable again")
+        
+        if self._reconnect_task is None or self._reconnect_task.done():
+            self._reconnect_task = asyncio.create_task(self._reconnect_loop())
+    
+    @staticmethod
+    async def _close_quietly(client: redis.Redis) -> None:
+        try:
+            await client.aclose()
+        except Exception:
+            pass
+    
+    async def _reconnect_loop(self) -> None:
+        """Retry Redis with exponential backoff until it answers."""
+        delay = 1.0
+        while not self._closing:
+            await asyncio.sleep(delay * random.uniform(0.8, 1.2))
+            self._reconnect_attempts += 1
+            error = await self._connect()
+            if error is None:
+                downtime = time.time() - (self._degraded_since or time.time())
+                self._degraded_since = None
+                # Fallback entries and L1 copies missed every write and
+                # invalidation made by other replicas meanwhile
+                self._fallback.clear()
+                for local in self._local.values():
+                    local.clear()
+                self._record_transition('connected', f"restored after {downtime:.0f}s")
+                logger.info(
+                    f"Redis connection restored after {downtime:.0f}s in degraded mode "
+                    f"({self._reconnect_attempts} attempts), local fallback dropped"
+                )
+                await self._on_connected()
+                return
+            logger.debug(f"Redis reconnect attempt {self._reconnect_attempts} failed: {error}")
+            delay = min(delay * 2, settings.cache_reconnect_max_delay)
+    
+    def _handle_redis_error(self, error: Exception) -> None:
+        """Check the connection in the background after a connection-level error."""
+        if not isinstance(error, CONNECTION_ERRORS) or not self._redis:
+            return
+        if self._probe_task is None or self._probe_task.done():
+            self._probe_task = asyncio.create_task(self._probe(self._shards))
+    
+    async def _probe(self, shards: List[Tuple[redis.Redis, redis.Redis]]) -> None:
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(client.ping() for client, _ in shards)), timeout=PROBE_TIMEOUT
+            )
         except Exception as e:
-            logger.warning(f"Redis initialization failed: {e}")
-            self._redis = None
+            if self._shards is shards:
+                self._enter_degraded(f"connection lost: {e or type(e).__name__}")
+    
+    def _record_transition(self, state: str, reason: str) -> None:
+        self._transitions.append({'at': time.time(), 'state': state, 'reason': reason})
+        del self._transitions[:-10]
+    
+    def _fallback_tier(self, namespace: str) -> Optional[LocalCache]:
+        """Namespace's in-memory fallback while Redis is down, else None."""
+        if self._redis is not None or not settings.cache_fallback_enabled:
+            return None
+        fallback = self._fallback.get(namespace)
+        if fallback is None:
+            fallback = LocalCache(settings.cache_fallback_size, FALLBACK_MAX_TTL)
+            self._fallback[namespace] = fallback
+        return fallback
+    
+    def _fallback_get(self, namespace: str, key: str) -> Optional[CacheEntry]:
+        fallback = self._fallback_tier(namespace)
+        if fallback is None:
+            return None
+        item = fallback.get(key)
+        if item is MISSING:
+            return None
+        value, fresh_until = item
+        return CacheEntry(value, stale=fresh_until is not None and fresh_until <= time.time())
+    
+    def _hard_ttl(self, namespace: str, ttl: Optional[int]) -> Optional[int]:
+        """Redis lifetime of an entry: its TTL plus the namespace's stale window."""
+        return ttl + self._ttl_policy.stale_ttl(namespace) if ttl else None
+    
+    def _fallback_set(self, namespace: str, key: str, value: Any, ttl: Optional[int], stale_ttl: int) -> bool:
+        fallback = self._fallback_tier(namespace)
+        if fallback is None:
+            return False
+        fresh_until = time.time() + ttl if ttl else None
+        fallback.set(key, (value, fresh_until), ttl + stale_ttl if ttl else None)
+        return True
+    
+    def health(self) -> Dict[str, Any]:
+        """Connection state for health checks."""
+        return {
+            'mode': 'degraded' if self._degraded_since is not None else ('redis' if self._redis else 'disabled'),
+            'degraded_for': time.time() - self._degraded_since if self._degraded_since is not None else 0.0,
+            'reconnect_attempts': self._reconnect_attempts,
+            'fallback_entries': sum(len(fallback) for fallback in self._fallback.values()),
+            'transitions': list(self._transitions),
+        }
     
     async def close(self) -> None:
         """Close Redis connection."""
-        if self._redis:
+        self._closing = True
+        for task in (self._reconnect_task, self._probe_task):
+            if task:
+                task.cancel()
+        self._reconnect_task = None
+        self._probe_task = None
+        self._degraded_since = None
+        self._fallback.clear()
+        await self._stop_listener()
+        await self._stop_stats_flusher()
+        for task in list(self._refresh_tasks.values()):
+            task.cancel()
+        self._refresh_tasks.clear()
+        # Local copies can't be invalidated once we stop listening
+        for local in self._local.values():
+            local.clear()
+        
+        if self._shards:
             try:
                 # Close Redis connection using redis-py async
-                await self._redis.aclose()
+                for pair in self._shards:
+                    for client in pair:
+                        await client.aclose()
                 logger.info("Redis cache client closed")
             except Exception as e:
                 logger.warning(f"Error closing Redis connection: {e}")
             finally:
+                self._shards = []
                 self._redis = None
+                self._binary = None
+    
+    def shard_for(self, redis_key: str) -> Optional[redis.Redis]:
+        """Decoding client for the server that holds a data key; None while degraded."""
+        if not self._shards:
+            return None
+        return self._shards[self._ring.node_for(redis_key)][0]
+    
+    def shard_clients(self) -> List[redis.Redis]:
+        """Decoding client of every server, the coordination one first."""
+        return [client for client, _ in self._shards]
+    
+    def _binary_for(self, cache_key: str) -> redis.Redis:
+        return self._shards[self._ring.node_for(cache_key)][1]
+    
+    async def _each_shard(
+        self,
+        cache_keys: List[str],
+        run: Callable[[redis.Redis, List[str]], Awaitable[List[Any]]]
+    ) -> List[Any]:
+        """Call ``run(binary_client, keys)`` concurrently for each shard's share
+        of ``cache_keys``; ``run`` returns one result per key and the results
+        come back in the order of ``cache_keys``."""
+        groups = self._ring.group(cache_keys)
+        shares = await asyncio.gather(*(
+            run(self._shards[node][1], [cache_keys[position] for position in positions])
+            for node, positions in groups.items()
+        ))
+        results: List[Any] = [None] * len(cache_keys)
+        for positions, share in zip(groups.values(), shares):
+            for position, result in zip(positions, share):
+                results[position] = result
+        return results
     
     def _make_key(self, namespace: str, key: str) -> str:
-        """Generate cache key with namespace and version."""
-        # Add version prefix for cache invalidation if needed
-        return f"v1:{namespace}:{key}"
+        """Generate cache key with namespace, version and generation."""
+        # Both counters only grow, so their sum never repeats for a namespace
+        generation = self._generations.get(ALL_NAMESPACES, 0) + self._generations.get(namespace, 0)
+        prefix = f"v1:{namespace}:g{generation}:" if generation else f"v1:{namespace}:"
+        # Hashes get their own keys so toggling the storage mode never reads
+        # a value with the wrong command
+        if self._hashed(namespace):
+            return f"{prefix}h:{key}"
+        return f"{prefix}{key}"
+    
+    def parse_cache_key(self, cache_key: str) -> Optional[Tuple[str, str]]:
+        """(namespace, key) of a Redis key built by _make_key for the current
+        generation and storage mode; None for anything else."""
+        parts = cache_key.split(':', 2)
+        if len(parts) < 3 or parts[0] != 'v1':
+            return None
+        prefix = self._make_key(parts[1], '')
+        if not cache_key.startswith(prefix):
+            return None
+        key = cache_key[len(prefix):]
+        # A leftover generation or hash tag means another generation or storage mode
+        tag = key.split(':', 1)[0]
+        if not key or tag == 'h' or (tag[:1] == 'g' and tag[1:].isdigit()):
+            return None
+        return parts[1], key
+    
+    @staticmethod
+    def _hashed(namespace: str) -> bool:
+        """Whether a namespace's values are stored as Redis hashes."""
+        return settings.cache_details_as_hash and namespace in HASH_NAMESPACES
+    
+    def _encode(self, namespace: str, value: Any) -> Payload:
+        """Encode a value as one frame, or one frame per top-level field."""
+        if not self._hashed(namespace):
+            return self._codec.encode(value)
+        if not isinstance(value, dict) or not value:
+            raise CodecError(f"Hash storage needs a non-empty dict, got {type(value).__name__}")
+        return {str(field): self._codec.encode(item) for field, item in value.items()}
+    
+    def _decode(
+        self,
+        namespace: str,
+        raw: Any,
+        fields: Optional[List[str]] = None
+    ) -> Optional[Tuple[Any, int]]:
+        """Decode a GET, HGETALL or HMGET reply into (value, bytes read); None on a miss."""
+        if not self._hashed(namespace):
+            if raw is None:
+                return None
+            return self._codec.decode(raw), len(raw)
+        
+        if fields is not None:
+            raw = {field: item for field, item in zip(fields, raw) if item is not None}
+        if not raw:
+            return None
+        value = {}
+        size = 0
+        for field, item in raw.items():
+            if isinstance(field, bytes):
+                field = field.decode('utf-8')
+            value[field] = self._codec.decode(item)
+            size += len(item)
+        return value, size
+    
+    def _queue_get(self, pipe: Any, namespace: str, cache_key: str, fields: Optional[List[str]] = None) -> None:
+        if not self._hashed(namespace):
+            pipe.get(cache_key)
+        elif fields is not None:
+            pipe.hmget(cache_key, fields)
+        else:
+            pipe.hgetall(cache_key)
+    
+    @staticmethod
+    def _queue_set(pipe: Any, cache_key: str, payload: Payload, expire: Optional[int]) -> int:
+        """Queue the writes for one value; returns how many commands were queued."""
+        if isinstance(payload, dict):
+            # Replace the whole document so fields it no longer has don't linger
+            pipe.delete(cache_key)
+            pipe.hset(cache_key, mapping=payload)
+            if expire:
+                pipe.expire(cache_key, expire)
+                return 3
+            return 2
+        if expire:
+            pipe.setex(cache_key, expire, payload)
+        else:
+            pipe.set(cache_key, payload)
+        return 1
+    
+    def _admit(self, namespace: str, key: str, payload: Payload, force: bool = False) -> bool:
+        """Whether an encoded value may be written to Redis; counts rejections."""
+        rejection = self._admission.check(namespace, key, self._payload_size(payload), force)
+        if rejection is None:
+            return True
+        self._stats.record_rejection(namespace, rejection)
+        logger.debug(f"Cache admission {rejection} for {namespace}:{key}")
+        return False
+    
+    @staticmethod
+    def _payload_size(payload: Payload) -> int:
+        if isinstance(payload, dict):
+            return sum(len(frame) for frame in payload.values())
+        return len(payload)
+    
+    async def _load_generations(self) -> None:
+        """Fetch namespace generations, dropping local copies of bumped ones."""
+        if not self._redis:
+            return
+        try:
+            raw = await self._redis.hgetall(GENERATIONS_KEY)
+        except Exception as e:
+            logger.warning(f"Failed to load cache generations: {e}")
+            return
+        for namespace, generation in raw.items():
+            self._set_generation(namespace, int(generation))
+    
+    def _set_generation(self, namespace: str, generation: int) -> None:
+        if generation <= self._generations.get(namespace, 0):
+            return
+        self._generations[namespace] = generation
+        self._clear_tiers(None if namespace == ALL_NAMESPACES else namespace)
+    
+    async def invalidate_namespace(self, namespace: Optional[str] = None) -> Optional[int]:
+        """Invalidate a namespace (or every namespace) on all replicas in O(1).
+        
+        Returns the new generation, or None if Redis is unavailable and only
+        this process's in-memory tiers were cleared.
+        """
+        field = namespace or ALL_NAMESPACES
+        self._clear_tiers(namespace)
+        if not self._redis:
+            return None
+        
+        try:
+            generation = await self._redis.hincrby(GENERATIONS_KEY, field, 1)
+        except Exception as e:
+            self._handle_redis_error(e)
+            logger.warning(f"Cache generation bump failed for {field}: {e}")
+            return None
+        self._set_generation(field, generation)
+        
+        try:
+            payload = json.dumps({'origin': self._instance_id, 'namespace': field, 'generation': generation})
+            await self._redis.publish(GENERATION_CHANNEL, payload)
+        except Exception as e:
+            logger.warning(f"Cache generation publish failed for {field}: {e}")
+        
+        logger.info(f"Cache namespace {field} invalidated, now generation {generation}")
+        return generation
+    
+    def _apply_generation(self, data: Any) -> None:
+        """Adopt a generation bumped on another replica."""
+        try:
+            payload = json.loads(data)
+            self._set_generation(payload['namespace'], int(payload['generation']))
+        except (TypeError, ValueError, KeyError):
+            return
+    
+    def generations(self) -> Dict[str, int]:
+        """Current generation per namespace ('*' applies to all)."""
+        return dict(self._generations)
+    
+    def _local_tier(self, namespace: str) -> Optional[LocalCache]:
+        """Get (or lazily create) the L1 tier for a namespace."""
+        if not settings.local_cache_enabled:
+            return None
+        local = self._local.get(namespace)
+        if local is None:
+            local = LocalCache(settings.local_cache_size, settings.local_cache_ttl)
+            self._local[namespace] = local
+        return local
+    
+    def _start_listener(self) -> None:
+        """Subscribe to cross-instance invalidation and load notifications."""
+        if self._listener_task is None or self._listener_task.done():
+            self._listener_task = asyncio.create_task(self._listen())
+    
+    async def _stop_listener(self) -> None:
+        """Cancel the pub/sub subscriber."""
+        if self._listener_task:
+            self._listener_task.cancel()
+            try:
+                await self._listener_task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._listener_task = None
+    
+    def _start_stats_flusher(self) -> None:
+        """Periodically push this replica's counters and access counts to Redis."""
+        if settings.cache_stats_flush_interval <= 0:
+            return
+        if self._stats_task is None or self._stats_task.done():
+            self._stats_task = asyncio.create_task(self._flush_stats_loop())
+    
+    async def _stop_stats_flusher(self) -> None:
+        """Cancel the flusher and push whatever is still pending."""
+        if self._stats_task:
+            self._stats_task.cancel()
+            try:
+                await self._stats_task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._stats_task = None
+        if self._redis:
+            await self._stats.flush(self._redis)
+            await self._ttl_policy.flush(self._redis)
+    
+    async def _flush_stats_loop(self) -> None:
+        while self._redis:
+            await asyncio.sleep(settings.cache_stats_flush_interval)
+            if self._redis:
+                await self._stats.flush(self._redis)
+                await self._ttl_policy.flush(self._redis)
+                await self._admission.update_pressure(self.shard_clients())
+    
+    async def _listen(self) -> None:
+        """Drop local entries deleted on other replicas and wake load waiters."""
+        while self._redis:
+            pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(INVALIDATION_CHANNEL, LOADED_CHANNEL, GENERATION_CHANNEL)
+                # Catch up on generation bumps missed while unsubscribed
+                await self._load_generations()
+                async for message in pubsub.listen():
+                    if message.get('type') != 'message':
+                        continue
+                    if message.get('channel') == LOADED_CHANNEL:
+                        self._notify_load_waiters(message.get('data'))
+                    elif message.get('channel') == GENERATION_CHANNEL:
+                        self._apply_generation(message.get('data'))
+                    else:
+                        self._apply_invalidation(message.get('data'))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Cache pub/sub listener error: {e}, resubscribing...")
+                await asyncio.sleep(1)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+    
+    def _apply_invalidation(self, data: Any) -> None:
+        """Apply a single invalidation message to the L1 tier."""
+        try:
+            payload = json.loads(data)
+        except (TypeError, ValueError):
+            return
+        
+        # Our own deletes were already applied locally
+        if payload.get('origin') == self._instance_id:
+            return
+        
+        namespace = payload.get('namespace')
+        if namespace is None:
+            for local in self._local.values():
+                local.clear()
+            return
+        
+        local = self._local.get(namespace)
+        if local is None:
+            return
+        
+        if 'keys' in payload:
+            for key in payload['keys']:
+                local.delete(key)
+            return
+        
+        key = payload.get('key')
+        if key is None:
+            local.clear()
+        else:
+            local.delete(key)
+    
+    async def clear_local(self, namespace: Optional[str] = None) -> None:
+        """Drop L1 (and fallback) entries for a namespace (or all) here and on every replica."""
+        self._clear_tiers(namespace)
+        await self._publish_invalidation(namespace, None)
+    
+    def _clear_tiers(self, namespace: Optional[str] = None) -> None:
+        """Drop this process's L1 and fallback entries for a namespace (or all)."""
+        for tiers in (self._local, self._fallback):
+            if namespace is None:
+                for tier in tiers.values():
+                    tier.clear()
+            elif namespace in tiers:
+                tiers[namespace].clear()
+    
+    async def _publish_invalidation(
+        self,
+        namespace: Optional[str],
+        key: Optional[str],
+        keys: Optional[List[str]] = None
+    ) -> None:
+        """Tell other replicas to drop their L1 copy."""
+        if not self._redis or not settings.local_cache_enabled:
+            return
+        try:
+            message = {'origin': self._instance_id, 'namespace': namespace, 'key': key}
+            if keys is not None:
+                message['keys'] = keys
+            payload = json.dumps(message)
+            await self._redis.publish(INVALIDATION_CHANNEL, payload)
+        except Exception as e:
+            logger.warning(f"Cache invalidation publish failed for {namespace}:{key}: {e}")
+    
+    def tier_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-namespace hit/miss/eviction counters for each cache tier."""
+        counters = self._stats.local()
+        namespaces = set(self._local) | set(counters)
+        stats = {}
+        for namespace in sorted(namespaces):
+            local = self._local.get(namespace)
+            hits = counters.get(namespace, {}).get('hits', 0)
+            misses = counters.get(namespace, {}).get('misses', 0)
+            lookups = hits + misses
+            stats[namespace] = {
+                'l1': local.stats() if local is not None else None,
+                'l2': {
+                    'hits': hits,
+                    'misses': misses,
+                    'hit_rate': (hits / lookups * 100) if lookups else 0.0,
+                },
+            }
+        return stats
+    
+    async def namespace_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-namespace counters and get latency summed over every replica."""
+        if self._redis:
+            try:
+                # Include our own unflushed deltas so the numbers are current
+                await self._stats.flush(self._redis)
+                return await self._stats.aggregate(self._redis)
+            except Exception as e:
+                logger.warning(f"Cache stats aggregation failed, showing this instance only: {e}")
+        return self._stats.local()
     
     def _hash_key(self, data: Any) -> str:
         """Generate hash for complex keys."""
@@ -79,16 +717,107 @@ class CacheClient:
         return hashlib.md5(serialized.encode('utf-8')).hexdigest()
     
     async def get(self, namespace: str, key: str) -> Optional[Any]:
-        """Get value from cache."""
-        if not self._redis:
-            return None
+        """Get value from cache, checking the in-process tier first."""
+        started = time.perf_counter()
+        local = self._local_tier(namespace)
+        if local is not None:
+            value = local.get(key)
+            if value is not MISSING:
+                self._stats.record_get(namespace, 'l1_hits', time.perf_counter() - started)
+                return value
+        
+        if not self._binary:
+            entry = self._fallback_get(namespace, key)
+            return entry.value if entry is not None else None
             
         try:
             cache_key = self._make_key(namespace, key)
-            value = await self._redis.get(cache_key)
-            if value:
-                return json.loads(value)
+            binary = self._binary_for(cache_key)
+            if self._hashed(namespace):
+                raw = await binary.hgetall(cache_key)
+            else:
+                raw = await binary.get(cache_key)
+            decoded = self._decode(namespace, raw)
+            if decoded is not None:
+                value, size = decoded
+                self._stats.record_get(namespace, 'hits', time.perf_counter() - started, size)
+                if local is not None:
+                    local.set(key, value)
+                return value
+            self._stats.record_get(namespace, 'misses', time.perf_counter() - started)
+        except CodecError as e:
+            self._stats.record_error(namespace)
+            logger.warning(f"Undecodable cache entry for {namespace}:{key}, treating as miss: {e}")
+        except Exception as e:
+            self._stats.record_error(namespace)
+            self._handle_redis_error(e)
+            logger.warning(f"Cache get failed for {namespace}:{key}: {e}")
+        
+        return None
+    
+    async def get_entry(
+        self,
+        namespace: str,
+        key: str,
+        fields: Optional[Iterable[str]] = None
+    ) -> Optional[CacheEntry]:
+        """Get value from cache along with its soft-expiry state.
+        
+        For hash-stored documents ``fields`` limits the read to those
+        top-level fields; the value may still hold more of them (e.g. from
+        L1), or none if the document has none of them. It is ignored for
+        namespaces stored as one blob.
+        """
+        if fields is not None:
+            fields = list(fields)
+        started = time.perf_counter()
+        local = self._local_tier(namespace)
+        if local is not None:
+            value = local.get(key)
+            if value is not MISSING:
+                self._stats.record_get(namespace, 'l1_hits', time.perf_counter() - started)
+                # Only fresh values are ever promoted to L1 by this path
+                return CacheEntry(value, stale=False)
+        
+        if not self._binary:
+            return self._fallback_get(namespace, key)
+        
+        try:
+            cache_key = self._make_key(namespace, key)
+            async with self._binary_for(cache_key).pipeline(transaction=False) as pipe:
+                self._queue_get(pipe, namespace, cache_key, fields)
+                pipe.pttl(cache_key)
+                raw, pttl = await pipe.execute()
+            
+            decoded = self._decode(namespace, raw, fields)
+            if decoded is None and fields is not None and self._hashed(namespace) and pttl != -2:
+                # The document exists but lacks every requested field; a miss
+                # would reload it on each read
+                decoded = {}, 0
+            if decoded is None:
+                self._stats.record_get(namespace, 'misses', time.perf_counter() - started)
+                return None
+            
+            value, size = decoded
+            self._stats.record_get(namespace, 'hits', time.perf_counter() - started, size)
+            
+            # Redis holds the entry until hard expiry; set() always adds the
+            # policy's stale window, so its last seconds are the stale part
+            fresh_ms = None
+            if pttl is not None and pttl > 0:
+                fresh_ms = pttl - self._ttl_policy.stale_ttl(namespace) * 1000
+            stale = fresh_ms is not None and fresh_ms <= 0
+            
+            # Partial documents must not answer later full reads from L1
+            if local is not None and not stale and (fields is None or not self._hashed(namespace)):
+                local.set(key, value, fresh_ms / 1000 if fresh_ms is not None else None)
+            return CacheEntry(value, stale)
+        except CodecError as e:
+            self._stats.record_error(namespace)
+            logger.warning(f"Undecodable cache entry for {namespace}:{key}, treating as miss: {e}")
         except Exception as e:
+            self._stats.record_error(namespace)
+            self._handle_redis_error(e)
             logger.warning(f"Cache get failed for {namespace}:{key}: {e}")
         
         return None
@@ -98,127 +827,643 @@ class CacheClient:
         namespace: str,
         key: str,
         value: Any,
-        ttl: Optional[int] = None
+        ttl: Optional[int] = None,
+        force_admit: bool = False
     ) -> bool:
-        """Set value in cache with TTL."""
-        if not self._redis:
-            return False
-            
+        """Set value in cache with TTL, kept for the namespace's stale window past it.
+        
+        The window always comes from the TTL policy, so get_entry can tell
+        soft expiry from the remaining lifetime alone.
+        
+        Returns False if the admission policy kept the value out of Redis;
+        ``force_admit`` skips its frequency filter but not the size cap.
+        L1 only takes values Redis accepted, so no replica serves a copy
+        the others can't see; a rejected or failed write drops the old one.
+        """
+        local = self._local_tier(namespace)
+        if not self._binary:
+            if local is not None:
+                local.set(key, value, ttl)
+            return self._fallback_set(namespace, key, value, ttl, self._ttl_policy.stale_ttl(namespace))
+        
         try:
             cache_key = self._make_key(namespace, key)
-            serialized = json.dumps(value)
-            
-            if ttl:
-                await self._redis.setex(cache_key, ttl, serialized)
-            else:
-                await self._redis.set(cache_key, serialized)
+            payload = self._encode(namespace, value)
+            if not self._admit(namespace, key, payload, force_admit):
+                if local is not None:
+                    local.delete(key)
+                return False
             
-            return True
+            # A hash is replaced with several commands, applied atomically
+            async with self._binary_for(cache_key).pipeline(transaction=self._hashed(namespace)) as pipe:
+                self._queue_set(pipe, cache_key, payload, self._hard_ttl(namespace, ttl))
+                await pipe.execute()
+        except CodecError as e:
+            self._stats.record_error(namespace)
+            logger.warning(f"Unencodable cache value for {namespace}:{key}, not cached: {e}")
+            if local is not None:
+                local.delete(key)
+            return False
         except Exception as e:
+            self._stats.record_error(namespace)
+            self._handle_redis_error(e)
             logger.warning(f"Cache set failed for {namespace}:{key}: {e}")
+            if local is not None:
+                local.delete(key)
             return False
+        
+        self._stats.record_set(namespace, self._payload_size(payload))
+        if local is not None:
+            local.set(key, value, ttl)
+        return True
     
     async def delete(self, namespace: str, key: str) -> bool:
-        """Delete key from cache."""
+        """Delete key from cache on this and every other replica."""
+        local = self._local.get(namespace)
+        if local is not None:
+            local.delete(key)
+        fallback = self._fallback.get(namespace)
+        if fallback is not None:
+            fallback.delete(key)
+        
         if not self._redis:
             return False
             
         try:
             cache_key = self._make_key(namespace, key)
-            await self._redis.delete(cache_key)
+            await self.shard_for(cache_key).delete(cache_key)
+            await self._publish_invalidation(namespace, key)
             return True
         except Exception as e:
+            self._handle_redis_error(e)
             logger.warning(f"Cache delete failed for {namespace}:{key}: {e}")
             return False
     
+    async def get_many(
+        self,
+        namespace: str,
+        keys: Iterable[str],
+        record_stats: bool = True
+    ) -> Dict[str, Optional[Any]]:
+        """Get many keys in one round-trip; misses map to None.
+        
+        ``record_stats=False`` is for reads no user asked for (e.g. warm-up
+        checks): they are left out of the hit/miss stats and don't promote
+        values to L1.
+        """
+        started = time.perf_counter()
+        keys = list(dict.fromkeys(keys))
+        results: Dict[str, Optional[Any]] = {}
+        local = self._local_tier(namespace)
+        
+        remaining = []
+        for key in keys:
+            value = local.get(key) if local is not None else MISSING
+            if value is MISSING:
+                remaining.append(key)
+            else:
+                results[key] = value
+                if record_stats:
+                    self._stats.record_get(namespace, 'l1_hits', 0.0)
+        
+        if not remaining or not self._binary:
+            for key in remaining:
+                entry = self._fallback_get(namespace, key)
+                results[key] = entry.value if entry is not None else None
+            return results
+        
+        async def read(binary: redis.Redis, cache_keys: List[str]) -> List[Any]:
+            if not self._hashed(namespace):
+                return await binary.mget(cache_keys)
+            async with binary.pipeline(transaction=False) as pipe:
+                for cache_key in cache_keys:
+                    pipe.hgetall(cache_key)
+                return await pipe.execute()
+        
+        try:
+            # One MGET (or pipeline) per shard, all shards at once
+            cache_keys = [self._make_key(namespace, key) for key in remaining]
+            raw_values = await self._each_shard(cache_keys, read)
+        except Exception as e:
+            self._stats.record_error(namespace)
+            self._handle_redis_error(e)
+            logger.warning(f"Cache get_many failed for {namespace} ({len(remaining)} keys): {e}")
+            return {**results, **dict.fromkeys(remaining)}
+        
+        # Every key of the batch shares the round-trip latency
+        elapsed = time.perf_counter() - started
+        for key, raw in zip(remaining, raw_values):
+            try:
+                decoded = self._decode(namespace, raw)
+            except CodecError as e:
+                self._stats.record_error(namespace)
+                logger.warning(f"Undecodable cache entry for {namespace}:{key}, treating as miss: {e}")
+                results[key] = None
+                continue
+            if decoded is None:
+                if record_stats:
+                    self._stats.record_get(namespace, 'misses', elapsed)
+                results[key] = None
+                continue
+            value, size = decoded
+            if record_stats:
+                self._stats.record_get(namespace, 'hits', elapsed, size)
+                if local is not None:
+                    local.set(key, value)
+            results[key] = value
+        
+        return results
+    
+    async def set_many(
+        self,
+        namespace: str,
+        items: Mapping[str, Any],
+        ttl: Optional[int] = None
+    ) -> Dict[str, bool]:
+        """Set many keys in one pipelined round-trip; returns per-key success."""
+        results = {key: False for key in items}
+        local = self._local_tier(namespace)
+        
+        if not self._binary:
+            for key, value in items.items():
+                if local is not None:
+                    local.set(key, value, ttl)
+                results[key] = self._fallback_set(
+                    namespace, key, value, ttl, self._ttl_policy.stale_ttl(namespace)
+                )
+            return results
+        
+        # As in set(), L1 only takes values Redis accepted
+        encoded = {}
+        for key, value in items.items():
+            if local is not None:
+                local.delete(key)
+            try:
+                payload = self._encode(namespace, value)
+            except CodecError as e:
+                self._stats.record_error(namespace)
+                logger.warning(f"Unencodable cache value for {namespace}:{key}, not cached: {e}")
+                continue
+            if not self._admit(namespace, key, payload):
+                continue
+            encoded[key] = payload
+        
+        if not encoded:
+            return results
+        
+        payloads = {self._make_key(namespace, key): payload for key, payload in encoded.items()}
+        expire = self._hard_ttl(namespace, ttl)
+        
+        async def write(binary: redis.Redis, cache_keys: List[str]) -> List[List[Any]]:
+            """Replies of each key's commands."""
+            counts = []
+            async with binary.pipeline(transaction=self._hashed(namespace)) as pipe:
+                for cache_key in cache_keys:
+                    counts.append(self._queue_set(pipe, cache_key, payloads[cache_key], expire))
+                replies = await pipe.execute(raise_on_error=False)
+            grouped = []
+            offset = 0
+            for count in counts:
+                grouped.append(replies[offset:offset + count])
+                offset += count
+            return grouped
+        
+        try:
+            replies = await self._each_shard(list(payloads), write)
+            for key, key_replies in zip(encoded, replies):
+                if any(isinstance(reply, Exception) for reply in key_replies):
+                    self._stats.record_error(namespace)
+                else:
+                    self._stats.record_set(namespace, self._payload_size(encoded[key]))
+                    results[key] = True
+                    if local is not None:
+                        local.set(key, items[key], ttl)
+        except Exception as e:
+            self._stats.record_error(namespace)
+            self._handle_redis_error(e)
+            logger.warning(f"Cache set_many failed for {namespace} ({len(encoded)} keys): {e}")
+        
+        return results
+    
+    async def delete_many(self, namespace: str, keys: Iterable[str]) -> int:
+        """Delete many keys in one round-trip on this and every other replica."""
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return 0
+        
+        for tier in (self._local.get(namespace), self._fallback.get(namespace)):
+            if tier is not None:
+                for key in keys:
+                    tier.delete(key)
+        
+        if not self._redis:
+            return 0
+        
+        async def remove(binary: redis.Redis, cache_keys: List[str]) -> List[int]:
+            # Only the total matters; report it against the share's first key
+            return [await binary.delete(*cache_keys)]
+        
+        try:
+            counts = await self._each_shard([self._make_key(namespace, key) for key in keys], remove)
+            await self._publish_invalidation(namespace, None, keys=keys)
+            return sum(count for count in counts if count)
+        except Exception as e:
+            self._handle_redis_error(e)
+            logger.warning(f"Cache delete_many failed for {namespace} ({len(keys)} keys): {e}")
+            return 0
+    
     async def cached_call(
         self,
         namespace: str,
         key: str,
         func,
         *args,
-        ttl: int = 3600,
-        cache_none: bool = False,  # Whether to cache None results
+        ttl: Optional[int] = None,
         **kwargs
     ) -> Any:
-        """Execute function with intelligent caching and distributed locking."""
-        # Try cache first
-        cached = await self.get(namespace, key)
-        if cached is not None:
-            logger.debug(f"Cache hit for {namespace}:{key}")
-            return cached
+        """Execute function with caching, request coalescing and distributed locking.
         
-        # Use distributed lock to prevent race conditions
-        lock_key = f"lock:{namespace}:{key}"
-        lock_ttl = 30  # 30 second lock timeout
+        None results are never cached, since they are indistinguishable from a miss.
+        """
+        async def fetch() -> Any:
+            return await func(*args, **kwargs)
         
-        if self._redis:
+        return await self.cached_fetch(namespace, key, fetch, ttl=ttl)
+    
+    async def cached_fetch(
+        self,
+        namespace: str,
+        key: str,
+        fetch: Callable[[], Awaitable[Optional[Any]]],
+        ttl: Optional[int] = None,
+        fields: Optional[Iterable[str]] = None,
+        refresh: Optional[Callable[[], Awaitable[Optional[Any]]]] = None
+    ) -> Optional[Any]:
+        """Read-through cache with stale-while-revalidate and stale-if-error.
+        
+        ``fetch`` returns the fresh value, or None when the upstream failed or
+        refused the request. Past soft expiry the cached value is returned at
+        once while a single background refresh runs; a failed refresh keeps
+        serving the stale copy until hard expiry. Without an explicit ``ttl``
+        the TTL policy picks one from the key's access frequency. ``fields``
+        is passed to get_entry; a miss still loads and returns the whole value.
+        ``refresh`` replaces ``fetch`` for the background refresh, which no
+        user waits on (e.g. a call with a longer deadline and no hedging).
+        """
+        self.record_access(namespace, key)
+        
+        entry = await self.get_entry(namespace, key, fields)
+        if entry is not None:
+            if entry.stale:
+                self._schedule_refresh(namespace, key, refresh or fetch, ttl)
+            return entry.value
+        
+        # Concurrent misses for the same key share one load
+        cache_key = self._make_key(namespace, key)
+        return await self._singleflight.do(
+            cache_key, lambda: self._load(namespace, key, fetch, ttl)
+        )
+    
+    async def _load(
+        self,
+        namespace: str,
+        key: str,
+        fetch: Callable[[], Awaitable[Optional[Any]]],
+        ttl: Optional[int]
+    ) -> Optional[Any]:
+        """Fetch and store a missing value, coordinating replicas via a Redis lock."""
+        if not self._redis:
+            return await self._fetch_and_store(namespace, key, fetch, ttl)
+        
+        cache_key = self._make_key(namespace, key)
+        lock_key = f"lock:{cache_key}"
+        token = uuid.uuid4().hex
+        
+        try:
+            acquired = await self._redis.set(lock_key, token, nx=True, ex=LOAD_LOCK_TTL)
+        except Exception as e:
+            logger.warning(f"Lock error for {namespace}:{key}: {e}, proceeding without lock")
+            return await self._fetch_and_store(namespace, key, fetch, ttl)
+        
+        if acquired:
             try:
-                # Try to acquire distributed lock
-                lock_acquired = await self._redis.set(lock_key, "1", nx=True, ex=lock_ttl)
-                
-                if lock_acquired:
-                    try:
-                        # Double-check cache after acquiring lock
-                        cached = await self.get(namespace, key)
-                        if cached is not None:
-                            logger.debug(f"Cache hit after lock for {namespace}:{key}")
-                            return cached
-                        
-                        # Execute function
-                        logger.debug(f"Cache miss for {namespace}:{key}, executing function with lock")
-                        result = await func(*args, **kwargs)
-                        
-                        # Cache result based on policy
-                        if result is not None or cache_none:
-                            adaptive_ttl = self._get_adaptive_ttl(namespace, ttl)
-                            await self.set(namespace, key, result, adaptive_ttl)
-                        
-                        return result
-                    finally:
-                        # Release lock
-                        await self._redis.delete(lock_key)
-                else:
-                    # Lock not acquired, wait briefly and check cache again
-                    await asyncio.sleep(0.1)
-                    cached = await self.get(namespace, key)
-                    if cached is not None:
-                        logger.debug(f"Cache hit after waiting for {namespace}:{key}")
-                        return cached
-                    
-                    # If still no cache hit, execute without lock (fallback)
-                    logger.debug(f"Executing without lock for {namespace}:{key}")
-                    result = await func(*args, **kwargs)
-                    return result
-                    
-            except Exception as lock_error:
-                logger.warning(f"Lock error for {namespace}:{key}: {lock_error}, proceeding without lock")
-        
-        # Fallback: execute function without distributed lock
-        logger.debug(f"Cache miss for {namespace}:{key}, executing function")
-        try:
-            result = await func(*args, **kwargs)
+                # Another replica may have filled the key before we got the lock
+                entry = await self.get_entry(namespace, key)
+                if entry is not None:
+                    return entry.value
+                return await self._fetch_and_store(namespace, key, fetch, ttl)
+            finally:
+                await self._release_load_lock(lock_key, token, cache_key)
+        
+        # Another replica is loading this key: wait to be notified, not polled
+        waiter = asyncio.get_running_loop().create_future()
+        self._load_waiters.setdefault(cache_key, set()).add(waiter)
+        self._remote_waits += 1
+        try:
+            # Re-check after registering so a notification can't slip past us
+            entry = await self.get_entry(namespace, key)
+            if entry is not None:
+                return entry.value
             
-            # Cache result based on policy
-            if result is not None or cache_none:
-                adaptive_ttl = self._get_adaptive_ttl(namespace, ttl)
-                await self.set(namespace, key, result, adaptive_ttl)
+            try:
+                await asyncio.wait_for(waiter, timeout=LOAD_WAIT_TIMEOUT)
+                self._remote_notified += 1
+            except asyncio.TimeoutError:
+                self._remote_timeouts += 1
             
-            return result
+            entry = await self.get_entry(namespace, key)
+            if entry is not None:
+                return entry.value
+        finally:
+            waiters = self._load_waiters.get(cache_key)
+            if waiters is not None:
+                waiters.discard(waiter)
+                if not waiters:
+                    del self._load_waiters[cache_key]
+        
+        # The other replica failed or timed out; load it ourselves
+        logger.debug(f"Remote load for {namespace}:{key} produced nothing, fetching locally")
+        return await self._fetch_and_store(namespace, key, fetch, ttl)
+    
+    async def _fetch_and_store(
+        self,
+        namespace: str,
+        key: str,
+        fetch: Callable[[], Awaitable[Optional[Any]]],
+        ttl: Optional[int],
+        force_admit: bool = False
+    ) -> Optional[Any]:
+        """Call the upstream and cache a non-None result."""
+        value = await fetch()
+        if value is not None:
+            if ttl is None:
+                ttl = await self.ttl_for(namespace, key)
+            await self.set(namespace, key, value, ttl, force_admit=force_admit)
+        return value
+    
+    async def _release_load_lock(self, lock_key: str, token: str, cache_key: str) -> None:
+        """Release our load lock and wake replicas waiting on it."""
+        try:
+            await self._redis.eval(RELEASE_LOCK_SCRIPT, 1, lock_key, token)
         except Exception as e:
-            logger.error(f"Function execution failed for {namespace}:{key}: {e}")
-            raise
+            logger.warning(f"Failed to release load lock {lock_key}: {e}")
+        try:
+            await self._redis.publish(LOADED_CHANNEL, cache_key)
+        except Exception as e:
+            logger.warning(f"Failed to publish load completion for {cache_key}: {e}")
+    
+    def _notify_load_waiters(self, cache_key: Any) -> None:
+        """Wake everything waiting on a load that finished on another replica."""
+        for waiter in self._load_waiters.get(cache_key, ()):
+            if not waiter.done():
+                waiter.set_result(None)
+    
+    def admission_stats(self) -> Dict[str, Any]:
+        """Whether the admission filter is active on this replica."""
+        return self._admission.stats()
     
-    def _get_adaptive_ttl(self, namespace: str, default_ttl: int) -> int:
-        """Get adaptive TTL based on namespace and content type."""
-        ttl_map = {
-            'imdb_search': 1800,      # 30 minutes - search results change less frequently
-            'imdb_details': 86400,    # 24 hours - movie details rarely change
-            'mdl_search': 3600,       # 1 hour - drama search results
-            'mdl_details': 43200,     # 12 hours - drama details
-            'user_templates': 7200,   # 2 hours - user preferences
+    def loader_stats(self) -> Dict[str, int]:
+        """Request coalescing counters."""
+        return {
+            'loads': self._singleflight.leaders,
+            'coalesced': self._singleflight.coalesced,
+            'in_flight': self._singleflight.in_flight,
+            'remote_waits': self._remote_waits,
+            'remote_notified': self._remote_notified,
+            'remote_timeouts': self._remote_timeouts,
         }
-        return ttl_map.get(namespace, default_ttl)
+    
+    def _schedule_refresh(
+        self,
+        namespace: str,
+        key: str,
+        fetch: Callable[[], Awaitable[Optional[Any]]],
+        ttl: Optional[int]
+    ) -> None:
+        """Start a background refresh unless one is already running here."""
+        cache_key = self._make_key(namespace, key)
+        task = self._refresh_tasks.get(cache_key)
+        if task is not None and not task.done():
+            return
+        self._refresh_tasks[cache_key] = asyncio.create_task(
+            self._refresh(namespace, key, fetch, ttl)
+        )
+    
+    async def _refresh(
+        self,
+        namespace: str,
+        key: str,
+        fetch: Callable[[], Awaitable[Optional[Any]]],
+        ttl: Optional[int]
+    ) -> None:
+        """Refresh a stale entry, keeping the old copy if the upstream fails."""
+        cache_key = self._make_key(namespace, key)
+        try:
+            # One replica refreshes a key at a time; the lock is left to expire
+            # so a failing upstream is retried at most every REFRESH_LOCK_TTL
+            if self._redis:
+                acquired = await self._redis.set(
+                    f"refresh:{cache_key}", self._instance_id, nx=True, ex=REFRESH_LOCK_TTL
+                )
+                if not acquired:
+                    return
+            
+            value = await fetch()
+            if value is None:
+                logger.info(f"Background refresh failed for {namespace}:{key}, serving stale copy")
+                return
+            
+            if ttl is None:
+                ttl = await self.ttl_for(namespace, key)
+            # The stale copy is already resident, so replacing it evicts nothing
+            await self.set(namespace, key, value, ttl, force_admit=True)
+            logger.debug(f"Background refresh completed for {namespace}:{key}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Background refresh error for {namespace}:{key}: {e}")
+        finally:
+            self._refresh_tasks.pop(cache_key, None)
+    
+    async def ttl_for(self, namespace: str, key: str, base: Optional[int] = None) -> int:
+        """TTL for a key from the shared policy (frequency-scaled, jittered)."""
+        return await self._ttl_policy.ttl_for(self._redis, namespace, key, base)
+    
+    async def access_frequency(self, namespace: str, key: str) -> float:
+        """Decayed access count of a key across every replica."""
+        return await self._ttl_policy.frequency(self._redis, namespace, key)
+    
+    def record_access(self, namespace: str, key: str) -> None:
+        """Count an access for callers that don't go through cached_fetch."""
+        self._ttl_policy.record_access(namespace, key)
+        self._admission.record(namespace, key)
+    
+    async def hottest(self, namespace: str, limit: int) -> List[Tuple[str, float]]:
+        """Most frequently accessed keys of a namespace, hottest first."""
+        try:
+            return await self._ttl_policy.hottest(self._redis, namespace, limit)
+        except Exception as e:
+            logger.warning(f"Failed to read access frequencies for {namespace}: {e}")
+            return []
+    
+    async def prefetch(
+        self,
+        namespace: str,
+        key: str,
+        fetch: Callable[[], Awaitable[Optional[Any]]]
+    ) -> Optional[bool]:
+        """Load a key ahead of demand without counting it as an access.
+        
+        Returns None if a fresh copy is already cached, otherwise whether
+        the upstream produced a value.
+        """
+        entry = await self.get_entry(namespace, key)
+        if entry is not None and not entry.stale:
+            return None
+        # Warm-up keys are picked by shared access counts, so they skip the
+        # per-replica frequency filter
+        value = await self._fetch_and_store(namespace, key, fetch, None, force_admit=True)
+        return value is not None
+    
+    async def fresh_for(self, namespace: str, keys: Iterable[str]) -> Dict[str, float]:
+        """Seconds until each cached key goes stale, from one PTTL per key.
+        
+        Negative once the key is in its stale window; keys without an
+        expiry map to infinity and keys that aren't cached are left out.
+        """
+        if not self._binary:
+            return {}
+        keys = list(keys)
+        stale_ms = self._ttl_policy.stale_ttl(namespace) * 1000
+        
+        async def read(binary: redis.Redis, cache_keys: List[str]) -> List[Any]:
+            async with binary.pipeline(transaction=False) as pipe:
+                for cache_key in cache_keys:
+                    pipe.pttl(cache_key)
+                return await pipe.execute(raise_on_error=False)
+        
+        try:
+            replies = await self._each_shard([self._make_key(namespace, key) for key in keys], read)
+        except Exception as e:
+            self._handle_redis_error(e)
+            logger.warning(f"Cache PTTL read failed for {namespace} ({len(keys)} keys): {e}")
+            return {}
+        remaining = {}
+        for key, pttl in zip(keys, replies):
+            if not isinstance(pttl, int) or pttl == -2:
+                continue
+            remaining[key] = math.inf if pttl == -1 else (pttl - stale_ms) / 1000
+        return remaining
+    
+    async def dump_entries(
+        self,
+        namespace: str,
+        keys: Iterable[str],
+        batch_size: int = 500
+    ) -> List[Tuple[str, bytes, int]]:
+        """Encoded values and remaining lifetimes (ms) of cached keys; misses are skipped.
+        
+        Values come back as single codec frames whatever the storage mode,
+        so restore_entries can write them under either one.
+        """
+        if not self._binary:
+            return []
+        keys = list(keys)
+        entries = []
+        
+        async def read(binary: redis.Redis, cache_keys: List[str]) -> List[Tuple[Any, Any]]:
+            async with binary.pipeline(transaction=False) as pipe:
+                for cache_key in cache_keys:
+                    self._queue_get(pipe, namespace, cache_key)
+                    pipe.pttl(cache_key)
+                replies = await pipe.execute(raise_on_error=False)
+            return list(zip(replies[0::2], replies[1::2]))
+        
+        for start in range(0, len(keys), batch_size):
+            batch = keys[start:start + batch_size]
+            replies = await self._each_shard([self._make_key(namespace, key) for key in batch], read)
+            for key, (raw, pttl) in zip(batch, replies):
+                if isinstance(raw, Exception) or not raw or not isinstance(pttl, int) or pttl <= 0:
+                    continue
+                if self._hashed(namespace):
+                    try:
+                        value, _ = self._decode(namespace, raw)
+                        raw = self._codec.encode(value)
+                    except CodecError:
+                        continue
+                entries.append((key, raw, pttl))
+        return entries
+    
+    async def restore_entries(
+        self,
+        namespace: str,
+        entries: Iterable[Tuple[str, bytes, int]],
+        local_limit: int = 0,
+        batch_size: int = 500
+    ) -> int:
+        """Write dumped entries that aren't cached yet; returns how many were written.
+        
+        Entries go to Redis, or to the in-memory fallback while it is down.
+        The first ``local_limit`` fresh entries are also put in L1.
+        """
+        # Dumped lifetimes include the policy's stale window (see _hard_ttl)
+        stale_ms = self._ttl_policy.stale_ttl(namespace) * 1000
+        local = self._local_tier(namespace)
+        entries = list(entries)
+        written = 0
+        
+        # Process memory: L1 copies of the hottest fresh entries, plus the
+        # fallback tier for every entry (stale ones included) while Redis is down
+        in_memory = entries if not self._binary else entries[:local_limit if local is not None else 0]
+        for position, (key, frame, pttl) in enumerate(in_memory):
+            fresh_ms = pttl - stale_ms
+            to_local = local is not None and position < local_limit and fresh_ms > 0
+            if not to_local and self._binary:
+                continue
+            try:
+                value = self._codec.decode(frame)
+            except CodecError:
+                continue
+            if to_local:
+                local.set(key, value, fresh_ms / 1000)
+            if not self._binary:
+                fresh = max(1, int(fresh_ms / 1000))
+                written += self._fallback_set(namespace, key, value, fresh, max(0, pttl // 1000 - fresh))
+        if not self._binary:
+            return written
+        
+        async def write(binary: redis.Redis, cache_keys: List[str]) -> List[bool]:
+            """Whether each key was written."""
+            async with binary.pipeline(transaction=False) as pipe:
+                if self._hashed(namespace):
+                    # Hashes have no SET NX, so skip keys that already exist
+                    for cache_key in cache_keys:
+                        pipe.exists(cache_key)
+                    present = await pipe.execute()
+                    results = []
+                    for cache_key, exists in zip(cache_keys, present):
+                        _, frame, pttl = frames[cache_key]
+                        try:
+                            payload = self._encode(namespace, self._codec.decode(frame)) if not exists else None
+                        except CodecError:
+                            payload = None
+                        if payload is not None:
+                            self._queue_set(pipe, cache_key, payload, None)
+                            pipe.pexpire(cache_key, pttl)
+                        results.append(payload is not None)
+                    await pipe.execute(raise_on_error=False)
+                    return results
+                # Newer values written since the snapshot win
+                for cache_key in cache_keys:
+                    _, frame, pttl = frames[cache_key]
+                    pipe.set(cache_key, frame, px=pttl, nx=True)
+                replies = await pipe.execute(raise_on_error=False)
+                return [reply is True for reply in replies]
+        
+        for start in range(0, len(entries), batch_size):
+            frames = {self._make_key(namespace, entry[0]): entry for entry in entries[start:start + batch_size]}
+            written += sum(await self._each_shard(list(frames), write))
+        return written
 
 
 # Global cache client instance  
@@ -0,0 +1,195 @@
+"""Local-disk snapshot of the hottest cache entries for warm restarts.
+
+The hottest CACHE_SNAPSHOT_ENTRIES search and details entries (by the
+shared access counters) are written every CACHE_SNAPSHOT_INTERVAL
+seconds, on shutdown and before /restart. On startup the file is
+memory-mapped and restored into Redis, or into the in-memory fallback
+while Redis is down, before any handler runs.
+
+File layout (little endian): a header of magic, creation time and entry
+count, then per entry namespace length (u8), key length (u16), value
+length (u32) and absolute hard expiry in epoch ms (i64), followed by the
+namespace, key and encoded value bytes. Entries are hottest first.
+"""
+
+import asyncio
+import mmap
+import os
+import struct
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from infra.config import settings
+from infra.logging import get_logger
+
+from .redis_client import cache_client
+
+logger = get_logger(__name__)
+
+SNAPSHOT_MAGIC = b"MDLSNAP1"
+HEADER = struct.Struct("<8sdI")
+RECORD = struct.Struct("<BHIq")
+
+# Namespaces worth carrying across restarts, as for the cache warmer
+SNAPSHOT_NAMESPACES = ('mdl_search', 'mdl_details', 'imdb_search', 'imdb_details')
+
+# (namespace, key, encoded value, absolute hard expiry in epoch ms)
+SnapshotEntry = Tuple[str, str, bytes, int]
+
+
+def write_snapshot(path: str, entries: List[SnapshotEntry]) -> int:
+    """Atomically replace the snapshot file; returns its size in bytes."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(SNAPSHOT_MAGIC, time.time(), len(entries)))
+        for namespace, key, value, expires_at_ms in entries:
+            ns_bytes = namespace.encode('utf-8')
+            key_bytes = key.encode('utf-8')
+            f.write(RECORD.pack(len(ns_bytes), len(key_bytes), len(value), expires_at_ms))
+            f.write(ns_bytes)
+            f.write(key_bytes)
+            f.write(value)
+        size = f.tell()
+    os.replace(tmp_path, path)
+    return size
+
+
+def read_snapshot(path: str) -> Tuple[float, Dict[str, List[Tuple[str, bytes, int]]]]:
+    """Creation time and unexpired entries per namespace as (key, value, pttl ms).
+
+    Raises ValueError if the file isn't a snapshot.
+    """
+    now_ms = int(time.time() * 1000)
+    by_namespace: Dict[str, List[Tuple[str, bytes, int]]] = {}
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        magic, created_at, count = HEADER.unpack_from(mapped, 0)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError("not a cache snapshot")
+        for namespace, key, value, expires_at_ms in _records(mapped, count):
+            pttl = expires_at_ms - now_ms
+            if pttl > 0:
+                by_namespace.setdefault(namespace, []).append((key, value, pttl))
+    return created_at, by_namespace
+
+
+def _records(mapped: mmap.mmap, count: int) -> Iterator[SnapshotEntry]:
+    offset = HEADER.size
+    for _ in range(count):
+        ns_len, key_len, value_len, expires_at_ms = RECORD.unpack_from(mapped, offset)
+        offset += RECORD.size
+        namespace = mapped[offset:offset + ns_len].decode('utf-8')
+        offset += ns_len
+        key = mapped[offset:offset + key_len].decode('utf-8')
+        offset += key_len
+        value = mapped[offset:offset + value_len]
+        offset += value_len
+        yield namespace, key, value, expires_at_ms
+
+
+class CacheSnapshot:
+    """Periodically saves the hot cache set to disk and restores it on startup."""
+
+    def __init__(self) -> None:
+        self._task: Optional[asyncio.Task] = None
+        self.last_save: Dict[str, float] = {}
+        self.last_restore: Dict[str, float] = {}
+
+    def start(self) -> None:
+        if not settings.cache_snapshot_enabled or settings.cache_snapshot_interval <= 0:
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        """Stop the periodic task and write a final snapshot."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._task = None
+        await self.save()
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(settings.cache_snapshot_interval)
+            await self.save()
+
+    async def _hottest(self) -> List[Tuple[float, str, str]]:
+        """(count, namespace, key) of the hottest keys over all namespaces."""
+        limit = settings.cache_snapshot_entries
+        candidates = []
+        for namespace in SNAPSHOT_NAMESPACES:
+            for key, frequency in await cache_client.hottest(namespace, limit):
+                candidates.append((frequency, namespace, key))
+        candidates.sort(key=lambda item: -item[0])
+        return candidates[:limit]
+
+    async def save(self) -> Optional[int]:
+        """Write the current hot set; returns the number of entries saved."""
+        if not settings.cache_snapshot_enabled or not cache_client._redis:
+            return None
+        started = time.perf_counter()
+        try:
+            hottest = await self._hottest()
+            keys_by_namespace: Dict[str, List[str]] = {}
+            for _, namespace, key in hottest:
+                keys_by_namespace.setdefault(namespace, []).append(key)
+
+            now_ms = int(time.time() * 1000)
+            dumped: Dict[Tuple[str, str], Tuple[bytes, int]] = {}
+            for namespace, keys in keys_by_namespace.items():
+                for key, value, pttl in await cache_client.dump_entries(namespace, keys):
+                    dumped[(namespace, key)] = (value, now_ms + pttl)
+
+            # Keep the hottest-first order so a partial restore keeps the best keys
+            entries = [
+                (namespace, key, *dumped[(namespace, key)])
+                for _, namespace, key in hottest if (namespace, key) in dumped
+            ]
+            if not entries:
+                # Never replace a useful snapshot with an empty one
+                return 0
+            size = await asyncio.to_thread(write_snapshot, settings.cache_snapshot_path, entries)
+        except Exception as e:
+            logger.warning(f"Cache snapshot failed: {e}")
+            return None
+
+        duration = time.perf_counter() - started
+        self.last_save = {'at': time.time(), 'entries': len(entries), 'bytes': size, 'duration': duration}
+        logger.info(f"Cache snapshot saved: {len(entries)} entries, {size / 1024:.0f}KB in {duration:.2f}s")
+        return len(entries)
+
+    async def restore(self) -> Optional[int]:
+        """Seed Redis (or the fallback tier) and L1 from the last snapshot."""
+        path = settings.cache_snapshot_path
+        if not settings.cache_snapshot_enabled or not os.path.exists(path):
+            return None
+        started = time.perf_counter()
+        try:
+            created_at, by_namespace = await asyncio.to_thread(read_snapshot, path)
+            total = sum(len(entries) for entries in by_namespace.values())
+            restored = 0
+            for namespace, entries in by_namespace.items():
+                restored += await cache_client.restore_entries(
+                    namespace, entries, local_limit=settings.local_cache_size
+                )
+        except Exception as e:
+            logger.warning(f"Cache snapshot restore failed: {e}")
+            return None
+
+        duration = time.perf_counter() - started
+        self.last_restore = {'at': time.time(), 'entries': total, 'restored': restored, 'duration': duration}
+        logger.info(
+            f"Cache snapshot from {time.time() - created_at:.0f}s ago restored: {restored} of {total} "
+            f"unexpired entries written in {duration:.2f}s"
+        )
+        return restored
+
+
+# Global cache snapshot instance
+cache_snapshot = CacheSnapshot()
@@ -0,0 +1,150 @@
+"""Per-namespace cache accounting with cross-replica aggregation in Redis."""
+
+import bisect
+from typing import Any, Dict, List, Optional
+
+from infra.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Upper bounds (ms) of the get-latency histogram buckets; the last one is open
+LATENCY_BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+COUNTERS = (
+    'l1_hits', 'hits', 'misses', 'sets', 'errors', 'bytes_read', 'bytes_written',
+    'rejected_cold', 'rejected_size',
+)
+
+STATS_KEY_PREFIX = "stats:cache:"
+STATS_NAMESPACES_KEY = "stats:cache_namespaces"
+STATS_RETENTION = 7 * 86400  # Aggregates expire a week after the last flush
+
+
+class NamespaceStats:
+    """Counters and latency histogram for one namespace."""
+
+    def __init__(self) -> None:
+        self.counters: Dict[str, int] = dict.fromkeys(COUNTERS, 0)
+        self.latency: List[int] = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def merge(self, other: "NamespaceStats") -> None:
+        for name, value in other.counters.items():
+            self.counters[name] = self.counters.get(name, 0) + value
+        for i, count in enumerate(other.latency):
+            self.latency[i] += count
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Approximate latency percentile (bucket upper bound, ms)."""
+        total = sum(self.latency)
+        if not total:
+            return None
+        threshold = total * pct / 100
+        running = 0
+        for i, count in enumerate(self.latency):
+            running += count
+            if running >= threshold:
+                return LATENCY_BUCKETS_MS[i] if i < len(LATENCY_BUCKETS_MS) else float('inf')
+        return float('inf')
+
+    def summary(self) -> Dict[str, Any]:
+        c = self.counters
+        lookups = c['l1_hits'] + c['hits'] + c['misses']
+        return {
+            **c,
+            'gets': lookups,
+            'hit_rate': ((c['l1_hits'] + c['hits']) / lookups * 100) if lookups else 0.0,
+            'p50_ms': self.percentile(50),
+            'p99_ms': self.percentile(99),
+        }
+
+
+class CacheStats:
+    """Lightweight in-process accounting, periodically flushed to Redis."""
+
+    def __init__(self) -> None:
+        self._totals: Dict[str, NamespaceStats] = {}
+        self._pending: Dict[str, NamespaceStats] = {}
+
+    def _both(self, namespace: str) -> List[NamespaceStats]:
+        totals = self._totals.get(namespace)
+        if totals is None:
+            totals = self._totals[namespace] = NamespaceStats()
+        pending = self._pending.get(namespace)
+        if pending is None:
+            pending = self._pending[namespace] = NamespaceStats()
+        return [totals, pending]
+
+    def record_get(self, namespace: str, outcome: str, latency: float, nbytes: int = 0) -> None:
+        """Record a lookup; outcome is 'l1_hits', 'hits' or 'misses'."""
+        bucket = bisect.bisect_left(LATENCY_BUCKETS_MS, latency * 1000)
+        for stats in self._both(namespace):
+            stats.counters[outcome] += 1
+            stats.counters['bytes_read'] += nbytes
+            stats.latency[bucket] += 1
+
+    def record_set(self, namespace: str, nbytes: int) -> None:
+        for stats in self._both(namespace):
+            stats.counters['sets'] += 1
+            stats.counters['bytes_written'] += nbytes
+
+    def record_error(self, namespace: str) -> None:
+        for stats in self._both(namespace):
+            stats.counters['errors'] += 1
+
+    def record_rejection(self, namespace: str, reason: str) -> None:
+        """Record a write refused by admission; reason is 'rejected_cold' or 'rejected_size'."""
+        for stats in self._both(namespace):
+            stats.counters[reason] += 1
+
+    def local(self, namespace: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """Totals recorded by this process since start."""
+        names = [namespace] if namespace else sorted(self._totals)
+        return {name: self._totals[name].summary() for name in names if name in self._totals}
+
+    async def flush(self, client) -> None:
+        """Add pending deltas to the shared per-namespace hashes."""
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        try:
+            async with client.pipeline(transaction=False) as pipe:
+                for namespace, stats in pending.items():
+                    key = f"{STATS_KEY_PREFIX}{namespace}"
+                    for name, value in stats.counters.items():
+                        if value:
+                            pipe.hincrby(key, name, value)
+                    for i, count in enumerate(stats.latency):
+                        if count:
+                            pipe.hincrby(key, f"lat{i}", count)
+                    pipe.expire(key, STATS_RETENTION)
+                    pipe.sadd(STATS_NAMESPACES_KEY, namespace)
+                pipe.expire(STATS_NAMESPACES_KEY, STATS_RETENTION)
+                await pipe.execute()
+        except Exception as e:
+            # Put the deltas back so they're included in the next flush
+            for namespace, stats in pending.items():
+                self._both(namespace)[1].merge(stats)
+            logger.warning(f"Cache stats flush failed: {e}")
+
+    async def aggregate(self, client) -> Dict[str, Dict[str, Any]]:
+        """Read the totals flushed by every replica."""
+        namespaces = sorted(await client.smembers(STATS_NAMESPACES_KEY))
+        if not namespaces:
+            return {}
+
+        async with client.pipeline(transaction=False) as pipe:
+            for namespace in namespaces:
+                pipe.hgetall(f"{STATS_KEY_PREFIX}{namespace}")
+            hashes = await pipe.execute()
+
+        result = {}
+        for namespace, fields in zip(namespaces, hashes):
+            if not fields:
+                continue
+            stats = NamespaceStats()
+            for name in COUNTERS:
+                stats.counters[name] = int(fields.get(name, 0))
+            for i in range(len(stats.latency)):
+                stats.latency[i] = int(fields.get(f"lat{i}", 0))
+            result[namespace] = stats.summary()
+        return result
@@ -0,0 +1,156 @@
+"""Access-frequency driven cache TTLs.
+
+Every namespace has a base TTL. Keys accessed often (measured with an
+exponentially decaying counter shared by all replicas) get up to
+MAX_TTL_FACTOR times that, keys nobody asked for again get as little as
+MIN_TTL_FACTOR times it, and every TTL is jittered so entries written
+together don't expire together.
+"""
+
+import math
+import random
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from infra.config import settings
+from infra.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Soft TTL (seconds) for a key of average popularity
+BASE_TTLS = {
+    'imdb_search': 1800,      # 30 minutes - search results change less frequently
+    'imdb_details': 86400,    # 24 hours - movie details rarely change
+    'mdl_search': 3600,       # 1 hour - drama search results
+    'mdl_details': 43200,     # 12 hours - drama details
+    'user_templates': 7200,   # 2 hours - user preferences
+}
+
+# Seconds an entry may be served stale past its soft expiry
+STALE_TTLS = {
+    'imdb_search': 21600,     # 6 hours
+    'imdb_details': 259200,   # 3 days
+    'mdl_search': 21600,      # 6 hours
+    'mdl_details': 259200,    # 3 days
+}
+
+# Remembered "not found" results
+NEGATIVE_TTL = 1800
+
+MIN_TTL_FACTOR = 0.5
+MAX_TTL_FACTOR = 4.0
+
+FREQ_KEY_PREFIX = "freq:"
+FREQ_MAX_KEYS = 50000  # Coldest keys beyond this are forgotten
+FREQ_RETENTION = 30 * 86400
+
+# Decay timestamps are measured from a fixed epoch so scores stay small
+_EPOCH = 1_700_000_000
+
+# Forward-decayed counters kept as log2 so they never overflow:
+# score = log2(sum(count * 2^(t / half_life))). The count as of time t is
+# 2^(score - t / half_life), and ordering by score orders by current count.
+RECORD_ACCESS_SCRIPT = """
+local now = tonumber(ARGV[1])
+for i = 2, #ARGV, 2 do
+    local added = now + math.log(tonumber(ARGV[i + 1])) / math.log(2)
+    local old = redis.call('ZSCORE', KEYS[1], ARGV[i])
+    if old then
+        old = tonumber(old)
+        local high = math.max(old, added)
+        local low = math.min(old, added)
+        added = high + math.log(1 + 2 ^ (low - high)) / math.log(2)
+    end
+    redis.call('ZADD', KEYS[1], added, ARGV[i])
+end
+return 0
+"""
+
+
+class TTLPolicy:
+    """Single source of cache TTLs for every namespace."""
+
+    def __init__(self) -> None:
+        self._pending: Dict[str, Dict[str, int]] = {}
+
+    @staticmethod
+    def base_ttl(namespace: str) -> int:
+        return BASE_TTLS.get(namespace, settings.cache_ttl)
+
+    @staticmethod
+    def stale_ttl(namespace: str) -> int:
+        return STALE_TTLS.get(namespace, 0)
+
+    @staticmethod
+    def _decay_time() -> float:
+        return (time.time() - _EPOCH) / settings.cache_access_half_life
+
+    def record_access(self, namespace: str, key: str) -> None:
+        """Count one access; counts reach Redis on the next flush."""
+        self._add(namespace, key, 1)
+
+    def _add(self, namespace: str, key: str, count: int) -> None:
+        pending = self._pending.setdefault(namespace, {})
+        if key not in pending and len(pending) >= FREQ_MAX_KEYS:
+            return
+        pending[key] = pending.get(key, 0) + count
+
+    async def frequency(self, client, namespace: str, key: str) -> float:
+        """Decayed access count of a key across every replica."""
+        count = float(self._pending.get(namespace, {}).get(key, 0))
+        if client is None:
+            return count
+        try:
+            score = await client.zscore(f"{FREQ_KEY_PREFIX}{namespace}", key)
+        except Exception as e:
+            logger.warning(f"Access frequency lookup failed for {namespace}:{key}: {e}")
+            return count
+        if score is not None:
+            count += 2 ** min(float(score) - self._decay_time(), 64)
+        return count
+
+    async def ttl_for(self, client, namespace: str, key: str, base: Optional[int] = None) -> int:
+        """Jittered TTL for a key, scaled by how often it is accessed."""
+        ttl = base if base is not None else self.base_ttl(namespace)
+        if settings.cache_ttl_adaptive:
+            # ~4 accesses per half-life keeps the base TTL; every 4x more doubles it
+            frequency = await self.frequency(client, namespace, key)
+            factor = 0.5 * math.sqrt(1 + frequency)
+            ttl *= min(max(factor, MIN_TTL_FACTOR), MAX_TTL_FACTOR)
+        jitter = settings.cache_ttl_jitter
+        if jitter > 0:
+            ttl *= random.uniform(1 - jitter, 1 + jitter)
+        return max(1, int(ttl))
+
+    async def flush(self, client) -> None:
+        """Add pending access counts to the shared decayed counters."""
+        if not self._pending or client is None:
+            return
+        pending, self._pending = self._pending, {}
+        now = self._decay_time()
+        try:
+            async with client.pipeline(transaction=False) as pipe:
+                for namespace, counts in pending.items():
+                    freq_key = f"{FREQ_KEY_PREFIX}{namespace}"
+                    args: List[Any] = [now]
+                    for key, count in counts.items():
+                        args.extend((key, count))
+                    pipe.eval(RECORD_ACCESS_SCRIPT, 1, freq_key, *args)
+                    # Forget the coldest keys once a namespace grows too large
+                    pipe.zremrangebyrank(freq_key, 0, -FREQ_MAX_KEYS - 1)
+                    pipe.expire(freq_key, FREQ_RETENTION)
+                await pipe.execute()
+        except Exception as e:
+            # Put the counts back so they're included in the next flush
+            for namespace, counts in pending.items():
+                for key, count in counts.items():
+                    self._add(namespace, key, count)
+            logger.warning(f"Access frequency flush failed: {e}")
+
+    async def hottest(self, client, namespace: str, limit: int) -> List[Tuple[str, float]]:
+        """Most accessed keys of a namespace with their decayed counts."""
+        if client is None:
+            return []
+        entries = await client.zrevrange(f"{FREQ_KEY_PREFIX}{namespace}", 0, limit - 1, withscores=True)
+        now = self._decay_time()
+        return [(key, 2 ** min(score - now, 64)) for key, score in entries]
@@ -24,6 +24,7 @@ class Settings(BaseSettings):
     mongo_uri: str = ""
     db_name: str = "mydramalist_bot_db"
     redis_url: str = "redis://localhost:6379/0"
+    redis_shard_urls: str = ""  # Extra Redis URLs, comma separated; cached values are spread over all of them
     
     # External APIs
     mydramalist_api_url: str = "https://kuryana.tbdh.app/search/q/{}"
@@ -37,8 +38,87 @@ class Settings(BaseSettings):
     # Performance
     http_timeout: int = 30
     max_connections: int = 100
+    
+    # Per-host circuit breaker for upstream HTTP (see infra/http/breaker.py)
+    http_breaker_failures: int = 5  # Consecutive failures that open a circuit (0 = never)
+    http_breaker_reset_timeout: float = 30.0  # Seconds a circuit stays open before probing
+    http_breaker_probes: int = 1  # Successful probes needed to close it again
+    http_hedge_budget: float = 0.05  # Max extra requests from hedging, as a fraction of all (0 = off)
+    http_hedge_min_delay: float = 0.3  # Never hedge sooner than this many seconds
+    http_interactive_deadline: float = 10.0  # Seconds a user-facing upstream call may take, retries included
+    http_background_deadline: float = 60.0  # Same for cache warming and refreshes
+    http_concurrency_initial: int = 4  # In-flight requests per host to start from
+    http_concurrency_max: int = 30  # Ceiling the adaptive per-host limit can grow to
+    http_slow_latency: float = 2.0  # Answers slower than this stop the limit growing
+    http_queue_timeout: float = 5.0  # Max seconds a request waits for a free slot
+    http_json_parser: str = "orjson"  # JSON parser for response bodies: orjson or json
+    http_max_response_bytes: int = 5 * 1024 * 1024  # Larger bodies are aborted (0 = no limit)
+    http_prewarm_connections: int = 2  # Connections opened per upstream host at startup (0 = off)
+    http_prewarm_urls: str = ""  # Extra comma-separated URLs whose hosts are kept warm
+    http_keepalive_timeout: float = 60.0  # Seconds an idle pooled connection is kept open
+    http_keepalive_probe_interval: float = 45.0  # Seconds between probes to idle hosts
+    http_record_path: str = ""  # Append every upstream response to this fixture archive (empty = off)
     cache_ttl: int = 3600  # 1 hour default
+
+    # In-process L1 cache in front of Redis
+    local_cache_enabled: bool = True
+    local_cache_size: int = 1000  # Max entries per namespace
+    local_cache_ttl: int = 60  # Seconds an entry may live in process memory
+    
+    # Cached value encoding
+    cache_serializer: str = "json"  # json or msgpack
+    cache_compression: str = "zstd"  # none, zlib or zstd
+    cache_compress_threshold: int = 1024  # Bytes; smaller payloads stay uncompressed
+    
+    # Per-namespace cache counters are pushed to Redis this often (0 = never)
+    cache_stats_flush_interval: int = 30
+    
+    # Search queries differing only in spacing share the first-seen cache entry
+    search_alias_enabled: bool = True
+    
+    # TTLs scale with how often a key is accessed (see infra/cache/ttl_policy.py)
+    cache_ttl_adaptive: bool = True
+    cache_ttl_jitter: float = 0.1  # +/- fraction applied to every TTL
+    cache_access_half_life: int = 86400  # Seconds for an access count to decay by half
+    
+    # Background re-population of the most requested entries on startup and /cachereload
+    cache_warm_enabled: bool = True
+    cache_warm_budget: int = 60  # Max upstream calls per warm-up run
+    cache_warm_delay: float = 4.0  # Seconds between upstream calls
+    cache_warm_record_interval: int = 3600  # Seconds between copies of the hottest keys to MongoDB
     
+    # Re-fetch hot search/details keys shortly before they go stale
+    cache_expiry_refresh_enabled: bool = True
+    cache_expiry_refresh_interval: int = 60  # Seconds between sweeps
+    cache_expiry_refresh_keys: int = 500  # Hottest keys per namespace checked on each sweep
+    cache_expiry_refresh_min_hits: float = 3.0  # Decayed access count a key needs to be re-fetched
+    cache_expiry_refresh_budget: int = 20  # Max upstream calls per minute (0 = disabled)
+    
+    # In-memory fallback cache while Redis is unreachable
+    cache_fallback_enabled: bool = True
+    cache_fallback_size: int = 5000  # Max entries per namespace
+    cache_reconnect_max_delay: int = 60  # Seconds; reconnect backoff ceiling
+    
+    # Background SCAN of the keyspace for /cache_stats and /cache_analyze
+    cache_analyze_interval: int = 600  # Seconds between scans (0 = only on demand)
+    cache_analyze_batch: int = 200  # Keys per SCAN batch
+    
+    # Store mdl_details/imdb_details as hashes so captions fetch only the fields they use
+    cache_details_as_hash: bool = False
+    
+    # Admission of new cache entries (see infra/cache/admission.py)
+    cache_admission_enabled: bool = True
+    cache_admission_min_hits: int = 2  # Recent requests a key needs while Redis is nearly full
+    cache_admission_memory_ratio: float = 0.8  # Filter above this share of maxmemory (0 = always)
+    cache_max_entry_size: int = 524288  # Bytes of encoded value; larger values aren't cached (0 = no cap)
+    cache_max_entry_sizes: str = ""  # Per-namespace caps, e.g. "mdl_search=65536,imdb_details=131072"
+    
+    # Local-disk snapshot of the hottest entries, restored on startup
+    cache_snapshot_enabled: bool = True
+    cache_snapshot_path: str = "data/cache_snapshot.bin"
+    cache_snapshot_entries: int = 5000  # Hottest entries kept
+    cache_snapshot_interval: int = 900  # Seconds between snapshots (0 = only on shutdown/restart)
+
     # Logging
     log_level: str = "INFO"
     log_format: str = "json"
@@ -0,0 +1,103 @@
+"""Per-host circuit breaker for upstream HTTP calls.
+
+After HTTP_BREAKER_FAILURES consecutive timeouts, connection errors or 5xx
+responses from one host the circuit opens and requests to that host fail
+at once instead of waiting out timeouts and retries. After
+HTTP_BREAKER_RESET_TIMEOUT seconds it goes half-open: up to
+HTTP_BREAKER_PROBES requests are let through, and the circuit closes once
+that many succeed or opens again on the first failure.
+"""
+
+import time
+from typing import Any, Dict
+
+from infra.config import settings
+from infra.logging import get_logger
+
+logger = get_logger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """Breaker state for one host, shared by every request to it."""
+
+    def __init__(self, host: str) -> None:
+        self.host = host
+        self.state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._probe_successes = 0
+        self.trips = 0
+        self.rejected = 0
+
+    def _transition(self, state: str) -> None:
+        if state != self.state:
+            logger.warning(f"Circuit for {self.host} {self.state} -> {state}")
+        self.state = state
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now; counts it as a probe while half-open."""
+        if self.state == OPEN:
+            if time.monotonic() - self._opened_at < settings.http_breaker_reset_timeout:
+                self.rejected += 1
+                return False
+            self._transition(HALF_OPEN)
+            self._probes = 0
+            self._probe_successes = 0
+        if self.state == HALF_OPEN:
+            if self._probes >= settings.http_breaker_probes:
+                self.rejected += 1
+                return False
+            self._probes += 1
+        return True
+
+    def available(self) -> bool:
+        """Whether a request would be let through, without claiming a probe."""
+        if self.state == OPEN:
+            return time.monotonic() - self._opened_at >= settings.http_breaker_reset_timeout
+        if self.state == HALF_OPEN:
+            return self._probes < settings.http_breaker_probes
+        return True
+
+    def record_success(self) -> None:
+        self._failures = 0
+        if self.state == HALF_OPEN:
+            self._probe_successes += 1
+            if self._probe_successes >= settings.http_breaker_probes:
+                self._transition(CLOSED)
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self.state == HALF_OPEN or (
+            self.state == CLOSED and 0 < settings.http_breaker_failures <= self._failures
+        ):
+            self._trip()
+
+    def release(self) -> None:
+        """Give back a probe slot for a request that ended without an outcome."""
+        if self.state == HALF_OPEN and self._probes > 0:
+            self._probes -= 1
+
+    def _trip(self) -> None:
+        self._transition(OPEN)
+        self._opened_at = time.monotonic()
+        self.trips += 1
+
+    def retry_in(self) -> float:
+        """Seconds until an open circuit lets a probe through."""
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, settings.http_breaker_reset_timeout - (time.monotonic() - self._opened_at))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'state': self.state,
+            'consecutive_failures': self._failures,
+            'retry_in': self.retry_in(),
+            'trips': self.trips,
+            'rejected': self.rejected,
+        }
@@ -3,7 +3,11 @@
 import asyncio
 import json
 import random
-from typing import Any, Dict, Optional
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Mapping, Optional
+from urllib.parse import urlsplit
 
 import aiohttp
 from aiohttp import ClientSession, ClientTimeout, ClientResponseError
@@ -11,8 +15,67 @@ from aiohttp import ClientSession, ClientTimeout, ClientResponseError
 from infra.config import settings
 from infra.logging import get_logger
 
+from .breaker import CLOSED, OPEN, CircuitBreaker
+from .concurrency import OK, OVERLOAD, SLOW, AdaptiveLimiter, QueueTimeout
+from .connections import WARMUP, ConnectionTracker
+from .hedging import HedgeBudget, LatencyTracker
+from .recording import FixtureRecorder
+
 logger = get_logger(__name__)
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Longest wait between attempts, whether backoff or Retry-After
+MAX_RETRY_WAIT = 60.0
+
+# Statuses whose Retry-After header says when to try again
+RETRY_AFTER_STATUSES = (429, 503)
+
+# Seconds a warm-up request may take
+WARM_TIMEOUT = 10
+
+# An attempt left with less time than this after queueing is not sent
+MIN_REQUEST_TIMEOUT = 0.05
+
+# Bodies are read in chunks of this size so an oversized one is cut off early
+READ_CHUNK_SIZE = 64 * 1024
+
+
+class ResponseTooLarge(Exception):
+    """A response body exceeded HTTP_MAX_RESPONSE_BYTES."""
+
+
+def json_parser(name: str) -> Callable[[bytes], Any]:
+    """Decoder for JSON response bodies, parsing bytes without building a str."""
+    if name == 'orjson':
+        if orjson is not None:
+            return orjson.loads
+        logger.warning("orjson not installed, falling back to json for HTTP responses")
+    elif name != 'json':
+        raise ValueError(f"Unknown HTTP JSON parser: {name}")
+    return json.loads
+
+
+def _retry_after(headers: Optional[Mapping[str, str]]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)."""
+    value = (headers or {}).get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
 
 class HTTPClient:
     """Async HTTP client with connection pooling, timeouts, and retry logic."""
@@ -20,6 +83,13 @@ class HTTPClient:
     def __init__(self) -> None:
         self._session: Optional[ClientSession] = None
         self._connector: Optional[aiohttp.TCPConnector] = None
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._latencies: Dict[str, LatencyTracker] = {}
+        self._limiters: Dict[str, AdaptiveLimiter] = {}
+        self._hedge_budget = HedgeBudget()
+        self._loads = json_parser(settings.http_json_parser)
+        self._connections = ConnectionTracker()
+        self._recorder = FixtureRecorder(settings.http_record_path) if settings.http_record_path else None
     
     async def __aenter__(self) -> "HTTPClient":
         await self.start()
@@ -35,17 +105,22 @@ class HTTPClient:
             if self._connector is None:
                 self._connector = aiohttp.TCPConnector(
                     limit=settings.max_connections,
-                    limit_per_host=30,
+                    # Upper bound only; AdaptiveLimiter sets the working limit
+                    limit_per_host=settings.http_concurrency_max,
                     ttl_dns_cache=300,
                     use_dns_cache=True,
+                    keepalive_timeout=settings.http_keepalive_timeout,
                 )
             
             timeout = ClientTimeout(total=settings.http_timeout)
             self._session = ClientSession(
                 connector=self._connector,
                 timeout=timeout,
-                headers={'User-Agent': 'MyDramaList-Bot/2.0'}
+                headers={'User-Agent': 'MyDramaList-Bot/2.0'},
+                trace_configs=[self._connections.trace_config()]
             )
+            if self._recorder:
+                self._recorder.start()
             logger.info("HTTP client started with connection pooling")
     
     async def close(self) -> None:
@@ -53,74 +128,337 @@ class HTTPClient:
         if self._session:
             await self._session.close()
             self._session = None
+        if self._recorder:
+            await self._recorder.close()
         logger.info("HTTP client closed")
     
+    def _breaker(self, url: str) -> CircuitBreaker:
+        host = urlsplit(url).netloc
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            breaker = self._breakers[host] = CircuitBreaker(host)
+        return breaker
+    
+    def available(self, url: str) -> bool:
+        """False while the circuit for ``url``'s host is open, so callers can
+        skip the upstream (and serve what they have cached) at once."""
+        return self._breaker(url).available()
+    
+    def breaker_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Circuit state per upstream host."""
+        return {host: breaker.stats() for host, breaker in self._breakers.items()}
+    
+    def open_circuits(self) -> Dict[str, float]:
+        """Hosts whose circuit is open, with seconds until the next probe."""
+        return {
+            host: breaker.retry_in()
+            for host, breaker in self._breakers.items() if breaker.state == OPEN
+        }
+    
+    def _latency(self, url: str) -> LatencyTracker:
+        host = urlsplit(url).netloc
+        tracker = self._latencies.get(host)
+        if tracker is None:
+            tracker = self._latencies[host] = LatencyTracker()
+        return tracker
+    
+    def hedge_stats(self) -> Dict[str, Any]:
+        """Hedged request counters plus each host's current p95 latency."""
+        return {
+            **self._hedge_budget.stats(),
+            'p95': {host: tracker.percentile(0.95) for host, tracker in self._latencies.items()},
+        }
+    
+    def _limiter(self, url: str) -> AdaptiveLimiter:
+        host = urlsplit(url).netloc
+        limiter = self._limiters.get(host)
+        if limiter is None:
+            limiter = self._limiters[host] = AdaptiveLimiter(host)
+        return limiter
+    
+    def concurrency_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Current in-flight limit, requests in flight and queue depth per host."""
+        return {host: limiter.stats() for host, limiter in self._limiters.items()}
+    
+    def connection_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Connection setup cost, warm hits and handshake time saved per host."""
+        return self._connections.stats()
+    
+    def idle(self, url: str, seconds: float) -> bool:
+        """Whether ``url``'s host has had no real request for ``seconds``."""
+        return self._connections.host(urlsplit(url).netloc).idle(seconds)
+    
+    async def warm(self, url: str, connections: int) -> int:
+        """Open (or keep open) up to ``connections`` pooled connections to ``url``'s host.
+        
+        Sends that many concurrent HEAD requests, which bypass retries, the
+        concurrency limit and the circuit breaker's counts. Returns how many
+        got an answer.
+        """
+        if not self._session:
+            await self.start()
+        if not self.available(url):
+            return 0
+        
+        async def head() -> bool:
+            try:
+                async with self._session.head(
+                    url,
+                    allow_redirects=False,
+                    timeout=ClientTimeout(total=WARM_TIMEOUT),
+                    trace_request_ctx=WARMUP
+                ):
+                    return True
+            except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+                logger.debug(f"Warm-up HEAD {url} failed: {e}")
+                return False
+        
+        results = await asyncio.gather(*(head() for _ in range(connections)))
+        return sum(results)
+    
+    async def _request(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        headers: Optional[Dict[str, str]],
+        timeout: float
+    ) -> Optional[Any]:
+        """One GET: the decoded JSON body, None if it isn't JSON; raises on HTTP errors.
+        
+        Bodies over HTTP_MAX_RESPONSE_BYTES raise ResponseTooLarge. Waits
+        for a slot under the host's concurrency limit first; the wait counts
+        against ``timeout``, and QueueTimeout is raised if no slot frees up
+        in time or the wait leaves less than MIN_REQUEST_TIMEOUT.
+        """
+        limiter = self._limiter(url)
+        queued_at = time.perf_counter()
+        granted_at = await limiter.acquire(min(settings.http_queue_timeout, timeout))
+        started = time.perf_counter()
+        remaining = timeout - (started - queued_at)
+        if remaining < MIN_REQUEST_TIMEOUT:
+            # Granted too late to be worth sending
+            limiter.release(None, granted_at)
+            limiter.queue_timeouts += 1
+            raise QueueTimeout(f"slot for {url} granted after {started - queued_at:.2f}s of a {timeout:.2f}s timeout")
+        outcome = None
+        try:
+            async with self._session.get(
+                url, 
+                params=params, 
+                headers=headers,
+                timeout=ClientTimeout(total=remaining)
+            ) as response:
+                response.raise_for_status()
+                body = await self._read_body(response)
+                if self._recorder:
+                    self._recorder.record(
+                        str(response.url), response.status,
+                        response.headers.get('content-type', ''), time.perf_counter() - started, body
+                    )
+                
+                # Parsed regardless of content type; kuryana doesn't always label JSON
+                try:
+                    data = self._loads(body)
+                except ValueError:
+                    content_type = response.headers.get('content-type', '')
+                    logger.warning(f"Non-JSON response from {url}: {content_type}")
+                    return None
+                
+                latency = time.perf_counter() - started
+                outcome = OK if latency <= settings.http_slow_latency else SLOW
+                self._latency(url).record(latency)
+                logger.debug(f"GET {url} -> {response.status}")
+                return data
+        
+        except asyncio.TimeoutError:
+            outcome = OVERLOAD
+            raise
+        except ClientResponseError as e:
+            # 4xx other than 429 are about the request, not the host's load
+            if e.status >= 500 or e.status == 429:
+                outcome = OVERLOAD
+            raise
+        except aiohttp.ClientError:
+            outcome = OVERLOAD
+            raise
+        finally:
+            limiter.release(outcome, granted_at)
+    
+    async def _read_body(self, response: aiohttp.ClientResponse) -> bytes:
+        """The raw body, refusing anything over HTTP_MAX_RESPONSE_BYTES."""
+        limit = settings.http_max_response_bytes
+        if limit <= 0:
+            return await response.read()
+        
+        # Refuse up front when the server says how big the body is
+        if response.content_length is not None and response.content_length > limit:
+            raise ResponseTooLarge(f"body of {response.content_length} bytes exceeds {limit}")
+        
+        chunks = []
+        size = 0
+        async for chunk in response.content.iter_chunked(READ_CHUNK_SIZE):
+            size += len(chunk)
+            if size > limit:
+                raise ResponseTooLarge(f"body exceeds {limit} bytes")
+            chunks.append(chunk)
+        return b"".join(chunks)
+    
+    async def _hedged_request(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        headers: Optional[Dict[str, str]],
+        timeout: float,
+        breaker: CircuitBreaker
+    ) -> Optional[Any]:
+        """Like _request, but races a second copy once the first is slower than p95."""
+        primary = asyncio.create_task(self._request(url, params, headers, timeout))
+        p95 = self._latency(url).percentile(0.95)
+        if p95 is None:
+            # Not enough samples yet to tell a slow answer from a normal one
+            return await primary
+        
+        hedge = None
+        pending = {primary}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=max(settings.http_hedge_min_delay, p95))
+            # Never hedge against a struggling or fully loaded host
+            if (
+                not done and breaker.state == CLOSED
+                and not self._limiter(url).saturated() and self._hedge_budget.spend()
+            ):
+                logger.debug(f"GET {url} slower than {p95:.2f}s, sending hedge")
+                hedge = asyncio.create_task(self._request(url, params, headers, timeout))
+                pending.add(hedge)
+            
+            # First successful copy wins; an error only counts once both failed
+            error = None
+            while True:
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self._hedge_budget.hedge_wins += 1
+                        return task.result()
+                    error = error or task.exception()
+                if not pending:
+                    raise error
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in pending:
+                task.cancel()
+    
     async def get(
         self,
         url: str,
         params: Optional[Dict[str, Any]] = None,
         headers: Optional[Dict[str, str]] = None,
         max_retries: int = 3,
-        timeout: Optional[int] = None
+        timeout: Optional[int] = None,
+        hedge: bool = False,
+        deadline: Optional[float] = None
     ) -> Optional[Dict[str, Any]]:
-        """Make GET request with retry logic and timeouts."""
+        """Make GET request with retry logic and timeouts.
+        
+        With ``hedge`` a slow attempt is raced against a second copy (see
+        infra/http/hedging.py); use it for idempotent, latency-sensitive calls.
+        ``deadline`` caps the whole call in seconds: every attempt and every
+        wait between attempts must fit inside it, otherwise None is returned
+        at once. 429 and 503 responses are retried after their Retry-After.
+        """
         if not self._session:
             await self.start()
             
         request_timeout = timeout or settings.http_timeout
+        breaker = self._breaker(url)
+        hedged = hedge and settings.http_hedge_budget > 0
+        deadline_at = time.monotonic() + deadline if deadline else None
         
         for attempt in range(max_retries + 1):
+            # Fail fast instead of waiting out timeouts against a dead host
+            if not breaker.allow():
+                logger.warning(f"GET {url} skipped, circuit open for {breaker.retry_in():.0f}s more")
+                return None
+            
+            attempt_timeout = request_timeout
+            if deadline_at is not None:
+                attempt_timeout = min(request_timeout, deadline_at - time.monotonic())
+                if attempt_timeout <= 0:
+                    breaker.release()
+                    logger.warning(f"GET {url} deadline of {deadline}s reached after {attempt} attempts")
+                    return None
+            
+            self._hedge_budget.earn()
+            outcome = None
+            retry_after = None
             try:
-                timeout_obj = ClientTimeout(total=request_timeout)
-                async with self._session.get(
-                    url, 
-                    params=params, 
-                    headers=headers,
-                    timeout=timeout_obj
-                ) as response:
-                    response.raise_for_status()
-                    
-                    # Handle different content types
-                    content_type = response.headers.get('content-type', '')
-                    if 'application/json' in content_type:
-                        data = await response.json()
-                    else:
-                        # Fallback for non-JSON responses
-                        text = await response.text()
-                        try:
-                            data = json.loads(text)
-                        except json.JSONDecodeError:
-                            logger.warning(f"Non-JSON response from {url}: {content_type}")
-                            return None
-                    
-                    logger.debug(f"GET {url} -> {response.status}")
-                    return data
+                if hedged:
+                    data = await self._hedged_request(url, params, headers, attempt_timeout, breaker)
+                else:
+                    data = await self._request(url, params, headers, attempt_timeout)
+                outcome = True
+                return data
                     
+            except ResponseTooLarge as e:
+                # The host answered; asking again gets the same body
+                outcome = True
+                logger.error(f"GET {url} dropped: {e}")
+                return None
+                
+            except QueueTimeout as e:
+                # Our own limit, not the host, turned this away; queueing again won't help
+                logger.warning(f"GET {url} dropped: {e}")
+                return None
+                
             except asyncio.TimeoutError:
+                outcome = False
                 if attempt == max_retries:
-                    logger.error(f"GET {url} timeout after {max_retries + 1} attempts ({request_timeout}s each)")
+                    logger.error(f"GET {url} timeout after {max_retries + 1} attempts ({attempt_timeout:.1f}s last)")
                     return None
                 logger.warning(f"GET {url} timeout (attempt {attempt + 1}), retrying...")
                 
             except ClientResponseError as e:
+                # Any non-5xx answer shows the host is up
+                outcome = e.status < 500
                 if attempt == max_retries:
                     logger.error(f"GET {url} failed after {max_retries + 1} attempts: {e}")
                     return None
                 
-                # Don't retry on client errors (4xx), only server errors (5xx) and network issues
-                if 400 <= e.status < 500:
+                # Rate limited or overloaded: the server says when to come back
+                if e.status in RETRY_AFTER_STATUSES:
+                    retry_after = _retry_after(e.headers)
+                # Don't retry other client errors (4xx), only server errors (5xx) and network issues
+                elif 400 <= e.status < 500:
                     logger.error(f"GET {url} client error {e.status}, not retrying")
                     return None
                     
             except aiohttp.ClientError as e:
                 # Handle other client errors (network issues, etc.)
+                outcome = False
                 if attempt == max_retries:
                     logger.error(f"GET {url} failed after {max_retries + 1} attempts: {e}")
                     return None
             
-            # Exponential backoff with jitter for retries
+            finally:
+                if outcome is None:
+                    breaker.release()
+                elif outcome:
+                    breaker.record_success()
+                else:
+                    breaker.record_failure()
+            
+            # Exponential backoff with jitter, unless the server asked for a wait
             if attempt < max_retries:
-                delay = min(60, (2 ** attempt) + random.uniform(0, 1))  # Cap at 60s
+                if retry_after is not None:
+                    delay = retry_after
+                else:
+                    delay = min(MAX_RETRY_WAIT, (2 ** attempt) + random.uniform(0, 1))
+                
+                # A wait that can't end in time only delays the inevitable failure
+                if delay > MAX_RETRY_WAIT or (
+                    deadline_at is not None and time.monotonic() + delay >= deadline_at
+                ):
+                    logger.warning(f"GET {url} giving up, retry in {delay:.1f}s would pass the deadline")
+                    return None
                 logger.warning(f"GET {url} failed (attempt {attempt + 1}), retrying in {delay:.1f}s")
                 await asyncio.sleep(delay)
         
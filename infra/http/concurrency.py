@@ -0,0 +1,119 @@
+"""Adaptive per-host concurrency limit for upstream HTTP calls.
+
+Each host starts at HTTP_CONCURRENCY_INITIAL requests in flight. While
+the limit is in use and answers come back faster than HTTP_SLOW_LATENCY
+it grows by about one per limit's worth of requests (additive increase);
+a timeout, connection error, 5xx or 429 halves it (multiplicative
+decrease), except for requests sent before the previous cut, which
+reflect the old limit rather than the new one. Requests over the limit
+wait in FIFO order for up to HTTP_QUEUE_TIMEOUT seconds.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from infra.config import settings
+from infra.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Outcomes passed to AdaptiveLimiter.release
+OK = 'ok'
+SLOW = 'slow'
+OVERLOAD = 'overload'
+
+MIN_LIMIT = 1.0
+DECREASE_FACTOR = 0.5
+
+
+class QueueTimeout(Exception):
+    """A request waited longer than allowed for a free slot."""
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limit and FIFO wait queue for one host."""
+
+    def __init__(self, host: str) -> None:
+        self.host = host
+        self.limit = float(min(settings.http_concurrency_initial, settings.http_concurrency_max))
+        self.inflight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._last_decrease = 0.0
+        self.increases = 0
+        self.decreases = 0
+        self.queued_total = 0
+        self.queue_timeouts = 0
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def saturated(self) -> bool:
+        """Whether a new request would have to wait for a slot."""
+        return self.inflight >= int(self.limit) or self.queued > 0
+
+    async def acquire(self, timeout: float) -> float:
+        """Take a slot, waiting in line up to ``timeout`` seconds; raises QueueTimeout.
+
+        Returns the time the slot was granted, to be passed to release.
+        """
+        if not self.saturated():
+            self.inflight += 1
+            return time.monotonic()
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.queued_total += 1
+        try:
+            await asyncio.wait({waiter}, timeout=max(0.0, timeout))
+        except asyncio.CancelledError:
+            if waiter.done():
+                # Granted a slot just as the caller gave up
+                self.release(None, time.monotonic())
+            else:
+                waiter.cancel()
+                self._waiters.remove(waiter)
+            raise
+        if not waiter.done():
+            waiter.cancel()
+            self._waiters.remove(waiter)
+            self.queue_timeouts += 1
+            raise QueueTimeout(f"no free slot for {self.host} within {timeout:.1f}s")
+        return time.monotonic()
+
+    def release(self, outcome: Optional[str], granted_at: float) -> None:
+        """Free a slot and adapt the limit to how the request went.
+
+        ``outcome`` is OK, SLOW, OVERLOAD or None when the request says
+        nothing about the host's load (a 404, a cancelled request).
+        """
+        saturated = self.saturated()
+        self.inflight -= 1
+        if outcome == OK and saturated and self.limit < settings.http_concurrency_max:
+            self.limit = min(settings.http_concurrency_max, self.limit + 1 / self.limit)
+            self.increases += 1
+        elif outcome == OVERLOAD and granted_at >= self._last_decrease:
+            if self.limit > MIN_LIMIT:
+                self._last_decrease = time.monotonic()
+                self.limit = max(MIN_LIMIT, self.limit * DECREASE_FACTOR)
+                self.decreases += 1
+                logger.warning(f"Concurrency limit for {self.host} cut to {int(self.limit)}")
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self.inflight < int(self.limit):
+            self.inflight += 1
+            self._waiters.popleft().set_result(None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'limit': int(self.limit),
+            'inflight': self.inflight,
+            'queued': self.queued,
+            'queued_total': self.queued_total,
+            'queue_timeouts': self.queue_timeouts,
+            'increases': self.increases,
+            'decreases': self.decreases,
+        }
@@ -0,0 +1,99 @@
+"""Connection setup cost and reuse per upstream host, from aiohttp tracing.
+
+Every new connection's setup time (DNS, TCP and TLS) is measured. A
+request that finds a pooled connection although its host had been idle
+longer than HTTP_KEEPALIVE_TIMEOUT only did so because the connection
+was pre-warmed or kept alive by a probe; each such warm hit is credited
+with the host's average setup time as handshake time saved.
+"""
+
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from infra.config import settings
+
+# trace_request_ctx marking requests made only to open or keep connections
+WARMUP = {'warmup': True}
+
+
+class HostConnections:
+    """Connection counters for one host."""
+
+    def __init__(self) -> None:
+        self.connects = 0
+        self.connect_seconds = 0.0
+        self.cold_requests = 0
+        self.warm_hits = 0
+        self.saved_seconds = 0.0
+        self.last_request: Optional[float] = None
+
+    @property
+    def connect_cost(self) -> Optional[float]:
+        """Average seconds to open a connection, once one has been opened."""
+        return self.connect_seconds / self.connects if self.connects else None
+
+    def idle(self, seconds: float) -> bool:
+        """Whether no real request has reached the host for ``seconds``."""
+        return self.last_request is None or time.monotonic() - self.last_request > seconds
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'connects': self.connects,
+            'connect_ms': round(self.connect_cost * 1000, 1) if self.connect_cost is not None else None,
+            'cold_requests': self.cold_requests,
+            'warm_hits': self.warm_hits,
+            'saved_ms': round(self.saved_seconds * 1000, 1),
+        }
+
+
+class ConnectionTracker:
+    """Feeds HostConnections from a session's trace events."""
+
+    def __init__(self) -> None:
+        self._hosts: Dict[str, HostConnections] = {}
+
+    def host(self, netloc: str) -> HostConnections:
+        host = self._hosts.get(netloc)
+        if host is None:
+            host = self._hosts[netloc] = HostConnections()
+        return host
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {netloc: host.stats() for netloc, host in self._hosts.items()}
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        config = aiohttp.TraceConfig()
+        config.on_request_start.append(self._on_request_start)
+        config.on_connection_create_start.append(self._on_connection_create_start)
+        config.on_connection_create_end.append(self._on_connection_create_end)
+        config.on_connection_reuseconn.append(self._on_connection_reuseconn)
+        return config
+
+    @staticmethod
+    def _real(ctx: SimpleNamespace) -> bool:
+        return not (ctx.trace_request_ctx or {}).get('warmup')
+
+    async def _on_request_start(self, session, ctx: SimpleNamespace, params) -> None:
+        ctx.host = self.host(urlsplit(str(params.url)).netloc)
+        if self._real(ctx):
+            # Decided before this request counts as traffic itself
+            ctx.after_idle = ctx.host.idle(settings.http_keepalive_timeout)
+            ctx.host.last_request = time.monotonic()
+
+    async def _on_connection_create_start(self, session, ctx: SimpleNamespace, params) -> None:
+        ctx.connect_started = time.perf_counter()
+
+    async def _on_connection_create_end(self, session, ctx: SimpleNamespace, params) -> None:
+        ctx.host.connects += 1
+        ctx.host.connect_seconds += time.perf_counter() - ctx.connect_started
+        if self._real(ctx):
+            ctx.host.cold_requests += 1
+
+    async def _on_connection_reuseconn(self, session, ctx: SimpleNamespace, params) -> None:
+        if self._real(ctx) and ctx.after_idle and ctx.host.connect_cost is not None:
+            ctx.host.warm_hits += 1
+            ctx.host.saved_seconds += ctx.host.connect_cost
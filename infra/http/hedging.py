@@ -0,0 +1,69 @@
+"""Hedged requests: a second copy of a slow request, within a global budget.
+
+A hedged GET that hasn't answered after the host's recent p95 latency
+(at least HTTP_HEDGE_MIN_DELAY) sends one identical request and takes
+whichever answers first. Every request earns HTTP_HEDGE_BUDGET of a
+token and a hedge spends a whole one, so hedges add at most that
+fraction of extra upstream requests (plus a small burst).
+"""
+
+import math
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from infra.config import settings
+
+# Latencies kept per host, and how many are needed before hedging starts
+LATENCY_WINDOW = 200
+MIN_SAMPLES = 20
+
+# Most hedges that can be spent back to back after a quiet period
+HEDGE_BURST = 10.0
+
+
+class LatencyTracker:
+    """Recent successful request latencies of one host."""
+
+    def __init__(self) -> None:
+        self._samples: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        if len(self._samples) < MIN_SAMPLES:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1)]
+
+
+class HedgeBudget:
+    """Token bucket that caps hedges at a fraction of all requests."""
+
+    def __init__(self) -> None:
+        self._tokens = 0.0
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.over_budget = 0
+
+    def earn(self) -> None:
+        """Credit one upstream request."""
+        self.requests += 1
+        self._tokens = min(HEDGE_BURST, self._tokens + settings.http_hedge_budget)
+
+    def spend(self) -> bool:
+        if self._tokens < 1:
+            self.over_budget += 1
+            return False
+        self._tokens -= 1
+        self.hedged += 1
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'requests': self.requests,
+            'hedged': self.hedged,
+            'hedge_wins': self.hedge_wins,
+            'over_budget': self.over_budget,
+        }
@@ -0,0 +1,117 @@
+"""Fixture archive of upstream responses for offline replay.
+
+With HTTP_RECORD_PATH set, HTTPClient appends every successful GET to that
+file as one JSON line: method, URL, status, content type, latency and
+body. ``python -m benchmarks.upstream_standin`` serves an archive back,
+so adapters can be benchmarked and load-tested without kuryana.
+
+Requests only queue their line; a writer task appends queued lines in
+batches from a worker thread, so disk latency never stalls the event
+loop.
+"""
+
+import asyncio
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional, TextIO
+from urllib.parse import urlsplit
+
+from infra.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Lines waiting for the writer; a burst beyond this is dropped
+QUEUE_SIZE = 1000
+
+
+def fixture_key(url: str) -> str:
+    """Path and query of ``url``; the stand-in answers for any host."""
+    parts = urlsplit(url)
+    return f"{parts.path}?{parts.query}" if parts.query else parts.path
+
+
+class FixtureRecorder:
+    """Appends request/response pairs to a JSON Lines archive."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.recorded = 0
+        self.dropped = 0
+        # None asks the writer to finish
+        self._queue: "asyncio.Queue[Optional[str]]" = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self._task: Optional[asyncio.Task] = None
+        self._file: Optional[TextIO] = None
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        logger.info(f"Recording upstream responses to {path}")
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._write_loop())
+
+    async def close(self) -> None:
+        """Write every queued line, then close the archive."""
+        if self._task is None or self._task.done():
+            return
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+
+    def record(self, url: str, status: int, content_type: str, latency: float, body: bytes) -> None:
+        entry = {
+            'method': 'GET',
+            'url': url,
+            'status': status,
+            'content_type': content_type,
+            'latency': round(latency, 4),
+            'recorded_at': time.time(),
+            'body': body.decode('utf-8', errors='replace'),
+        }
+        try:
+            self._queue.put_nowait(json.dumps(entry) + "\n")
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    async def _write_loop(self) -> None:
+        while True:
+            lines = [await self._queue.get()]
+            while not self._queue.empty():
+                lines.append(self._queue.get_nowait())
+            finished = None in lines
+            lines = [line for line in lines if line is not None]
+            if lines:
+                try:
+                    await asyncio.to_thread(self._append, lines)
+                    self.recorded += len(lines)
+                except OSError as e:
+                    logger.warning(f"Failed to record {len(lines)} responses to {self.path}: {e}")
+            if finished:
+                if self._file is not None:
+                    await asyncio.to_thread(self._file.close)
+                    self._file = None
+                return
+
+    def _append(self, lines: List[str]) -> None:
+        # Runs in a worker thread; each batch is flushed as soon as it is written
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.writelines(lines)
+        self._file.flush()
+
+
+def load_fixtures(path: str) -> Dict[str, Dict[str, Any]]:
+    """Recorded responses by fixture_key; the latest recording of a URL wins."""
+    fixtures: Dict[str, Dict[str, Any]] = {}
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping malformed fixture on line {number} of {path}")
+                continue
+            fixtures[fixture_key(entry['url'])] = entry
+    return fixtures
@@ -92,7 +92,8 @@ class RateLimiter:
         """
         
         try:
-            result = await cache_client._redis.eval(
+            # Single-key script, so it runs on whichever shard holds the bucket
+            result = await cache_client.shard_for(cache_key).eval(
                 lua_script,
                 1,
                 cache_key,
@@ -147,7 +148,7 @@ class RateLimiter:
         
         try:
             if cache_client._redis:
-                bucket = await cache_client._redis.hmget(cache_key, 'tokens')
+                bucket = await cache_client.shard_for(cache_key).hmget(cache_key, 'tokens')
                 tokens = float(bucket[0]) if bucket[0] else limit
                 return int(max(0, tokens))
             else:
@@ -162,7 +163,7 @@ class RateLimiter:
         
         try:
             if cache_client._redis:
-                await cache_client._redis.delete(cache_key)
+                await cache_client.shard_for(cache_key).delete(cache_key)
             else:
                 self._local_buckets.pop(key, None)
         except Exception as e:
@@ -23,11 +23,16 @@ from infra.config import settings
 from infra.logging import get_logger
 from infra.http import http_client
 from infra.cache import cache_client
+from infra.cache.analyzer import cache_analyzer
+from infra.cache.snapshot import cache_snapshot
 from infra.db import mongo_client
 
 # Middleware  
 from app.middleware import monitor_performance, HealthChecker
 from app.commands import BotCommandManager
+from app.cache_warmer import cache_warmer
+from app.expiry_refresher import expiry_refresher
+from app.connection_warmer import connection_warmer
 
 # Handlers (new architecture)
 from adapters.telegram.handlers.auth_handlers import authorize_cmd, unauthorize_cmd, list_users_cmd
@@ -59,15 +64,28 @@ class HighPerformanceBot:
         logger.info("Starting services...")
         
         try:
-            # Start HTTP client first
+            # Start HTTP client first, opening upstream connections in the background
             await http_client.start()
+            connection_warmer.start()
             
             # Start cache client
             await cache_client.start()
             
+            # Re-seed the hot set saved before the last shutdown, before any handler runs
+            await cache_snapshot.restore()
+            cache_snapshot.start()
+            
             # Start database
             await mongo_client.start()
             
+            # Re-populate popular entries in the background
+            cache_warmer.start()
+            cache_warmer.start_recording()
+            expiry_refresher.start()
+            
+            # Keyspace summaries for the owner cache commands
+            cache_analyzer.start()
+            
             logger.info("All services started successfully")
         except Exception as e:
             logger.error(f"Failed to start services: {e}")
@@ -81,6 +99,14 @@ class HighPerformanceBot:
         # Stop in reverse order with error handling
         errors = []
         
+        await connection_warmer.stop()
+        await cache_warmer.stop()
+        await expiry_refresher.stop()
+        await cache_analyzer.stop()
+        
+        # Final snapshot while Redis is still connected
+        await cache_snapshot.stop()
+        
         try:
             await mongo_client.close()
         except Exception as e:
@@ -170,7 +196,12 @@ class HighPerformanceBot:
             status_text = "🏥 <b>Service Health Status</b>\n\n"
             
             for service, status in health_status.items():
-                emoji = "✅" if status == "healthy" else "❌"
+                if status.startswith("healthy"):
+                    emoji = "✅"
+                elif status.startswith("degraded"):
+                    emoji = "⚠️"
+                else:
+                    emoji = "❌"
                 status_text += f"{emoji} <b>{service.title()}:</b> {status}\n"
             
             await message.reply_text(status_text, parse_mode=ParseMode.HTML)